@@ -1,7 +1,22 @@
+__version__ = '0.0.2'
+
 import os
+from figplotter import profile
 from figplotter import utils
 
 # Initialize logging level
 log_level = os.environ.get('FIGPLOTTER_LOG_LEVEL', 'default')
 
 utils.set_log_level(log_level)
+
+# Initialize timing instrumentation (see profile.set_profile)
+profile.set_profile(os.environ.get('FIGPLOTTER_PROFILE', None))
+
+
+def render_batch(specs, **kwargs):
+    '''
+    Renders a batch of figures in worker processes (see batch.render_batch).
+    The batch module is imported on first use.
+    '''
+    from figplotter import batch
+    return batch.render_batch(specs, **kwargs)
@@ -0,0 +1,210 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import os
+import re
+import sys
+import time
+import traceback
+
+from collections import namedtuple
+
+from . import profile
+from . import utils
+
+'''
+Result of rendering one figure of a batch
+
+- index: position of the figure in the batch
+- name: name of the figure
+- path: output path (also set when rendering fails)
+- error: formatted traceback if rendering failed, None otherwise
+- elapsed: rendering time in seconds
+- profile: timing counters of the figure if the instrumentation is enabled
+  (see profile.take)
+'''
+RenderResult = namedtuple('RenderResult', ['index', 'name', 'path', 'error', 'elapsed', 'profile'])
+
+DEFAULT_FORMAT = 'png'
+
+
+def init_worker(profile_enabled = False):
+    '''
+    Initializer of the batch workers. It imports figplotter once per worker,
+    so that the figures rendered by the worker do not pay the import cost,
+    and enables the headless mode (Agg canvas, no GUI toolkits).
+
+    @param profile_enabled (bool): enable the instrumentation in the worker.
+           It is given explicitly because workers started with spawn or
+           forkserver do not inherit the state of the parent process
+    '''
+    from . import plot
+    plot.set_headless()
+
+    profile.set_enabled(profile_enabled)
+
+
+def sanitize_name(name):
+    '''
+    @return str: name that can be used as a file name in the output directory
+            (only letters, digits, '_', '.' and '-', and it does not start
+            with a dot, so it is neither hidden nor a relative path)
+    '''
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name)).lstrip('._').rstrip('_') or 'figure'
+
+
+def normalize_spec(spec, index, output_dir, fmt):
+    '''
+    Converts a batch entry into a dictionary with the keys 'func', 'args',
+    'kwargs', 'name', 'path' and 'savefig'.
+
+    An entry can be a callable that returns a figure, or a dictionary with the
+    keys:
+    - func: callable that returns a figure (required)
+    - args, kwargs: arguments for func
+    - name: name of the figure (defaults to the name of func)
+    - output: output path (defaults to <output_dir>/<index>_<name>.<format>)
+    - savefig: keyword arguments for Figure.savefig
+
+    Output paths only depend on the position of the entry in the batch, so
+    they are the same regardless of the number of workers.
+    '''
+    if callable(spec):
+        spec = { 'func': spec }
+
+    assert isinstance(spec, dict), 'Batch entries must be callables or dictionaries'
+    assert callable(spec.get('func', None)), 'Batch entry {0} does not have a callable "func"'.format(index)
+
+    func = spec['func']
+    name = spec.get('name', None)
+    if name is None:
+        name = getattr(func, '__name__', 'figure')
+
+    savefig = dict(spec.get('savefig', {}))
+    path = spec.get('output', None)
+    if path is None:
+        ext = savefig.get('format', fmt)
+        path = os.path.join(output_dir, '{0:05d}_{1}.{2}'.format(index, sanitize_name(name), ext))
+
+    return { 'func'   : func,
+             'args'   : tuple(spec.get('args', ())),
+             'kwargs' : dict(spec.get('kwargs', {})),
+             'name'   : name,
+             'path'   : path,
+             'savefig': savefig }
+
+
+def render_one(index, spec, worker = False):
+    '''
+    Builds and saves one figure. Errors are captured and returned in the
+    result instead of being raised.
+
+    @param worker (bool): the figure is rendered in a worker process, so the
+           timing counters are returned in the result
+
+    @return RenderResult: result of the rendering
+    '''
+    start = time.time()
+    fig = None
+    try:
+        fig = spec['func'](*spec['args'], **spec['kwargs'])
+        assert fig is not None, 'Figure builder did not return a figure'
+
+        directory = os.path.dirname(spec['path'])
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created by another worker
+                if not os.path.isdir(directory):
+                    raise
+
+        fig.savefig(spec['path'], **spec['savefig'])
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        if fig is not None:
+            close_figure(fig)
+
+    return RenderResult(index, spec['name'], spec['path'], error, time.time() - start,
+                        profile.take() if worker else None)
+
+
+def close_figure(fig):
+    if hasattr(fig, 'close'):
+        fig.close()
+    elif 'matplotlib.pyplot' in sys.modules:
+        sys.modules['matplotlib.pyplot'].close(fig)
+
+
+def render_batch(specs, workers = None, output_dir = '.', format = DEFAULT_FORMAT,
+                 mp_context = None):
+    '''
+    Renders a batch of figures using a pool of worker processes
+
+    Each entry of the batch is a picklable callable (e.g. a module-level
+    function) that builds and returns a figure, or a dictionary describing the
+    call (see normalize_spec). Workers use the Agg backend and are reused
+    for many figures, so matplotlib is only imported once per worker.
+
+    @param specs (list): figures to be rendered
+    @param workers (int): number of worker processes. Defaults to the number
+           of CPUs. If 0, figures are rendered in the calling process
+    @param output_dir (str): directory for the entries without output path
+    @param format (str): file format for the entries without output path
+    @param mp_context (str): multiprocessing start method ('fork', 'spawn',
+           'forkserver'). Defaults to the platform default
+
+    @return list: one RenderResult per entry, in the order of the entries
+
+    @raise ValueError: if several entries have the same output path
+    '''
+    specs = [ normalize_spec(spec, i, output_dir, format) for i, spec in enumerate(specs) ]
+
+    paths = {}
+    for i, spec in enumerate(specs):
+        path = os.path.normcase(os.path.abspath(spec['path']))
+        if path in paths:
+            raise ValueError('Batch entries {0} and {1} have the same output path "{2}"'.format(paths[path], i, spec['path']))
+        paths[path] = i
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(specs))
+
+    if workers == 0:
+        results = [ render_one(i, spec) for i, spec in enumerate(specs) ]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        kwargs = {}
+        if mp_context is not None:
+            import multiprocessing
+            kwargs['mp_context'] = multiprocessing.get_context(mp_context)
+
+        results = [ None ] * len(specs)
+        with ProcessPoolExecutor(max_workers = workers, initializer = init_worker,
+                                 initargs = (profile.ENABLED, ), **kwargs) as executor:
+            futures = [ executor.submit(render_one, i, spec, True) for i, spec in enumerate(specs) ]
+            for i, future in enumerate(futures):
+                try:
+                    results[i] = future.result()
+                except Exception:
+                    # The entry could not be sent to a worker (e.g. it is not
+                    # picklable) or the worker died
+                    results[i] = RenderResult(i, specs[i]['name'], specs[i]['path'], traceback.format_exc(), 0.0, None)
+
+    for result in results:
+        # Counters of the workers are accumulated in this process
+        profile.merge(result.profile)
+
+        if result.error is None:
+            utils.debug('Rendered figure "{0}" in "{1}" ({2:.2f}s)'.format(result.name, result.path, result.elapsed))
+        else:
+            utils.error('Figure "{0}" failed:\n{1}'.format(result.name, result.error))
+
+    return results
@@ -0,0 +1,63 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import argparse
+import sys
+
+from . import utils
+
+
+def render(args):
+    from . import plot
+    from . import spec
+
+    plot.set_headless()
+
+    specs = []
+    for path in args.specs:
+        specs += spec.load(path)
+
+    try:
+        results = spec.render(specs, output_dir = args.output_dir, format = args.format, workers = args.workers)
+    except ValueError as e:
+        # e.g. several specs with the same output path
+        utils.error(str(e))
+        return 2
+
+    failed = [ r for r in results if r.error is not None ]
+    utils.message('Rendered {0} figures ({1} failed)'.format(len(results) - len(failed), len(failed)))
+
+    return 1 if failed else 0
+
+
+def parser():
+    p = argparse.ArgumentParser(prog = 'figplotter', description = 'Figure plotter using matplotlib')
+    subparsers = p.add_subparsers(dest = 'command')
+
+    p_render = subparsers.add_parser('render', help = 'render JSON/YAML figure specs')
+    p_render.add_argument('specs', nargs = '+', help = 'spec files')
+    p_render.add_argument('-o', '--output-dir', default = '.',
+                          help = 'directory for the figures (default: current directory)')
+    p_render.add_argument('-f', '--format', default = 'png',
+                          help = 'file format of the figures without output path (default: png)')
+    p_render.add_argument('-j', '--workers', type = int, default = 0,
+                          help = 'number of worker processes (default: 0, render in this process)')
+    p_render.set_defaults(func = render)
+
+    return p
+
+
+def main(argv = None):
+    args = parser().parse_args(argv)
+    if getattr(args, 'func', None) is None:
+        parser().print_help()
+        return 2
+
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
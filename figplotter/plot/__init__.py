@@ -4,9 +4,7 @@ Created on Jan 19, 2015
 @author: Javier Cabezas <javier.cabezas@gmail.com>
 '''
 
-import matplotlib
-import matplotlib.pyplot as plt
-
+from . import backend
 from . import defaults
 from . import info
 from . import plotter
@@ -16,11 +14,22 @@ plot_series      = plot.plot_series
 bar_series       = plot.bar_series
 cluster_series   = plot.cluster_series
 cluster_series_2 = plot.cluster_series_2
+cluster_series_n = plot.cluster_series_n
 
 
 for func, params in plotter.PLOTTER_FUNCS.items():
     defaults.register_function(func, params)
 
 
-def figure():
-    return plt.figure(FigureClass=info.Figure)
+def figure(**kwargs):
+    '''
+    @param kwargs: keyword args for matplotlib.pyplot.figure and Figure (e.g.
+           name)
+
+    @return Figure: new figure. pyplot is imported on the first call, unless
+            the headless mode is enabled (see backend.set_headless)
+    '''
+    return backend.new_figure(info.Figure, **kwargs)
+
+
+set_headless = backend.set_headless
@@ -0,0 +1,70 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import os
+import sys
+
+import matplotlib
+
+'''
+In headless mode figures are created with an Agg canvas, without going
+through pyplot, so no GUI toolkit is ever probed or imported. It can be
+enabled with set_headless or with the FIGPLOTTER_HEADLESS environment
+variable.
+'''
+HEADLESS = os.environ.get('FIGPLOTTER_HEADLESS', '0').lower() not in ('', '0', 'false', 'no')
+
+
+def set_headless(headless = True):
+    '''
+    Enables or disables the headless mode. Enabling it also selects the Agg
+    backend, in case pyplot is used afterwards.
+    '''
+    global HEADLESS
+    HEADLESS = headless
+
+    if headless:
+        matplotlib.use('Agg')
+
+
+def is_headless():
+    return HEADLESS
+
+
+def pyplot():
+    '''
+    @return module: matplotlib.pyplot, which is imported (and selects its
+            backend) on first use
+    '''
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def pyplot_loaded():
+    return 'matplotlib.pyplot' in sys.modules
+
+
+def new_figure(FigureClass, **kwargs):
+    '''
+    Creates a figure through pyplot, or with an Agg canvas in headless mode
+
+    @param FigureClass (class): class of the figure
+    @param kwargs: keyword args for pyplot.figure and the figure class
+    '''
+    if not HEADLESS:
+        return pyplot().figure(FigureClass = FigureClass, **kwargs)
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    kwargs.pop('num', None)
+    fig = FigureClass(**kwargs)
+    FigureCanvasAgg(fig)
+
+    return fig
+
+
+if HEADLESS:
+    set_headless()
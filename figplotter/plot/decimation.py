@@ -0,0 +1,220 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import numpy as np
+
+from . import sources
+
+
+def pixel_columns(ax):
+    '''
+    @return int: width of the axis in pixels
+    '''
+    return max(int(round(ax.bbox.width)), 1)
+
+
+def crop(x_values, y_values, xlim):
+    '''
+    Removes the points outside of the given x limits, but keeps the closest
+    point at each side so that lines still reach the borders of the axis
+
+    @param x_values (ndarray): sorted x values
+    @param y_values (ndarray): y values
+    @param xlim (tuple): x limits
+
+    @return (ndarray, ndarray): cropped x and y values
+    '''
+    left, right = min(xlim), max(xlim)
+    start = max(np.searchsorted(x_values, left, side = 'left') - 1, 0)
+    end   = np.searchsorted(x_values, right, side = 'right') + 1
+
+    return x_values[start:end], y_values[start:end]
+
+
+def minmax(x_values, y_values, columns):
+    '''
+    Min-max envelope: keeps the minimum and the maximum point of each column,
+    in the order they appear in the series. Columns are equally spaced in x.
+    NaN values are ignored (columns that only contain NaN values are removed).
+
+    @param x_values (ndarray): sorted x values
+    @param y_values (ndarray): y values
+    @param columns (int): number of columns (usually pixel columns)
+
+    @return (ndarray, ndarray): decimated x and y values
+    '''
+    n = len(x_values)
+    if n <= 2 * columns:
+        return x_values, y_values
+
+    edges  = np.linspace(x_values[0], x_values[-1], columns + 1)[1:-1]
+    starts = np.unique(np.concatenate(([0], np.searchsorted(x_values, edges, side = 'left'))))
+    starts = starts[starts < n]
+
+    counts = np.diff(np.append(starts, n))
+    column = np.repeat(np.arange(len(starts)), counts)
+
+    mins = np.fmin.reduceat(y_values, starts)
+    maxs = np.fmax.reduceat(y_values, starts)
+
+    # First position of the minimum and the maximum of each column
+    index  = np.arange(n)
+    argmin = np.minimum.reduceat(np.where(y_values == mins[column], index, n), starts)
+    argmax = np.minimum.reduceat(np.where(y_values == maxs[column], index, n), starts)
+
+    indices = np.unique(np.concatenate((argmin[argmin < n], argmax[argmax < n], [0, n - 1])))
+
+    return x_values[indices], y_values[indices]
+
+
+def minmax_chunks(x_values, y_values, columns, chunk_size = None):
+    '''
+    Min-max envelope of a series that is processed in chunks (e.g. a memory
+    mapped file). It selects the same points as minmax, but the memory used
+    only depends on the chunk size and the number of columns.
+
+    @param x_values (array): sorted x values
+    @param y_values (array): y values
+    @param columns (int): number of columns (usually pixel columns)
+
+    @return (ndarray, ndarray): decimated x and y values
+    '''
+    n = len(x_values)
+    if n <= 2 * columns:
+        return np.asarray(x_values), np.asarray(y_values)
+
+    edges = np.linspace(float(x_values[0]), float(x_values[n - 1]), columns + 1)[1:-1]
+
+    # Minimum/maximum of each column and the first position where they appear
+    min_values  = np.full(columns, np.inf)
+    max_values  = np.full(columns, -np.inf)
+    min_indices = np.full(columns, -1, dtype = np.intp)
+    max_indices = np.full(columns, -1, dtype = np.intp)
+
+    for start, stop in sources.chunks(n, chunk_size):
+        x = np.asarray(x_values[start:stop])
+        y = np.asarray(y_values[start:stop], dtype = float)
+
+        starts = np.unique(np.concatenate(([0], np.searchsorted(x, edges, side = 'left'))))
+        starts = starts[starts < len(x)]
+        run    = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(x))))
+        chunk_columns = np.searchsorted(edges, x[starts], side = 'right')
+
+        for values, indices, reduce_, better in [ (min_values, min_indices, np.fmin, np.less),
+                                                  (max_values, max_indices, np.fmax, np.greater) ]:
+            extremes = reduce_.reduceat(y, starts)
+            index    = np.minimum.reduceat(np.where(y == extremes[run], np.arange(len(y)), len(y)), starts)
+
+            # Earlier chunks win ties, like the first position in minmax
+            update = (index < len(y)) & (better(extremes, values[chunk_columns]) | (indices[chunk_columns] < 0))
+            values[chunk_columns[update]]  = extremes[update]
+            indices[chunk_columns[update]] = index[update] + start
+
+    indices = np.concatenate((min_indices[min_indices >= 0], max_indices[max_indices >= 0], [0, n - 1]))
+    indices = np.unique(indices)
+
+    return np.asarray(x_values[indices]), np.asarray(y_values[indices])
+
+
+def lttb(x_values, y_values, threshold):
+    '''
+    Largest-Triangle-Three-Buckets downsampling: keeps the first and the last
+    points and, for each bucket in between, the point that forms the largest
+    triangle with the point selected in the previous bucket and the average of
+    the next bucket. Buckets are read one at a time, so the series can be
+    memory mapped.
+
+    @param x_values (array): x values
+    @param y_values (array): y values
+    @param threshold (int): number of points of the result
+
+    @return (ndarray, ndarray): decimated x and y values
+    '''
+    n = len(x_values)
+    if threshold >= n or threshold < 3:
+        return x_values, y_values
+
+    # Buckets of the points between the first and the last ones
+    bounds = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+
+    def bucket(i):
+        start, end = bounds[i], bounds[i + 1]
+        return (np.asarray(x_values[start:end], dtype = float),
+                np.asarray(y_values[start:end], dtype = float))
+
+    indices = np.empty(threshold, dtype = np.intp)
+    indices[0]  = 0
+    indices[-1] = n - 1
+
+    x_a, y_a = float(x_values[0]), float(y_values[0])
+    x, y = bucket(0)
+    for i in range(threshold - 2):
+        # Average of the next bucket, or the last point
+        if i + 1 < threshold - 2:
+            next_x, next_y = bucket(i + 1)
+            avg_x, avg_y = next_x.mean(), next_y.mean()
+        else:
+            avg_x, avg_y = float(x_values[n - 1]), float(y_values[n - 1])
+
+        # Twice the area of the triangles formed by the points of the bucket
+        area = np.abs((x_a - avg_x) * (y - y_a) - (x_a - x) * (avg_y - y_a))
+        a = int(np.argmax(area))
+        indices[i + 1] = bounds[i] + a
+        x_a, y_a = x[a], y[a]
+
+        if i + 1 < threshold - 2:
+            x, y = next_x, next_y
+
+    return x_values[indices], y_values[indices]
+
+
+DECIMATORS = {
+    'minmax': lambda x, y, columns: minmax(x, y, columns),
+    'lttb'  : lambda x, y, columns: lttb(x, y, 2 * columns),
+}
+
+
+def decimate(ax, x_values, y_values, mode, xlim = None, columns = None):
+    '''
+    Reduces a series to the pixel resolution of the axis
+
+    @param ax (Axes): axis the series is plotted on
+    @param x_values (array): sorted x values
+    @param y_values (array): y values
+    @param mode (str): 'minmax' or 'lttb'
+    @param xlim (tuple): visible x limits. Points outside them are removed
+    @param columns (int): horizontal resolution. Defaults to the width of the
+           axis in pixels
+
+    @return (ndarray, ndarray): decimated x and y values
+    '''
+    assert mode in DECIMATORS, 'Unknown decimation mode "{0}"'.format(mode)
+
+    # Memory-mapped series are not loaded, they are processed in chunks
+    chunked = sources.is_chunked(x_values) or sources.is_chunked(y_values)
+    if not sources.is_chunked(x_values):
+        x_values = np.asarray(x_values)
+    if not sources.is_chunked(y_values):
+        y_values = np.asarray(y_values)
+    assert len(x_values) == len(y_values), 'x and y values must have the same length'
+    if chunked:
+        assert sources.is_sorted(x_values), 'x values must be sorted to be decimated'
+    else:
+        assert np.all(x_values[1:] >= x_values[:-1]), 'x values must be sorted to be decimated'
+
+    if columns is None:
+        columns = pixel_columns(ax)
+
+    if xlim is not None:
+        x_values, y_values = crop(x_values, y_values, xlim)
+
+    if chunked:
+        if mode == 'minmax':
+            return minmax_chunks(x_values, y_values, columns)
+        x_values, y_values = DECIMATORS[mode](x_values, y_values, columns)
+        return np.asarray(x_values), np.asarray(y_values)
+
+    return DECIMATORS[mode](x_values, y_values, columns)
@@ -4,8 +4,6 @@ Created on Jan 19, 2015
 @author: Javier Cabezas <javier.cabezas@gmail.com>
 '''
 
-import itertools
-
 from .. import utils
 
 '''
@@ -33,6 +31,7 @@ plot_params = [
 
 overflow_params = [
     ('overflow::enable'   , True),
+    ('overflow::min_distance', 0),
     ('overflow::label::ha', 'left'),
     ('overflow::label::va', 'bottom'),
     ('overflow::label::fontsize', 9),
@@ -79,6 +78,11 @@ DEFAULTS = {
 }
 
 FUNCTION_DEFAULTS = {}
+# Values of the parameters registered for each function and style
+FUNCTION_DEFAULT_LAYERS = {}
+# Incremented whenever the registered defaults change (used to invalidate the
+# parameters cached by style.generate_params)
+FUNCTION_DEFAULTS_VERSION = 0
 
 legend_params = {
     'loc': 'best',
@@ -92,27 +96,34 @@ def merge_params(default, user):
 
 
 def register_function(fun, styles):
+    global FUNCTION_DEFAULTS_VERSION
+    FUNCTION_DEFAULTS_VERSION += 1
+
     FUNCTION_DEFAULTS[fun] = {}
+    FUNCTION_DEFAULT_LAYERS[fun] = {}
     for style_name, params in styles.items():
         FUNCTION_DEFAULTS[fun][style_name] = {}
         for param in params:
             FUNCTION_DEFAULTS[fun][style_name][param] = DEFAULTS[param]
 
+        # Precompute the default values of all the parameters, which are
+        # applied to all the series
+        query_dict = {}
+        for param in FUNCTION_DEFAULTS[fun][style_name].keys():
+            for k, v in FUNCTION_DEFAULTS[fun][style_name][param]:
+                query_dict[k] = v
 
-def get_function_defaults(fun, selectors, style):
-    assert fun in FUNCTION_DEFAULTS.keys(), 'Invalid function {0}'.format(fun)
-
-    ret = []
+        FUNCTION_DEFAULT_LAYERS[fun][style_name] = query_dict
 
-    combinations = itertools.product(*selectors)
 
-    for combination in list(combinations):
-        query = "::".join(combination)
-        query_dict = {}
-        for param in FUNCTION_DEFAULTS[fun][style].keys():
-            for k, v in FUNCTION_DEFAULTS[fun][style][param]:
-                query_dict[k] = v
+def get_function_defaults(fun, selectors, style):
+    '''
+    @return list: a single (query, values) pair whose query matches all the
+            combinations of selectors, so its cost does not depend on the
+            number of selectors
+    '''
+    assert fun in FUNCTION_DEFAULTS.keys(), 'Invalid function {0}'.format(fun)
 
-        ret += [(query, query_dict)]
+    query = "::".join(['*'] * len(selectors))
 
-    return ret
+    return [(query, FUNCTION_DEFAULT_LAYERS[fun][style])]
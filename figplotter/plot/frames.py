@@ -0,0 +1,136 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+from collections import OrderedDict
+
+import numpy as np
+
+from .. import utils
+
+'''
+Support for pandas DataFrames as input of the plotter functions. pandas is not
+imported: frames are detected by duck typing, so it is not a dependency.
+Columns are the series and the levels of the (Multi)Index are the levels of
+clusters. Column and index labels are converted to strings, as they are used
+in the style queries.
+'''
+
+
+def is_dataframe(obj):
+    return hasattr(obj, 'columns') and hasattr(obj, 'index') and hasattr(obj, 'to_numpy')
+
+
+def column_array(frame, column):
+    '''
+    @return ndarray: values of a column (not copied for numeric columns)
+    '''
+    return np.asarray(frame[column].to_numpy())
+
+
+def frame_columns(frame, key_order = None):
+    '''
+    @param key_order (list): names of the selected columns. Defaults to all
+           the columns
+
+    @return (list, list): labels and names of the selected columns
+    '''
+    columns = list(frame.columns)
+    if key_order is None:
+        return columns, [ str(column) for column in columns ]
+
+    by_name = dict((str(column), column) for column in columns)
+    keys = [ str(key) for key in key_order ]
+    for key in keys:
+        assert key in by_name, 'Column "{0}" does not exist. Valid values are: {1}'.format(key, list(by_name.keys()))
+
+    return [ by_name[key] for key in keys ], keys
+
+
+def index_ticks(index):
+    '''
+    @return (ndarray, list): ticks and tick labels for the index of a frame
+            used as x values. Numeric indices are used as ticks, other indices
+            are used as labels of consecutive ticks. A default index (0, 1,
+            ...) returns (None, None)
+    '''
+    values = np.asarray(index.to_numpy())
+    if values.dtype.kind in 'iuf':
+        if np.array_equal(values, np.arange(len(values))):
+            return None, None
+        return values, None
+
+    return np.arange(len(values)), [ str(value) for value in values ]
+
+
+def series_from_frame(frame, key_order = None, ticks = None, ticklabels = None):
+    '''
+    Converts a frame to the arguments of simple_series
+
+    @return (OrderedDict, list, ndarray, list): series, key_order, ticks and
+            ticklabels
+    '''
+    columns, keys = frame_columns(frame, key_order)
+    series = OrderedDict((key, column_array(frame, column)) for column, key in zip(columns, keys))
+
+    if ticks is None and ticklabels is None:
+        assert getattr(frame.index, 'nlevels', 1) == 1, 'Use the cluster plotters for frames with a MultiIndex'
+        ticks, ticklabels = index_ticks(frame.index)
+
+    return series, keys, ticks, ticklabels
+
+
+def cluster_data_from_frame(frame, key_order = None):
+    '''
+    Converts a frame to a ClusterData object. The clusters of each level are
+    the values of the corresponding level of the index, in order of
+    appearance. If the index contains all the combinations of clusters in
+    order, the values of the frame are only reshaped (not copied if possible);
+    missing combinations are NaN. The index must be unique (aggregate repeated
+    entries before plotting, e.g. with frame.groupby(level = ...).mean()) and
+    must not contain missing (NaN) cluster names.
+
+    @return ClusterData: the data of the frame
+    '''
+    columns, keys = frame_columns(frame, key_order)
+    index = frame.index
+    assert index.is_unique, 'The index of the frame contains repeated entries; aggregate them before plotting'
+
+    clusters = []
+    codes    = []
+    for level in range(getattr(index, 'nlevels', 1)):
+        level_values = index.get_level_values(level)
+        assert not level_values.hasnans, 'Level {0} of the index contains missing cluster names'.format(level)
+        uniques = level_values.unique()
+        clusters.append([ str(cluster) for cluster in uniques ])
+        codes.append(np.asarray(uniques.get_indexer(level_values)))
+
+    if columns == list(frame.columns):
+        values = np.asarray(frame.to_numpy())
+    else:
+        values = np.column_stack([ column_array(frame, column) for column in columns ])
+
+    shape = tuple(len(level) for level in clusters)
+    flat  = np.ravel_multi_index(codes, shape)
+
+    if len(flat) == int(np.prod(shape)) and np.array_equal(flat, np.arange(len(flat))):
+        values = values.reshape(shape + (len(keys), ))
+    else:
+        full = np.full((int(np.prod(shape)), len(keys)), np.nan)
+        full[flat] = values
+        values = full.reshape(shape + (len(keys), ))
+
+    return utils.ClusterData(values, clusters, keys)
+
+
+def frame_digest_values(frame):
+    '''
+    @return tuple: values that identify the contents of a frame (used by the
+            render cache)
+    '''
+    index = frame.index
+    levels = [ np.asarray(index.get_level_values(l)) for l in range(getattr(index, 'nlevels', 1)) ]
+
+    return (list(frame.columns), levels, np.asarray(frame.to_numpy()))
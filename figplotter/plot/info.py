@@ -1,57 +1,217 @@
-import matplotlib.pyplot as plt
+import matplotlib
 
 from matplotlib.figure import Figure as PLTFigure
 
 from collections import OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
+import numpy as np
+import os
+
+from .. import __version__
+from .. import profile
 from .. import utils
+from . import backend
+from . import decimation
+from . import frames
+from . import overflow
+from . import plotter
+from . import render_cache
+from . import sources
+
+def grow(buf, size, n, dtype):
+    '''
+    Returns a buffer with room for n more elements after the first size ones.
+    The capacity of the buffer is (at least) doubled when it is exceeded, so
+    appending n elements is amortized O(n).
+    '''
+    if buf is not None and len(buf) >= size + n and np.can_cast(dtype, buf.dtype):
+        return buf
+
+    capacity = max(2 * (len(buf) if buf is not None else 0), size + n, 16)
+    if buf is not None:
+        dtype = np.result_type(buf.dtype, dtype)
+    new_buf = np.empty(capacity, dtype = dtype)
+    if size > 0:
+        new_buf[:size] = buf[:size]
+
+    return new_buf
+
+
+def object_array(values):
+    '''
+    @return ndarray: 1D array of objects (tuples are not expanded)
+    '''
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values
+
+    values = list(values)
+    arr = np.empty(len(values), dtype = object)
+    for i, v in enumerate(values):
+        arr[i] = v
+
+    return arr
+
+
+class Buffer(object):
+    '''
+    Growable contiguous 1D array. The initial values are adopted without
+    copying when they already are a contiguous array. Memory-mapped values
+    and lazy x values (see sources) are adopted as they are. Values are
+    exposed as read-only views.
+    '''
+    __slots__ = ('data', 'size')
+
+    def __init__(self, values = None):
+        if values is None:
+            self.data = None
+            self.size = 0
+        elif sources.is_chunked(values):
+            self.data = values
+            self.size = len(values)
+        else:
+            self.data = np.ascontiguousarray(values)
+            self.size = len(self.data)
+
+    def append(self, values):
+        values = np.asarray(values)
+        n = len(values)
+        if n == 0:
+            return
+
+        self.data = grow(self.data, self.size, n, values.dtype)
+        self.data[self.size:self.size + n] = values
+        self.size += n
+
+    @property
+    def values(self):
+        '''
+        @return ndarray: read-only view of the values. The data may belong to
+                the caller or be shared (e.g. the bar positions of a cached
+                layout), so it cannot be modified through the view
+        '''
+        if self.data is None:
+            return np.empty(0)
+
+        values = self.data[:self.size]
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+
+        return values
+
+    def __len__(self):
+        return self.size
+
 
 class SeriesInfo(object):
+    __slots__ = ('id_', 'name', 'handle', 'decimate',
+                 'overflow_params', 'overflow_ylim', 'overflow_labels',
+                 '_x', '_y')
+
     def __init__(self, id_):
         self.id_    = id_
         self.name   = None
         self.handle = None
 
+        self.decimate = None
+
+        self.overflow_params = None
+        self.overflow_ylim   = None
+        self.overflow_labels = []
+
+        self._x = Buffer()
+        self._y = Buffer()
+
+    @property
+    def x_values(self):
+        return self._x.values
+
+    @property
+    def y_values(self):
+        return self._y.values
+
     def set_legend_info(self, name, handle):
         self.name   = name
         self.handle = handle
 
     def set_points(self, x_values, y_values):
-        self.x_values = x_values
-        self.y_values = y_values
+        assert len(x_values) == len(y_values), 'x and y values must have the same length'
+
+        self._x = Buffer(x_values)
+        self._y = Buffer(y_values)
+
+    def set_decimation(self, mode, columns = None):
+        self.decimate = (mode, columns)
+
+    def set_overflow(self, overflow_params, ylim, labels):
+        self.overflow_params = overflow_params
+        self.overflow_ylim   = ylim
+        self.overflow_labels = list(labels)
+
+    def extend(self, x_values, y_values):
+        '''
+        Appends points to the series. Points are stored in buffers that grow
+        geometrically, and x_values/y_values are views of their used part.
+
+        @param x_values (ndarray): new x values
+        @param y_values (ndarray): new y values
+        '''
+        assert len(x_values) == len(y_values), 'x and y values must have the same length'
+
+        self._x.append(x_values)
+        self._y.append(y_values)
 
     def merge(self, series_info):
         assert self.name == series_info.name, 'Series name do not match'
 
-        self.x_values.append(series_info.x_values)
-        self.y_values.append(series_info.y_values)
+        self.extend(series_info.x_values, series_info.y_values)
 
     def __str__(self):
         s = "{0} = {1}: ".format(self.id_, self.name) + "{0}".format(', '.join(["(%.2f, %.2f)" % (float(x), float(y)) for x, y in zip(self.x_values, self.y_values)]))
         return s
 
 class ClusterInfo(object):
+    __slots__ = ('_names', '_x')
+
     def __init__(self):
-        self.cluster_names    = None
-        self.cluster_x_values = None
-        self.clusters = {}
+        self._names = Buffer()
+        self._x     = Buffer()
 
-    def set_clusters(self, names, x_values):
-        self.cluster_names    = names
-        self.cluster_x_values = x_values
+    @property
+    def cluster_names(self):
+        return self._names.values
 
-        for name, x in zip(names, x_values):
-            if name not in self.clusters.keys():
-                self.clusters[name] = []
+    @property
+    def cluster_x_values(self):
+        return self._x.values
 
-            self.clusters[name].append(x)
+    @property
+    def clusters(self):
+        '''
+        @return OrderedDict: x values of each cluster name
+        '''
+        clusters = OrderedDict()
+        for name, x in zip(self.cluster_names, self.cluster_x_values):
+            clusters.setdefault(name, []).append(x)
+
+        return clusters
+
+    def set_clusters(self, names, x_values):
+        assert len(names) == len(x_values), 'Cluster names and x values must have the same length'
+
+        self._names = Buffer(object_array(names))
+        self._x     = Buffer(x_values)
 
     def merge(self, cluster_info):
-        self.cluster_names.append(cluster_info.cluster_names)
-        self.cluster_x_values.append(cluster_info.cluster_x_values)
+        self._names.append(cluster_info.cluster_names)
+        self._x.append(cluster_info.cluster_x_values)
 
     def __str__(self):
-        clusters = ['{0}: {1}'.format(name, ', '.join([ "%.2f" % v for v in self.clusters[name] ])) for name in list(OrderedDict.fromkeys(self.cluster_names)) ]
+        clusters = self.clusters
+        clusters = ['{0}: {1}'.format(name, ', '.join([ "%.2f" % v for v in clusters[name] ])) for name in clusters.keys() ]
         s = ', '.join(clusters)
         return s
 
@@ -66,6 +226,16 @@ class AxisInfo(object):
 
         self.clusters = {}
 
+        # Properties and legend deferred by the plotter functions (see flush)
+        self.properties_ = OrderedDict()
+        self.snapshot_   = {}
+        self.legend_     = None
+
+        # Default colors used by bar collections, and pending update of the
+        # view limits (see plot.bars_collection)
+        self.color_index_ = 0
+        self.autoscale_   = False
+
     def add_series(self, id_, series_info):
         if id_ not in self.series.keys():
             self.series[id_] = series_info
@@ -77,6 +247,93 @@ class AxisInfo(object):
             if series not in self.series_order:
                 self.series_order.append(series)
 
+    def extend(self, series_key, x_values, y_values):
+        '''
+        Appends points to a line series that is already plotted in the axis.
+        The line is updated in place, and the data limits and overflow labels
+        are only updated for the new points. The figure must be redrawn
+        afterwards (e.g. fig.canvas.draw_idle()).
+
+        @param series_key: key of the series
+        @param x_values (array): new x values
+        @param y_values (array): new y values
+
+        @return list: overflow labels created for the new points
+        '''
+        assert series_key in self.series.keys(), 'Series {0} does not exist'.format(series_key)
+
+        self.flush_properties()
+
+        series_info = self.series[series_key]
+        assert hasattr(series_info.handle, 'set_data'), 'Only line series can be extended'
+
+        x_values = np.atleast_1d(np.asarray(x_values))
+        y_values = np.atleast_1d(np.asarray(y_values))
+        if len(x_values) == 0:
+            return []
+
+        series_info.extend(x_values, y_values)
+
+        x_plot, y_plot = series_info.x_values, series_info.y_values
+        if series_info.decimate is not None:
+            mode, columns = series_info.decimate
+            xlim = None if self.ax.get_autoscalex_on() else self.ax.get_xlim()
+            x_plot, y_plot = decimation.decimate(self.ax, x_plot, y_plot, mode,
+                                                 xlim = xlim, columns = columns)
+        series_info.handle.set_data(x_plot, y_plot)
+
+        self.ax.update_datalim(np.column_stack((x_values, y_values)))
+        self.ax.autoscale_view()
+
+        labels = []
+        if series_info.overflow_params is not None:
+            # As in simple_series, labels are placed at the plotted (decimated)
+            # points, i.e. the ones in the range of the new points
+            new = np.asarray(x_plot) >= np.min(x_values)
+            x_new, y_new = np.asarray(x_plot)[new], np.asarray(y_plot)[new]
+
+            # Labels are placed from left to right, so new labels must keep
+            # the minimum distance to the last one
+            min_distance = series_info.overflow_params.get('min_distance', 0)
+            if min_distance > 0 and len(series_info.overflow_labels) > 0:
+                last = series_info.overflow_labels[-1].get_position()[0]
+                keep = x_new >= last + min_distance
+                x_new, y_new = x_new[keep], y_new[keep]
+
+            labels = overflow.plot_overflow(self.ax, x_new, y_new, series_info.overflow_ylim,
+                                            series_info.overflow_params)
+            series_info.overflow_labels.extend(labels)
+
+        # The new points are part of the contents of the figure (see
+        # Figure.render_key)
+        self.figure_info.add_call(self.ax, 'extend', [ series_key, x_values, y_values ], {})
+        self.figure_info.add_revision()
+
+        return labels
+
+    def next_color(self, colors):
+        '''
+        @param colors (list): colors of the property cycle
+
+        @return color: next default color of the axis
+        '''
+        color = colors[self.color_index_ % len(colors)]
+        self.color_index_ += 1
+
+        return color
+
+    def request_autoscale(self):
+        '''
+        Requests an update of the view limits for artists that only updated
+        the data limits. It is done once, by autoscale.
+        '''
+        self.autoscale_ = True
+
+    def autoscale(self):
+        if self.autoscale_:
+            self.autoscale_ = False
+            self.ax.autoscale_view()
+
     def set_clusters(self, cluster_info, level = 0):
         if level not in self.clusters.keys():
             self.clusters[level] = cluster_info
@@ -84,7 +341,9 @@ class AxisInfo(object):
             self.clusters[level].merge(cluster_info)
 
     def legend(self, **legend_params):
-        order = self.series_order
+        self.series_legend(self.series_order, legend_params)
+
+    def series_legend(self, order, legend_params):
         if order is None:
             order = self.series.keys()
 
@@ -93,6 +352,77 @@ class AxisInfo(object):
 
         self.ax.legend(handles, labels, **legend_params)
 
+    def property_value(self, key):
+        '''
+        @return: current value of an axes property, used to detect properties
+                 changed directly in the axis after they were deferred
+        '''
+        axis = key[0]
+        if key.endswith('label'):
+            return self.ax.get_xlabel() if axis == 'x' else self.ax.get_ylabel()
+        elif key.endswith('scale'):
+            return self.ax.get_xscale() if axis == 'x' else self.ax.get_yscale()
+        elif key.endswith('lim'):
+            # Limits are not computed while autoscaling is enabled
+            if self.ax.get_autoscalex_on() if axis == 'x' else self.ax.get_autoscaley_on():
+                return None
+            return self.ax.get_xlim() if axis == 'x' else self.ax.get_ylim()
+        elif key.endswith('grid'):
+            gridlines = self.ax.xaxis.get_gridlines() if axis == 'x' else self.ax.yaxis.get_gridlines()
+            return any(line.get_visible() for line in gridlines)
+
+        return None
+
+    def defer_properties(self, properties):
+        '''
+        Records axes properties (see plotter.axes_properties) to be applied
+        by flush_properties. Later values of a property replace earlier ones.
+        '''
+        for key, value in properties.items():
+            if key not in self.properties_.keys():
+                self.snapshot_[key] = self.property_value(key)
+            self.properties_[key] = value
+
+    def defer_legend(self, legend_params):
+        '''
+        Requests a legend with the series plotted so far, to be built by
+        flush. Only the last request is built.
+        '''
+        self.legend_ = (legend_params, list(self.series_order))
+
+    def pending(self):
+        return len(self.properties_) > 0 or self.legend_ is not None
+
+    def flush_properties(self):
+        '''
+        Applies the deferred axes properties. Properties changed directly in
+        the axis since they were deferred are not modified.
+        '''
+        if len(self.properties_) == 0:
+            return
+
+        properties = dict((key, value) for key, value in self.properties_.items()
+                          if self.property_value(key) == self.snapshot_[key])
+        self.properties_.clear()
+        self.snapshot_.clear()
+
+        with profile.phase('axes', self.figure_info.name):
+            plotter.set_axes_properties(self.ax, properties)
+
+    def flush(self):
+        '''
+        Applies the deferred axes properties and builds the deferred legend
+        '''
+        self.figure_info.add_revision()
+        self.flush_properties()
+
+        if self.legend_ is not None:
+            legend_params, order = self.legend_
+            self.legend_ = None
+
+            with profile.phase('legend', self.figure_info.name):
+                self.series_legend(order, legend_params)
+
     def __str__(self):
         s = 'SERIES\n'
         order = self.series_order
@@ -109,13 +439,31 @@ class AxisInfo(object):
 
         return s
 
+class Untracked(object):
+    '''
+    Context in which the changes of a figure are made by figplotter (e.g. the
+    deferred properties or the rendering), so they are not considered
+    modifications made outside of the plotter functions (see Figure.stale)
+    '''
+
+    def __init__(self, fig):
+        self.fig = fig
+
+    def __enter__(self):
+        self.fig.untracked_ += 1
+        return self
+
+    def __exit__(self, *args):
+        self.fig.untracked_ -= 1
+        return False
+
+
 class Figure(PLTFigure):
     figure_index = 1
 
     def __init__(self, *args, **kwargs):
-        name = kwargs.get('name', None)
+        name = kwargs.pop('name', None)
         if name is not None:
-            del kwargs[name]
             self.name = name
         else:
             self.name = 'figure{0}'.format(Figure.figure_index)
@@ -126,6 +474,36 @@ class Figure(PLTFigure):
         self.axes_   = {}
         self.series_ = {}
 
+        # Digests of the plotter calls, used as key of the render cache. The
+        # figure can only be cached if the cache is enabled when it is created
+        self.calls_     = []
+        self.cacheable_ = render_cache.get_cache() is not None
+        # Changes made outside of figplotter after the last plotter call (see
+        # stale)
+        self.modified_  = False
+        self.untracked_ = 0
+        # Changes made by figplotter outside of the plotter calls (e.g.
+        # AxisInfo.extend or flush)
+        self.revision_  = 0
+
+    @property
+    def stale(self):
+        return PLTFigure.stale.fget(self)
+
+    @stale.setter
+    def stale(self, value):
+        # Artists propagate their changes to the figure, so any change made
+        # directly in the figure or its axes is detected here
+        if value and getattr(self, 'untracked_', 1) == 0:
+            self.modified_ = True
+        PLTFigure.stale.fset(self, value)
+
+    def untracked(self):
+        '''
+        @return Untracked: context for changes made by figplotter
+        '''
+        return Untracked(self)
+
     def get_axis_info(self, ax):
         if ax not in self.axes_.keys():
             self.axes_[ax] = AxisInfo(ax, self)
@@ -163,14 +541,236 @@ class Figure(PLTFigure):
 
         return ax2
 
+    def facet_level(self, data, by):
+        '''
+        @return int: position of the level used by facet to split data (None
+                if the data is not split)
+        '''
+        if by is None or isinstance(by, int) or not frames.is_dataframe(data):
+            return by
+
+        names = list(data.index.names)
+        assert by in names, 'Invalid level "{0}". Valid values are: {1}'.format(by, names)
+
+        return names.index(by)
+
+    def facet_panels(self, data, by, cluster):
+        '''
+        @param by (int): position of the level used to split data (see
+               facet_level)
+
+        @return list: (facet, data) of each panel of facet
+        '''
+        if by is None:
+            assert isinstance(data, Mapping), 'Facet data must be a dictionary of panels if by is not given'
+            return list(data.items())
+
+        if frames.is_dataframe(data):
+            if not cluster:
+                return [ (facet, data.xs(facet, level = by))
+                         for facet in data.index.get_level_values(by).unique() ]
+            data = frames.cluster_data_from_frame(data)
+
+        assert isinstance(data, utils.ClusterData), 'Facet data must be a DataFrame or a ClusterData object if by is given'
+        assert isinstance(by, int), 'Levels of ClusterData objects are given by position'
+
+        return list(data.split(by).items())
+
+    def facet(self, data, plot_func, by = None, nrows = None, ncols = None,
+              sharex = True, sharey = True, titles = True, legend_panel = 0, **kwargs):
+        '''
+        Plots a grid of panels (small multiples) with the same plotter and
+        arguments. The plotters resolve their styles, layout and tick
+        locators/formatters once and share them across the panels (see
+        plotter.SharedSetups).
+
+        @param data: dictionary with the data of each panel, or a DataFrame or
+               ClusterData object split in panels by the clusters of level by
+        @param plot_func (function or str): plotter function (e.g.
+               cluster_series) or its name
+        @param by (int or str): level used to split data. Names can be used
+               for the levels of DataFrames
+        @param nrows, ncols (int): shape of the grid. Defaults to a square
+               grid
+        @param sharex, sharey (bool): share the axes of the panels
+        @param titles (bool): use the facets as titles of the panels
+        @param legend_panel (int): index of the panel that shows the legend
+        @param kwargs: keyword args for the plotter function
+
+        @return list: axes of the panels
+        '''
+        if isinstance(plot_func, str):
+            funcs = plotter.PLOTTER_FUNCS
+            assert plot_func in funcs, 'Invalid plotter "{0}". Valid values are: {1}'.format(plot_func, list(funcs.keys()))
+            plot_func = plotter.PLOTTERS[plot_func]
+
+        by      = self.facet_level(data, by)
+        cluster = getattr(plot_func, 'plotter_name', None) in plotter.CLUSTER_PLOTTERS
+        panels  = self.facet_panels(data, by, cluster)
+        n = len(panels)
+        assert n > 0, 'Facet data is empty'
+        assert 0 <= legend_panel < n, 'Invalid legend panel {0} for {1} facets'.format(legend_panel, n)
+
+        if ncols is None:
+            ncols = int(np.ceil(np.sqrt(n))) if nrows is None else int(np.ceil(n / float(nrows)))
+        if nrows is None:
+            nrows = int(np.ceil(n / float(ncols)))
+        assert nrows * ncols >= n, 'Grid of {0}x{1} panels is too small for {2} facets'.format(nrows, ncols, n)
+
+        grid = self.subplots(nrows, ncols, sharex = sharex, sharey = sharey, squeeze = False).ravel()
+        for ax in grid[n:]:
+            self.axes_.pop(ax, None)
+            ax.remove()
+        if sharex:
+            # Shared x tick labels are only shown in the bottom row, which
+            # may have unused cells
+            for ax in grid[max(n - ncols, 0):n]:
+                ax.xaxis.set_tick_params(which = 'both', labelbottom = True)
+
+        if cluster and by is not None and kwargs.get('clusters', None) is not None:
+            # The level used to split the data is not plotted
+            clusters = list(kwargs['clusters'])
+            kwargs['clusters'] = clusters[:by] + clusters[by + 1:]
+
+        legend = kwargs.pop('legend', True)
+
+        axes = []
+        with plotter.SharedSetups(), self.untracked():
+            for i, ((facet, panel_data), ax) in enumerate(zip(panels, grid)):
+                plot_func(ax, panel_data, legend = legend and i == legend_panel, **kwargs)
+                if titles:
+                    ax.set_title(str(facet))
+                axes.append(ax)
+
+        return axes
+
+    def flush(self, ax = None):
+        '''
+        Applies the legends and axes properties deferred by the plotter
+        functions. It is called when the figure is drawn, saved or shown, and
+        it can be called earlier (e.g. to query the limits of an axis).
+
+        @param ax (Axes): only flush this axis. Defaults to all the axes
+        '''
+        axis_infos = self.axes_.values() if ax is None else [ self.get_axis_info(ax) ]
+        axis_infos = [ axis_info for axis_info in axis_infos if axis_info.pending() ]
+        if len(axis_infos) == 0:
+            return
+
+        # The deferred artists belong to the plotter calls, so they do not
+        # prevent caching the figure
+        with self.untracked():
+            for axis_info in axis_infos:
+                axis_info.flush()
+
+    def draw(self, renderer):
+        self.flush()
+        with self.untracked():
+            return PLTFigure.draw(self, renderer)
+
+    def tight_layout(self, *args, **kwargs):
+        self.flush()
+        return PLTFigure.tight_layout(self, *args, **kwargs)
+
     def close(self):
-        plt.close(self)
+        # Figures are only registered in pyplot if it has been imported
+        if backend.pyplot_loaded():
+            backend.pyplot().close(self)
 
     def show(self, warn=True):
         utils.message('Showing figure "%s"' % self.name)
+        self.flush()
         return PLTFigure.show(self, warn=warn)
 
+    def add_revision(self):
+        '''
+        Records a change of the contents of the figure made outside of the
+        plotter functions (see render_key)
+        '''
+        self.revision_ += 1
+
+    def add_call(self, ax, func_name, args, kwargs):
+        '''
+        Records a call to a plotter function (see plotter.plotter_func)
+        '''
+        self.modified_ = False
+        if not self.cacheable_:
+            return
+
+        try:
+            index = self.axes.index(ax) if ax in self.axes else -1
+            self.calls_.append(render_cache.digest(func_name, index, list(args), kwargs))
+        except render_cache.Uncacheable as e:
+            utils.debug('Figure "{0}" cannot be cached: {1}'.format(self.name, e))
+            self.cacheable_ = False
+
+    def add_file(self, path):
+        '''
+        Records a file read by a plotter function (e.g. a memory-mapped data
+        source), so that the render cache is invalidated when it changes
+        '''
+        if not self.cacheable_:
+            return
+
+        st = os.stat(path)
+        self.calls_.append(render_cache.digest('file', os.path.abspath(path), st.st_size, st.st_mtime_ns))
+
+    def render_key(self, args, kwargs):
+        '''
+        Key of the figure in the render cache. It contains the digests of the
+        plotter calls (data, styles and arguments), the default parameters,
+        the versions of the libraries, the rcParams, the size, limits and
+        labels of the figure, the changes made by figplotter outside of the
+        plotter calls and the savefig arguments.
+
+        @return str: the key, or None if the figure cannot be cached (i.e.
+                the figure or its axes were modified outside of figplotter
+                after the last plotter call)
+        '''
+        if not self.cacheable_ or len(self.calls_) == 0 or self.modified_:
+            return None
+
+        state = [ (self.get_size_inches(), self.dpi, self._suptitle.get_text() if getattr(self, '_suptitle', None) else None) ]
+        for ax in self.axes:
+            state.append((ax.get_position().bounds, ax.get_title(), ax.get_xlabel(), ax.get_ylabel(),
+                          ax.get_xlim(), ax.get_ylim(), ax.get_xscale(), ax.get_yscale()))
+
+        rc = [ (k, repr(v)) for k, v in sorted(matplotlib.rcParams.items()) ]
+
+        try:
+            return render_cache.digest(__version__, matplotlib.__version__, np.__version__,
+                                       render_cache.defaults_digest(), self.calls_, self.revision_, state,
+                                       rc, list(args), kwargs)
+        except render_cache.Uncacheable:
+            return None
+
     def savefig(self, *args, **kwargs):
         utils.message('Saving figure "%s" in "%s"' % (self.name, args[0]))
-        PLTFigure.savefig(self, *args, **kwargs)
+
+        self.flush()
+
+        # Rendering does not modify the figure
+        with profile.phase('savefig', self.name), self.untracked():
+            cache = render_cache.get_cache()
+            if cache is None:
+                PLTFigure.savefig(self, *args, **kwargs)
+                return
+
+            fname = args[0]
+            if hasattr(fname, '__fspath__'):
+                fname = os.fspath(fname)
+
+            key = None
+            if isinstance(fname, str) and os.path.splitext(fname)[1]:
+                ext = os.path.splitext(fname)[1]
+                key = self.render_key(args[1:], kwargs)
+
+            if key is None:
+                cache.bypass()
+                PLTFigure.savefig(self, *args, **kwargs)
+            elif cache.get(key, ext, fname):
+                utils.debug('Figure "{0}" copied from the render cache'.format(self.name))
+            else:
+                PLTFigure.savefig(self, *args, **kwargs)
+                cache.put(key, ext, fname)
 
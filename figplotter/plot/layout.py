@@ -0,0 +1,133 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+def exclusive_cumsum(a):
+    '''
+    @return ndarray: cumulative sum along the last axis, starting at 0
+    '''
+    zeros = np.zeros(a.shape[:-1] + (1,))
+    return np.concatenate((zeros, np.cumsum(a, axis = -1)), axis = -1)
+
+
+class ClusterLayout(object):
+    '''
+    Positions of the bars and ticks of a hierarchy of clusters
+
+    A cluster at level l contains the clusters of level l + 1, and the
+    clusters of the last level contain one bar per series. Clusters of the
+    same level are placed one after the other, leaving the separation of both
+    neighbours between them, and the first and last clusters leave their outer
+    margin to the boundaries of their parent cluster.
+
+    All the positions are computed with array operations (one pass per
+    level), so a layout can be computed once and shared by all the axes that
+    use the same clusters and widths (see get_layout).
+    '''
+
+    def __init__(self, widths, outer, separation, offset = 0):
+        '''
+        @param widths (ndarray): width of each bar, with shape
+               (len(clusters[0]), ..., len(clusters[-1]), len(key_order))
+        @param outer (list): outer margin of each cluster, for each level l an
+               array with shape widths.shape[:l + 1]
+        @param separation (list): separation of each cluster, for each level l
+               an array with shape widths.shape[:l + 1]
+        @param offset (number): x position where the clusters start
+        '''
+        self.widths     = np.asarray(widths, dtype = float)
+        self.outer      = [ np.asarray(o, dtype = float) for o in outer ]
+        self.separation = [ np.asarray(s, dtype = float) for s in separation ]
+        self.offset     = offset
+
+        self.levels = self.widths.ndim - 1
+        self.shape  = self.widths.shape[:-1]
+
+        assert self.levels > 0, 'At least one level of clusters is required'
+        assert len(self.outer) == self.levels and len(self.separation) == self.levels, \
+               'Cluster parameters must be given for each level'
+        for level in range(self.levels):
+            assert self.outer[level].shape == self.shape[:level + 1] and \
+                   self.separation[level].shape == self.shape[:level + 1], \
+                   'Wrong shape of the cluster parameters for level {0}'.format(level)
+
+        # Widths of the clusters, from the innermost level to the outermost
+        cluster_widths = [ self.widths.sum(axis = -1) ]
+        for level in range(self.levels - 1, 0, -1):
+            w   = cluster_widths[0]
+            out = self.outer[level]
+            sep = self.separation[level]
+            cluster_widths.insert(0, w.sum(axis = -1) + out[..., 0] + out[..., -1] +
+                                     sep[..., :-1].sum(axis = -1) + sep[..., 1:].sum(axis = -1))
+        self.cluster_widths = cluster_widths
+
+        # Starts of the clusters, from the outermost level to the innermost
+        starts = []
+        parent_starts = np.asarray(float(offset))
+        for level in range(self.levels):
+            w   = cluster_widths[level]
+            sep = self.separation[level]
+            steps = w[..., :-1] + sep[..., :-1] + sep[..., 1:]
+            first = parent_starts + self.outer[level][..., 0]
+            starts.append(first[..., np.newaxis] + exclusive_cumsum(steps))
+            parent_starts = starts[-1]
+        self.starts = starts
+
+        # Bars of a cluster are placed one after the other
+        self.bar_x = starts[-1][..., np.newaxis] + np.cumsum(self.widths, axis = -1) - self.widths
+
+    def ticks(self, level):
+        '''
+        @return ndarray: center of each cluster of the given level
+        '''
+        return (self.starts[level] + self.cluster_widths[level] / 2.0).ravel()
+
+    def xlim(self):
+        '''
+        @return tuple: x limits that contain all the clusters and their outer
+                margins
+        '''
+        left  = self.starts[0][0] - self.outer[0][0]
+        right = self.starts[0][-1] + self.cluster_widths[0][-1] + self.outer[0][-1]
+
+        return left, right
+
+    def key(self):
+        return layout_key(self.widths, self.outer, self.separation, self.offset)
+
+
+def layout_key(widths, outer, separation, offset):
+    arrays = [ np.asarray(widths, dtype = float) ] + \
+             [ np.asarray(o, dtype = float) for o in outer ] + \
+             [ np.asarray(s, dtype = float) for s in separation ]
+
+    return (offset, ) + tuple((a.shape, a.tobytes()) for a in arrays)
+
+
+LAYOUT_CACHE      = OrderedDict()
+LAYOUT_CACHE_SIZE = 64
+
+
+def get_layout(widths, outer, separation, offset = 0):
+    '''
+    Returns a ClusterLayout for the given parameters. Layouts are cached, so
+    axes and figures with the same cluster structure and widths share them.
+    '''
+    key = layout_key(widths, outer, separation, offset)
+
+    layout = LAYOUT_CACHE.pop(key, None)
+    if layout is None:
+        layout = ClusterLayout(widths, outer, separation, offset)
+
+    LAYOUT_CACHE[key] = layout
+    while len(LAYOUT_CACHE) > LAYOUT_CACHE_SIZE:
+        LAYOUT_CACHE.popitem(last = False)
+
+    return layout
@@ -0,0 +1,127 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+
+import numpy as np
+
+from . import sources
+
+
+def cull_positions(x_values, min_distance):
+    '''
+    Selects positions so that no two selected positions are closer than
+    min_distance. Positions are selected greedily from left to right.
+
+    @param x_values (ndarray): positions
+    @param min_distance (number): minimum distance between positions
+
+    @return ndarray: indices of the selected positions
+    '''
+    order = np.argsort(x_values, kind = 'mergesort')
+    if min_distance <= 0:
+        return order
+
+    x_sorted = x_values[order]
+    selected = []
+    i = 0
+    while i < len(x_sorted):
+        selected.append(i)
+        i = np.searchsorted(x_sorted, x_sorted[i] + min_distance, side = 'left')
+
+    return order[selected]
+
+
+class OverflowLabels(Artist):
+    '''
+    Labels created by a call to plot_overflow. They are added to the axis as
+    a single artist, instead of one Text artist per label, and drawn in one
+    pass.
+    '''
+    zorder = 3
+
+    def __init__(self, ax, texts):
+        Artist.__init__(self)
+        self.texts = texts
+
+        self.set_figure(ax.figure)
+        self.set_clip_on(False)
+
+        for text in texts:
+            text.set_figure(ax.figure)
+            text.axes = ax
+            text.stale_callback = self.text_stale
+
+    def text_stale(self, text, value):
+        if value:
+            self.stale = True
+
+    def get_children(self):
+        return list(self.texts)
+
+    def get_window_extent(self, renderer = None):
+        bboxes = [ text.get_window_extent(renderer) for text in self.texts if text.get_visible() ]
+        if len(bboxes) == 0:
+            return Bbox.null()
+
+        return Bbox.union(bboxes)
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+
+        for text in self.texts:
+            text.draw(renderer)
+
+        self.stale = False
+
+
+def plot_overflow(ax, x, y, ylim, overflow_params):
+    '''
+    Plots labels with values greater than ylim
+
+    This function plots labels with values greater than ylim. Values are
+    compared with ylim for the whole array at once, and labels are only
+    created for the values that overflow. The labels are added to the axis as
+    a single OverflowLabels artist. If the 'min_distance' parameter is greater
+    than 0, labels closer than min_distance (in x) to a previous label are not
+    plotted.
+
+    @param ax (Axis): axis where to plot
+    @param x (number or ndarray): x values
+    @param y (number or ndarray): y values
+    @param ylim (number): maximum y value in the figure
+    @param overflow_params (dict): dictionary of parameters to be used for the labels
+
+    @return list: the created labels
+    '''
+    # Memory-mapped values are compared in chunks
+    x_values = x if sources.is_chunked(x) else np.atleast_1d(np.asarray(x, dtype = float))
+    y_values = y if sources.is_chunked(y) else np.atleast_1d(np.asarray(y, dtype = float))
+
+    overflow = sources.flatnonzero(y_values, lambda values: values >= ylim[1])
+    if len(overflow) == 0:
+        return []
+
+    x_values = np.asarray(x_values[overflow], dtype = float)
+    y_values = np.asarray(y_values[overflow], dtype = float)
+
+    selected = cull_positions(x_values, overflow_params.get('min_distance', 0))
+
+    label_params = { 'transform': ax.transData, 'clip_on': False }
+    label_params.update(overflow_params['label'])
+    y_label = ylim[1] + ylim[1] * 0.01
+
+    labels = [ Text(x_values[i],          # x
+                    y_label,              # y
+                    '%.2f' % y_values[i], # text
+                    **label_params) for i in selected ]
+    ax.add_artist(OverflowLabels(ax, labels))
+
+    return labels
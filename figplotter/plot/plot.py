@@ -4,17 +4,30 @@ Created on Jan 19, 2015
 @author: Javier Cabezas <javier.cabezas@gmail.com>
 '''
 
-from collections import OrderedDict, Mapping
-from mpl_toolkits.axes_grid1.inset_locator import mark_inset
-from mpl_toolkits.axes_grid1.inset_locator import zoomed_inset_axes
+from collections import OrderedDict, namedtuple
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.container import BarContainer
+from matplotlib.ticker import FixedLocator, FuncFormatter
 
 import copy
 import itertools
+import matplotlib
 import numpy as np
 
+from .. import profile
 from .. import utils
+from . import decimation
+from . import frames
 from . import info
+from . import layout
+from . import overflow
 from . import plotter
+from . import sources
 from . import style
 
 
@@ -38,7 +51,84 @@ def instantiate_params_series(params_out, params_in, series):
         params_out[key] = v
 
 
-def instantiate_params(params, series_list):
+class ParamsView(Mapping):
+    ''' Read-only view of a parameters dictionary for a series.
+
+    utils.Parameter objects are substituted with the value for the series the
+    first time the view is accessed. The resulting (flattened) dictionary is
+    cached, so it can be passed many times as keyword arguments. Nested
+    dictionaries are also returned as views.
+    '''
+
+    def __init__(self, params, series):
+        self.params   = params
+        self.series   = series
+        self.resolved = None
+
+    def resolve(self):
+        if self.resolved is None:
+            with profile.phase('params'):
+                resolved = {}
+                for key, value in self.params.items():
+                    if isinstance(value, utils.Parameter):
+                        # Instantiate the value for the current series
+                        if self.series in value.values.keys():
+                            resolved[key] = value.values[self.series]
+                    elif isinstance(value, Mapping):
+                        # Nested property, go to the next level
+                        resolved[key] = ParamsView(value, self.series)
+                    else:
+                        # Use the value "as is"
+                        resolved[key] = value
+
+                self.resolved = resolved
+
+        return self.resolved
+
+    def __getitem__(self, key):
+        return self.resolve()[key]
+
+    def __iter__(self):
+        return iter(self.resolve())
+
+    def __len__(self):
+        return len(self.resolve())
+
+    def copy(self):
+        return dict(self.resolve())
+
+    def __repr__(self):
+        return 'ParamsView({0}): {1}'.format(self.series, self.resolve())
+
+
+class ParamsInstances(Mapping):
+    ''' Read-only mapping from series identifiers to ParamsView objects.
+
+    Views are created the first time they are accessed.
+    '''
+
+    def __init__(self, params, series_list):
+        self.params      = params
+        self.series_list = list(series_list)
+        self.series_set  = set(self.series_list)
+        self.views       = {}
+
+    def __getitem__(self, series):
+        if series not in self.views:
+            if series not in self.series_set:
+                raise KeyError(series)
+            self.views[series] = ParamsView(self.params, series)
+
+        return self.views[series]
+
+    def __iter__(self):
+        return iter(self.series_list)
+
+    def __len__(self):
+        return len(self.series_list)
+
+
+def instantiate_params(params, series_list, lazy = False):
     ''' Creates parameter dictionaries for the different series.
 
     This function substitutes utils.Parameter objects with the value for each
@@ -46,28 +136,156 @@ def instantiate_params(params, series_list):
 
     @param params (dict): original parameters dictionary
     @param series_list (list): list of series' identifiers
+    @param lazy (bool): return read-only views that instantiate the
+           parameters on access instead of copies of the parameters' dictionary
 
     @return dict: a dictionary that contains the instantiation of the original
             parameters for each of the series.
     '''
+    if lazy:
+        return ParamsInstances(params, series_list)
+
     param_instances = {}
 
-    for series in series_list:
-        # Create an instance of the parameters' dictionary for each series
-        params_in  = copy.deepcopy(params)
-        params_out = copy.deepcopy(params)
-        instantiate_params_series(params_out, params_in, series)
-        param_instances[series] = params_out
+    with profile.phase('params'):
+        for series in series_list:
+            # Create an instance of the parameters' dictionary for each series
+            params_in  = copy.deepcopy(params)
+            params_out = copy.deepcopy(params)
+            instantiate_params_series(params_out, params_in, series)
+            param_instances[series] = params_out
 
     return param_instances
 
 
+def bars_patches(ax, x_values, y_values, y_offsets, bar_params):
+    ''' Plots an array of bars as Rectangle patches (using ax.bar)
+
+    @return handle: the BarContainer of the bars
+    '''
+    return ax.bar(x_values, y_values, bottom = y_offsets, **bar_params)
+
+
+# Parameters of ax.bar that are not supported by bars_collection
+BAR_ONLY_PARAMS = [ 'tick_label', 'xerr', 'yerr', 'ecolor', 'capsize', 'error_kw', 'log', 'orientation', 'bottom' ]
+
+
+def bars_collection(ax, x_values, y_values, y_offsets, bar_params):
+    ''' Plots an array of bars as a single PolyCollection
+
+    It supports the width, align, color, facecolor and fill parameters of
+    ax.bar (only the width can be given for each bar). Other parameters are
+    passed to PolyCollection. The parameters of ax.bar that have no
+    equivalent in a collection (BAR_ONLY_PARAMS) are not supported.
+
+    @return handle: the PolyCollection of the bars, which can be used in the
+            legend generation
+    '''
+    unsupported = [ key for key in BAR_ONLY_PARAMS if key in bar_params.keys() ]
+    assert len(unsupported) == 0, \
+           'Bar parameters {0} are not supported by the collection backend. Use backend = "patches"'.format(unsupported)
+
+    params = dict(bar_params)
+
+    x_values = np.asarray(x_values, dtype = float)
+    y_values = np.asarray(y_values, dtype = float)
+    if y_offsets is None:
+        y_offsets = np.zeros(len(y_values))
+    y_offsets = np.asarray(y_offsets, dtype = float)
+
+    widths = np.broadcast_to(np.asarray(params.pop('width', 0.8), dtype = float), x_values.shape)
+    if params.pop('align', 'center') == 'center':
+        left = x_values - widths / 2.0
+    else:
+        left = x_values
+    right  = left + widths
+    top    = y_offsets + y_values
+
+    verts = np.stack([ np.stack([ left,  y_offsets ], axis = -1),
+                       np.stack([ left,  top       ], axis = -1),
+                       np.stack([ right, top       ], axis = -1),
+                       np.stack([ right, y_offsets ], axis = -1) ], axis = 1)
+
+    axis_info = ax.figure.get_axis_info(ax) if hasattr(ax.figure, 'get_axis_info') else None
+
+    # As in ax.bar, color only sets the color of the faces
+    facecolor = params.pop('facecolor', params.pop('color', None))
+    if facecolor is None:
+        colors = matplotlib.rcParams['axes.prop_cycle'].by_key().get('color', [ 'C0' ])
+        facecolor = colors[0] if axis_info is None else axis_info.next_color(colors)
+    if not params.pop('fill', True):
+        facecolor = 'none'
+
+    h = PolyCollection(verts, facecolors = facecolor, **params)
+    if np.all(y_offsets == y_offsets[:1]) and len(y_offsets) > 0:
+        h.sticky_edges.y.append(y_offsets[0])
+
+    ax.add_collection(h, autolim = True)
+    # The view limits are updated once per plotter call (see
+    # AxisInfo.request_autoscale)
+    if axis_info is None:
+        ax.autoscale_view()
+    else:
+        axis_info.request_autoscale()
+
+    return h
+
+
+def version_tuple(version):
+    '''
+    @return tuple: (major, minor) of a version string (e.g. '3.10.0rc1')
+    '''
+    return tuple(int(''.join(c for c in v if c.isdigit()) or 0) for v in version.split('.')[:2])
+
+
+# matplotlib >= 3.10 supports hatch colors independent of the edge color
+HATCHCOLOR_API = version_tuple(matplotlib.__version__) >= (3, 10)
+
+
+def bars_hatchcolor_rc(bars, ax, x_values, y_values, y_offsets, bar_params, hatchcolor):
+    ''' Plots an array of bars with a hatch color in matplotlib < 3.10
+
+    These versions draw hatches with the rcParams['hatch.color'] in effect
+    when the artist is created, unless the artist has an edge color, which is
+    then also used for the hatches. Bars with a different edge color are
+    plotted with the hatch color as edge color, and outlined with their edge
+    color in a second pass.
+
+    @return handle: the handle of the hatched bars
+    '''
+    params    = dict(bar_params)
+    edgecolor = params.pop('edgecolor', None)
+
+    with matplotlib.rc_context({ 'hatch.color': hatchcolor }):
+        if edgecolor is None:
+            return bars(ax, x_values, y_values, y_offsets, params)
+
+        h = bars(ax, x_values, y_values, y_offsets, dict(params, edgecolor = hatchcolor))
+
+    if to_rgba(edgecolor) != to_rgba(hatchcolor):
+        params.update(edgecolor = edgecolor, fill = False, hatch = None)
+        bars(ax, x_values, y_values, y_offsets, params)
+
+    return h
+
+
+BAR_BACKENDS = {
+    'patches'   : bars_patches,
+    'collection': bars_collection,
+}
+
+
 def plot_bars(ax, x_values, y_values, y_offsets = None, bar_params = {}):
     ''' Plots an array of bars
 
     This function plots an array of bars using the given parameters. It
     supports the following non-standard parameters:
-        - hatchcolor
+        - hatchcolor: color of the hatches (edgecolor is used for the bar
+                      lines). Bars are plotted in a single pass with
+                      matplotlib >= 3.10 (see bars_hatchcolor_rc).
+        - backend: 'patches' (default) plots a Rectangle per bar (ax.bar),
+                   'collection' plots all the bars as a single PolyCollection,
+                   which is faster to draw for large numbers of bars
 
     @param ax (Axis): axis where to plot
     @param x_values (list): x values
@@ -81,49 +299,204 @@ def plot_bars(ax, x_values, y_values, y_offsets = None, bar_params = {}):
     if y_offsets is None:
         y_offsets = np.zeros(len(y_values))
 
-    if 'hatchcolor' in bar_params.keys():
-        b_params = bar_params.copy()
-        # If hatchcolor is defined, use edgecolor to define the color of
-        # the bar's line
-        hcolor = b_params['hatchcolor']
-        ecolor = b_params['edgecolor']
-        if hcolor != ecolor:
-            b_params['edgecolor'] = hcolor
+    b_params = bar_params.copy()
 
-        b_params.pop('hatchcolor', None)
+    backend = b_params.pop('backend', 'patches')
+    assert backend in BAR_BACKENDS.keys(), \
+           'Invalid bar backend "{0}". Valid values are: {1}'.format(backend, list(BAR_BACKENDS.keys()))
+    bars = BAR_BACKENDS[backend]
 
-        # Plot the bars
-        h = ax.bar(x_values, y_values, **b_params)
+    hatchcolor = b_params.pop('hatchcolor', None)
 
-        b_params['edgecolor'] = ecolor
-        b_params['fill']      = False
-        b_params['hatch']     = None
+    if hatchcolor is not None and not HATCHCOLOR_API:
+        return bars_hatchcolor_rc(bars, ax, x_values, y_values, y_offsets, b_params, hatchcolor)
 
-        # Plot empty bars to draw the colored bar lines
-        ax.bar(x_values, y_values, bottom = y_offsets, **b_params)
-    else:
-        h = ax.bar(x_values, y_values, bottom = y_offsets, **bar_params)
+    h = bars(ax, x_values, y_values, y_offsets, b_params)
+
+    if hatchcolor is not None:
+        # Hatches and bar lines use different colors in the same artist
+        if isinstance(h, BarContainer):
+            for patch in h.patches:
+                patch.set_hatchcolor(hatchcolor)
+        else:
+            h.set_hatchcolor(hatchcolor)
 
     return h
 
 
-def plot_overflow(ax, x, y, ylim, overflow_params):
+def cluster_values(series, clusters, key_order):
+    ''' Gathers the values of a hierarchy of clusters in an array
+
+    @param series (dict or ClusterData): hierarchy of clusters (see
+           utils.clusterize)
+    @param clusters (list): list of clusters for each level
+    @param key_order (list): series' identifiers
+
+    @return ndarray: array of shape (len(clusters[0]), ..., len(key_order))
+    '''
+    if isinstance(series, utils.ClusterData):
+        return series.values_for(clusters, key_order)
+
+    values = np.empty([ len(level) for level in clusters ] + [ len(key_order) ])
+
+    for index in itertools.product(*[ range(len(level)) for level in clusters ]):
+        d = series
+        for level, i in enumerate(index):
+            d = d[clusters[level][i]]
+
+        values[index] = [ d[key] for key in key_order ]
+
+    return values
+
+
+def cluster_input(series, clusters):
+    ''' Converts the input of the cluster plotters
+
+    @param series (dict, ClusterData or DataFrame): hierarchy of clusters. The
+           levels of the index of a DataFrame are the levels of clusters
+    @param clusters (list): list of clusters for each level. Defaults to the
+           clusters of a ClusterData or DataFrame
+
+    @return (dict or ClusterData, list): the series and the clusters
+    '''
+    if frames.is_dataframe(series):
+        series = frames.cluster_data_from_frame(series)
+
+    if clusters is None:
+        assert isinstance(series, utils.ClusterData), 'Clusters are required for dictionary hierarchies'
+        clusters = series.clusters
+
+    return series, clusters
+
+
+def cluster_key_order(series, levels):
+    ''' Default order of the series of a hierarchy of clusters
+
+    @param series (dict or ClusterData): hierarchy of clusters
+    @param levels (int): number of levels of clusters
+
+    @return list: series' identifiers in the order of the data, or sorted if
+            the leaves are not ordered dictionaries
+    '''
+    if isinstance(series, utils.ClusterData):
+        return list(series.keys)
+
+    series_dict = series
+    for _ in range(levels):
+        series_dict = series_dict[list(series_dict.keys())[0]]
+    key_order = series_dict.keys()
+    if not isinstance(series_dict, OrderedDict):
+        key_order = sorted(key_order)
+
+    return list(key_order)
+
+
+def group_params(params_list, exclude = ()):
+    ''' Groups the elements that use the same parameters
+
+    @param params_list (list): parameter dictionaries
+    @param exclude (list): parameters not taken into account
+
+    @return list: (params, indices) pairs, in order of first appearance
     '''
-    Plots labels with values greater than ylim
+    groups = OrderedDict()
+
+    for i, params in enumerate(params_list):
+        params = { k: v for k, v in params.items() if k not in exclude }
+        try:
+            key = style.freeze(params)
+        except TypeError:
+            # Parameters that cannot be compared are not grouped
+            key = (None, i)
+
+        if key not in groups.keys():
+            groups[key] = (params, [])
+        groups[key][1].append(i)
+
+    return list(groups.values())
 
-    This function plots labels with values greater than ylim.
+
+def plot_bars_grouped(ax, x_values, y_values, widths, params_list, y_offsets = None):
+    ''' Plots an array of bars that can use different parameters
+
+    Bars that share the same parameters (but the width) are plotted with a
+    single call to plot_bars.
 
     @param ax (Axis): axis where to plot
-    @param x (number): x value
-    @param y (number): y value
-    @param ylim (number): maximum y value in the figure
-    @param overflow_params (dict): dictionary of parameters to be used for the labels
+    @param x_values (ndarray): x values
+    @param y_values (ndarray): y values
+    @param widths (ndarray): width of each bar
+    @param params_list (list): parameters dictionary for each bar
+    @param y_offsets (ndarray): y offsets
+
+    @return handle: a handle to be used in the legend generation (the one of
+            the first bar)
     '''
-    if y >= ylim[1]:
-        ax.text(x,                        # x
-                ylim[1] + ylim[1] * 0.01, # y
-                '%.2f' % y,               # text
-                **overflow_params['label'])
+    handle = None
+
+    for params, indices in group_params(params_list, exclude = ('width',)):
+        params['width'] = widths[indices]
+        offsets = None
+        if y_offsets is not None:
+            offsets = y_offsets[indices]
+
+        h = plot_bars(ax, x_values[indices], y_values[indices], y_offsets = offsets, bar_params = params)
+        if handle is None:
+            handle = h
+
+    return handle
+
+
+def plot_cluster_bars(ax, cluster_layout, y_values, clusters_fqn, key_order,
+                      bar_params_series, overflow_params_series, series_names, **kwargs):
+    ''' Plots the bars of a hierarchy of clusters
+
+    The bars of each series are plotted for all the clusters at once (see
+    plot_bars_grouped).
+
+    @param ax (Axis): axis where to plot
+    @param cluster_layout (ClusterLayout): positions of the bars
+    @param y_values (ndarray): values with the same shape as the bar widths
+    @param clusters_fqn (list): identifiers of the innermost clusters
+    @param key_order (list): series' identifiers
+    @param bar_params_series (dict): bar parameters for each bar
+    @param overflow_params_series (dict): overflow parameters for each bar
+    @param series_names (dict): name of each series
+    '''
+    axis_info = ax.figure.get_axis_info(ax)
+
+    x_values = cluster_layout.bar_x.reshape((-1, len(key_order)))
+    widths   = cluster_layout.widths.reshape((-1, len(key_order)))
+    y_values = y_values.reshape((-1, len(key_order)))
+
+    for j, key in enumerate(key_order):
+        key_fqn = [ cluster_fqn + '::' + key for cluster_fqn in clusters_fqn ]
+
+        if 'ylim' in kwargs.keys():
+            for params, indices in group_params([ overflow_params_series[fqn] for fqn in key_fqn ]):
+                if params['enable']:
+                    overflow.plot_overflow(ax, x_values[indices, j], y_values[indices, j], kwargs['ylim'], params)
+
+        h = plot_bars_grouped(ax, x_values[:, j], y_values[:, j], widths[:, j],
+                              [ bar_params_series[fqn] for fqn in key_fqn ])
+
+        # Register information for the series
+        series_info = info.SeriesInfo(key)
+        series_info.set_legend_info(series_names[key], h)
+        series_info.set_points(x_values[:, j], y_values[:, j])
+        axis_info.add_series(key, series_info)
+
+
+def set_cluster_xlim(ax, cluster_layout):
+    '''
+    Sets the x limits of the axis to show all the clusters. If the clusters
+    have an offset, only the right limit is set.
+    '''
+    left, right = cluster_layout.xlim()
+    if cluster_layout.offset > 0:
+        ax.set_xlim(right = right)
+    else:
+        ax.set_xlim(left = left, right = right)
 
 
 def simple_series(ax, series,
@@ -136,7 +509,43 @@ def simple_series(ax, series,
                   offset      = 0,
                   style_series = {},
                   style_axis = {},
+                  decimate    = None,
+                  decimate_columns = None,
                   **kwargs):
+    '''
+    @param series (dict or DataFrame): values of each series. The columns of
+           a DataFrame are the series and its index is used as x values (as
+           ticklabels if it is not numeric). Values can also be np.memmap
+           arrays or paths to .npy files or .npz members ('file.npz::key'),
+           which are memory mapped and processed in chunks (see sources).
+           Bar plots still create one bar per value, so the x values and the
+           bars of memory-mapped bar series are loaded in memory: only the
+           stacking offsets and the overflow labels are computed in chunks
+    @param decimate (str): reduce each series to the horizontal resolution of
+           the axis before plotting it: 'minmax' keeps the minimum and maximum
+           of each pixel column, 'lttb' uses Largest-Triangle-Three-Buckets.
+           Only for line plots. SeriesInfo keeps the full-resolution values.
+           Memory-mapped line series use 'minmax' by default (False disables
+           it)
+    @param decimate_columns (int): horizontal resolution used for decimation.
+           Defaults to the width of the axis in pixels
+    '''
+    if frames.is_dataframe(series):
+        series, key_order, ticks, ticklabels = frames.series_from_frame(series, key_order, ticks, ticklabels)
+    else:
+        series, paths = sources.open_series(series)
+        for path in paths:
+            ax.figure.add_file(path)
+
+    if decimate is None and fun == 'plot':
+        if any(sources.is_chunked(v) for values in series.values()
+                                     for v in (values if isinstance(values, tuple) else (values, ))):
+            decimate = 'minmax'
+    elif decimate is False:
+        decimate = None
+
+    assert decimate is None or fun == 'plot', 'Decimation is only supported for line plots'
+
     len_series = -1
     for _, v in series.items():
         if len_series == -1:
@@ -157,11 +566,11 @@ def simple_series(ax, series,
     ticklabel_params = params_axis['ticklabel_params']
 
     # Instantiate params_series
-    barplot_params_series  = instantiate_params(barplot_params, key_order)
-    overflow_params_series = instantiate_params(overflow_params, key_order)
+    barplot_params_series  = instantiate_params(barplot_params, key_order, lazy = True)
+    overflow_params_series = instantiate_params(overflow_params, key_order, lazy = True)
 
-    tick_params_axis = instantiate_params(tick_params, ['x', 'y'])
-    ticklabel_params_axis = instantiate_params(ticklabel_params, ['x', 'y'])
+    tick_params_axis = instantiate_params(tick_params, ['x', 'y'], lazy = True)
+    ticklabel_params_axis = instantiate_params(ticklabel_params, ['x', 'y'], lazy = True)
 
     axis_info = ax.figure.get_axis_info(ax)
 
@@ -178,27 +587,42 @@ def simple_series(ax, series,
         else:
             y_values = series[key]
 
-            if ticks is None:
+            if ticks is None and sources.is_chunked(y_values):
+                start = offset
+                if fun == 'bar':
+                    start = start - barplot_params_series[key]['width'] / 2.0
+                x_values = sources.IndexRange(start, len(y_values))
+            elif ticks is None:
                 x_values = np.arange(len(y_values)) + offset
                 if fun == 'bar':
                     x_values = x_values - barplot_params_series[key]['width'] / 2.0
             else:
                 x_values = np.array(ticks) + offset
 
+        x_plot, y_plot = x_values, y_values
+        if decimate is not None:
+            x_plot, y_plot = decimation.decimate(ax, x_values, y_values, decimate,
+                                                 xlim = kwargs.get('xlim', None),
+                                                 columns = decimate_columns)
+        elif isinstance(x_values, sources.IndexRange):
+            x_plot = np.asarray(x_values)
+
         if fun == 'plot':
-            h, = ax.plot(x_values, y_values, **barplot_params_series[key])
+            h, = ax.plot(x_plot, y_plot, **barplot_params_series[key])
         elif fun == 'bar':
-            h = plot_bars(ax, x_values, y_values, y_offsets = offsets_bar, bar_params = barplot_params_series[key])
+            h = plot_bars(ax, x_plot, y_plot, y_offsets = offsets_bar, bar_params = barplot_params_series[key])
 
-            offsets_bar += y_values
-
-        if 'ylim' in kwargs.keys() and overflow_params_series[key]['enable']:
-            for x, y in zip(x_values, y_values):
-                plot_overflow(ax, x, y, kwargs['ylim'], overflow_params_series[key])
+            sources.accumulate(offsets_bar, y_values)
 
         series_info = info.SeriesInfo(key)
         series_info.set_legend_info(series_names[key], h)
         series_info.set_points(x_values, y_values)
+        if decimate is not None:
+            series_info.set_decimation(decimate, decimate_columns)
+
+        if 'ylim' in kwargs.keys() and overflow_params_series[key]['enable']:
+            labels = overflow.plot_overflow(ax, x_plot, y_plot, kwargs['ylim'], overflow_params_series[key])
+            series_info.set_overflow(overflow_params_series[key], kwargs['ylim'], labels)
 
         axis_info.add_series(key, series_info)
 
@@ -217,6 +641,10 @@ def simple_series(ax, series,
     ax.tick_params(axis='y', **tick_params_axis['y'])
 
     if zoom_params is not None:
+        # axes_grid1 is only needed for zoom insets
+        from mpl_toolkits.axes_grid1.inset_locator import mark_inset
+        from mpl_toolkits.axes_grid1.inset_locator import zoomed_inset_axes
+
         factor = zoom_params.get('factor', 3)
         bbox_to_anchor = zoom_params.get('bbox_to_anchor', (0, 0, 1, 1))
 
@@ -255,27 +683,55 @@ def bar_series(*args, **kwargs):
     return simple_series(*args, **kwargs)
 
 
-@plotter.plotter_func({'style_series' : ['bar', 'overflow'],
-                       'style_axis'   : ['tick', 'ticklabel'],
-                       'style_cluster': ['cluster']})
-def cluster_series(ax, series, clusters,
-                   series_names  = None,
-                   cluster_names = None,
-                   key_order     = None,
-                   offset        = 0,
-                   style_series  = {},
-                   style_axis    = {},
-                   style_cluster = {},
-                   **kwargs):
-    if key_order is None:
-        series_dict = series[list(series.keys())[0]]
-        key_order = series_dict.keys()
-        if not isinstance(series_dict, OrderedDict):
-            key_order = sorted(key_order)
+ClusterSetup = namedtuple('ClusterSetup', ['key_order', 'series_names', 'clusters_fqn', 'cluster_layout', 'params', 'ticks'])
+'''
+Styles, layout and ticks resolved by a cluster plotter. They only depend on
+the clusters, the series and the style arguments, so axes plotted with the
+same arguments can share them (see plotter.SharedSetups). params contains the
+instantiated parameters ('bar', 'overflow', 'tick', 'ticklabel', ...) and
+ticks the (locator, formatter, label params, minor) of the x axis.
+'''
 
-    assert len(clusters) == 1, 'This function only supports one-level clustering'
-    clusters = clusters[0]
+def tick_formatter(ticks, labels):
+    '''
+    @return Formatter: labels of fixed ticks, like the one created by
+            Axis.set_ticklabels, but it can be shared by several axes
+    '''
+    labels_dict = dict(zip(ticks, labels))
+    return FuncFormatter(lambda x, pos = None: labels_dict.get(x, ''))
+
+
+def set_shared_ticks(axis, locator, formatter, label_params, minor = False):
+    '''
+    Sets the ticks and tick labels of an axis, like Axis.set_ticks and
+    Axis.set_ticklabels, using a locator and a formatter that can be shared
+    by several axes
+    '''
+    if minor:
+        axis.set_minor_locator(locator)
+        axis.set_minor_formatter(formatter)
+        locs  = axis.get_minorticklocs()
+        ticks = axis.get_minor_ticks(len(locs))
+    else:
+        axis.set_major_locator(locator)
+        axis.set_major_formatter(formatter)
+        locs  = axis.get_majorticklocs()
+        ticks = axis.get_major_ticks(len(locs))
+
+    for pos, (loc, tick) in enumerate(zip(locs, ticks)):
+        tick.update_position(loc)
+        label = formatter(loc, pos)
+        for text in (tick.label1, tick.label2):
+            text.set_text(label)
+            text.update(label_params)
+
+
+def cluster_series_setup(clusters, key_order, offset, series_names, cluster_names,
+                         style_series, style_axis, style_cluster):
+    ''' Resolves the styles, the layout and the ticks of cluster_series
 
+    @return ClusterSetup: the setup
+    '''
     params_series  = style.generate_params(style_series, [ clusters, key_order ], 'style_series', 'cluster_series')
     params_axis    = style.generate_params(style_axis, [ ['x', 'y'] ], 'style_axis', 'cluster_series')
     params_cluster = style.generate_params(style_cluster, [ clusters ], 'style_cluster', 'cluster_series')
@@ -292,37 +748,23 @@ def cluster_series(ax, series, clusters,
     series_fqn = [ "::".join(e) for e in list(itertools.product(clusters, key_order)) ]
 
     # Instantiate params
-    bar_params_series      = instantiate_params(bar_params, series_fqn)
-    overflow_params_series = instantiate_params(overflow_params, series_fqn)
-
-    tick_params_axis      = instantiate_params(tick_params, ['x', 'y'])
-    ticklabel_params_axis = instantiate_params(ticklabel_params, ['x', 'y'])
+    bar_params_series      = instantiate_params(bar_params, series_fqn, lazy = True)
+    overflow_params_series = instantiate_params(overflow_params, series_fqn, lazy = True)
 
-    cluster_params_clusters = instantiate_params(cluster_params, clusters)
+    tick_params_axis      = instantiate_params(tick_params, ['x', 'y'], lazy = True)
+    ticklabel_params_axis = instantiate_params(ticklabel_params, ['x', 'y'], lazy = True)
 
-    cluster_widths = {}
-    for cluster in clusters:
-        cluster_width = 0.0
-        for key in key_order:
-            cluster_width += bar_params_series[cluster + "::" + key]['width']
+    cluster_params_clusters = instantiate_params(cluster_params, clusters, lazy = True)
 
-        cluster_widths[cluster] = cluster_width
+    # Bar widths for each cluster and series
+    widths = np.array([ bar_params_series[fqn]['width'] for fqn in series_fqn ],
+                      dtype = float).reshape((len(clusters), len(key_order)))
 
-    current = offset
-    ticks_list = [ ]
-    for i, cluster in enumerate(clusters):
-        if i == 0:
-            current += cluster_params_clusters[cluster]['outer']
-            current += cluster_widths[cluster] / 2.0
-        else:
-            current += cluster_widths[clusters[i-1]] / 2.0
-            current += cluster_params_clusters[clusters[i-1]]['separation']
-            current += cluster_params_clusters[cluster]['separation']
-            current += cluster_widths[cluster] / 2.0
+    outer      = np.array([ cluster_params_clusters[cluster]['outer'] for cluster in clusters ], dtype = float)
+    separation = np.array([ cluster_params_clusters[cluster]['separation'] for cluster in clusters ], dtype = float)
 
-        ticks_list.append(current)
-
-    ticks = np.array(ticks_list)
+    cluster_layout = layout.get_layout(widths, [ outer ], [ separation ], offset)
+    ticks = cluster_layout.ticks(0)
 
     if series_names is None:
         series_names = { v: v for v in key_order }
@@ -332,73 +774,68 @@ def cluster_series(ax, series, clusters,
     else:
         cluster_names = [ cluster_names[c] for c in clusters ]
 
-    axis_info = ax.figure.get_axis_info(ax)
-    axis_info.set_series_order(key_order)
+    params = { 'bar'      : bar_params_series,
+               'overflow' : overflow_params_series,
+               'tick'     : tick_params_axis,
+               'ticklabel': ticklabel_params_axis }
 
-    for i, cluster in enumerate(clusters):
-        off = 0.0
-        for key in key_order:
-            series_fqn = cluster + '::' + key
-            x_value = ticks[i] - cluster_widths[cluster] / 2.0 + off
-            y_value = series[cluster][key]
+    return ClusterSetup(key_order, series_names, clusters, cluster_layout, params,
+                        [ (FixedLocator(ticks), tick_formatter(ticks, cluster_names), ticklabel_params_axis['x'], False) ])
 
-            off += bar_params_series[series_fqn]['width']
 
-            if 'ylim' in kwargs.keys() and overflow_params_series[series_fqn]['enable']:
-                plot_overflow(ax, x_value, y_value, kwargs['ylim'], overflow_params_series[series_fqn])
+@plotter.plotter_func({'style_series' : ['bar', 'overflow'],
+                       'style_axis'   : ['tick', 'ticklabel'],
+                       'style_cluster': ['cluster']})
+def cluster_series(ax, series, clusters = None,
+                   series_names  = None,
+                   cluster_names = None,
+                   key_order     = None,
+                   offset        = 0,
+                   style_series  = {},
+                   style_axis    = {},
+                   style_cluster = {},
+                   **kwargs):
+    series, clusters = cluster_input(series, clusters)
 
-            h = plot_bars(ax, [x_value], [y_value], bar_params = bar_params_series[series_fqn])
+    if key_order is None:
+        key_order = cluster_key_order(series, 1)
+    key_order = list(key_order)
 
-            # Register information for the series
-            series_info = info.SeriesInfo(key)
-            series_info.set_legend_info(series_names[key], h)
-            series_info.set_points([x_value], [y_value])
-            axis_info.add_series(key, series_info)
+    assert len(clusters) == 1, 'This function only supports one-level clustering'
+    clusters = list(clusters[0])
+
+    setup = plotter.shared_setup(('cluster_series', tuple(clusters), tuple(key_order), offset),
+                         [ series_names, cluster_names, style_series, style_axis, style_cluster ],
+                         lambda: cluster_series_setup(clusters, key_order, offset, series_names, cluster_names,
+                                                      style_series, style_axis, style_cluster))
+
+    axis_info = ax.figure.get_axis_info(ax)
+    axis_info.set_series_order(key_order)
+
+    y_values = cluster_values(series, [ clusters ], key_order)
+
+    plot_cluster_bars(ax, setup.cluster_layout, y_values, setup.clusters_fqn, key_order,
+                      setup.params['bar'], setup.params['overflow'], setup.series_names, **kwargs)
 
     # TODO: Fix cluster info
     """cluster_info = info.ClusterInfo()
     cluster_info.set_clusters(clusters, [ t for t in ticks ])
     axis_info.set_clusters(cluster_info)"""
 
-    ax.set_xticks(ticks)
-    ax.set_xticklabels(cluster_names, **ticklabel_params_axis['x'])
-    ax.tick_params(axis='x', which='both', **tick_params_axis['x'])
-    ax.tick_params(axis='y', which='both', **tick_params_axis['y'])
-
-    first_cluster_width = cluster_widths[clusters[0]]
-    first_cluster_outer = cluster_params_clusters[clusters[0]]['outer']
-    last_cluster_width = cluster_widths[clusters[-1]]
-    last_cluster_outer = cluster_params_clusters[clusters[-1]]['outer']
-    if offset > 0:
-        ax.set_xlim(right = ticks[-1] + last_cluster_width/2.0 + last_cluster_outer)
-    else:
-        ax.set_xlim(left = ticks[0] - (first_cluster_width/2.0 + first_cluster_outer),
-                    right = ticks[-1] + last_cluster_width/2.0 + last_cluster_outer)
+    for locator, formatter, label_params, minor in setup.ticks:
+        set_shared_ticks(ax.xaxis, locator, formatter, label_params, minor)
+    ax.tick_params(axis='x', which='both', **setup.params['tick']['x'])
+    ax.tick_params(axis='y', which='both', **setup.params['tick']['y'])
 
+    set_cluster_xlim(ax, setup.cluster_layout)
 
-@plotter.plotter_func({'style_series'       : ['bar', 'overflow'],
-                       'style_axis'         : ['tick', 'ticklabel', 'major_tick', 'major_ticklabel'],
-                       'style_cluster'      : ['cluster'],
-                       'style_major_cluster': ['cluster']})
-def cluster_series_2(ax, series, clusters,
-                     series_names  = None,
-                     cluster_names = None,
-                     key_order     = None,
-                     offset        = 0,
-                     style_series  = {},
-                     style_axis    = {},
-                     style_cluster = {},
-                     style_major_cluster = {},
-                     **kwargs):
-    if key_order is None:
-        series_dict = series[list(series.keys())[0]]
-        series_dict = series_dict[list(series_dict.keys())[0]]
-        key_order = series_dict.keys()
-        if not isinstance(series_dict, OrderedDict):
-            key_order = sorted(key_order)
 
-    assert len(clusters) == 2, 'This function only supports two-level clustering'
+def cluster_series_2_setup(clusters, key_order, offset, series_names, cluster_names,
+                           style_series, style_axis, style_cluster, style_major_cluster):
+    ''' Resolves the styles, the layout and the ticks of cluster_series_2
 
+    @return ClusterSetup: the setup
+    '''
     params_series  = style.generate_params(style_series, clusters + [ key_order ], 'style_series', 'cluster_series_2')
     params_axis    = style.generate_params(style_axis, [ ['x', 'y'] ], 'style_axis', 'cluster_series_2')
     params_cluster = style.generate_params(style_cluster, clusters, 'style_cluster', 'cluster_series_2')
@@ -420,130 +857,96 @@ def cluster_series_2(ax, series, clusters,
     clusters_fqn = [ "::".join(e) for e in list(itertools.product(*clusters)) ]
 
     # Instantiate params
-    bar_params_series      = instantiate_params(bar_params, series_fqn)
-    overflow_params_series = instantiate_params(overflow_params, series_fqn)
+    bar_params_series      = instantiate_params(bar_params, series_fqn, lazy = True)
+    overflow_params_series = instantiate_params(overflow_params, series_fqn, lazy = True)
 
-    tick_params_axis      = instantiate_params(tick_params, ['x', 'y'])
-    ticklabel_params_axis = instantiate_params(ticklabel_params, ['x', 'y'])
-    major_tick_params_axis      = instantiate_params(major_tick_params, ['x', 'y'])
-    major_ticklabel_params_axis = instantiate_params(major_ticklabel_params, ['x', 'y'])
+    tick_params_axis      = instantiate_params(tick_params, ['x', 'y'], lazy = True)
+    ticklabel_params_axis = instantiate_params(ticklabel_params, ['x', 'y'], lazy = True)
+    major_tick_params_axis      = instantiate_params(major_tick_params, ['x', 'y'], lazy = True)
+    major_ticklabel_params_axis = instantiate_params(major_ticklabel_params, ['x', 'y'], lazy = True)
 
-    cluster_params_clusters = instantiate_params(cluster_params, clusters_fqn)
-    major_cluster_params_clusters = instantiate_params(major_cluster_params, clusters[0])
+    cluster_params_clusters = instantiate_params(cluster_params, clusters_fqn, lazy = True)
+    major_cluster_params_clusters = instantiate_params(major_cluster_params, clusters[0], lazy = True)
 
     major_clusters = clusters[0]
     minor_clusters = clusters[1]
 
-    major_cluster_widths = {}
-    cluster_widths = {}
-    for i, major_cluster in enumerate(major_clusters):
-        major_cluster_width = 0.0
-        for j, cluster in enumerate(minor_clusters):
-            prev_cluster_fqn = "::".join([major_cluster, minor_clusters[j-1]])
-            cluster_fqn      = "::".join([major_cluster, cluster])
-            cluster_width = 0.0
-            for key in key_order:
-                series_fqn      = "::".join([major_cluster, cluster, key])
-                cluster_width += bar_params_series[series_fqn]['width']
-
-            cluster_widths[cluster_fqn] = cluster_width
-
-            major_cluster_width += cluster_width
-            if j == 0 or j == len(minor_clusters) - 1:
-                major_cluster_width += cluster_params_clusters[cluster_fqn]['outer']
-            if j > 0:
-                major_cluster_width += cluster_params_clusters[prev_cluster_fqn]['separation']
-            if j < len(minor_clusters) - 1:
-                major_cluster_width += cluster_params_clusters[cluster_fqn]['separation']
-
-        major_cluster_widths[major_cluster] = major_cluster_width
-
-    current = offset
-    ticks_list = [ ]
-    for i, major_cluster in enumerate(major_clusters):
-        if i == 0:
-            current += major_cluster_params_clusters[major_cluster]['outer']
-        else:
-            current += major_cluster_params_clusters[major_clusters[i-1]]['separation']
-            current += major_cluster_params_clusters[major_cluster]['separation']
-
-        for j, cluster in enumerate(minor_clusters):
-            prev_cluster_fqn = "::".join([major_cluster, minor_clusters[j-1]])
-            cluster_fqn      = "::".join([major_cluster, cluster])
-            if j == 0:
-                current += cluster_params_clusters[cluster_fqn]['outer']
-                current += cluster_widths[cluster_fqn] / 2.0
-            else:
-                current += cluster_widths[prev_cluster_fqn] / 2.0
-                current += cluster_params_clusters[prev_cluster_fqn]['separation']
-                current += cluster_params_clusters[     cluster_fqn]['separation']
-                current += cluster_widths[cluster_fqn] / 2.0
-
-            ticks_list.append(current)
+    shape = (len(major_clusters), len(minor_clusters))
 
-            if j == len(minor_clusters) - 1:
-                current += cluster_widths[cluster_fqn] / 2.0
-                current += cluster_params_clusters[cluster_fqn]['outer']
+    # Bar widths for each major cluster, cluster and series
+    widths = np.array([ bar_params_series[fqn]['width'] for fqn in series_fqn ],
+                      dtype = float).reshape(shape + (len(key_order),))
 
-        if i == len(major_clusters) - 1:
-            current += major_cluster_params_clusters[major_cluster]['outer']
+    outer      = np.array([ cluster_params_clusters[fqn]['outer'] for fqn in clusters_fqn ], dtype = float).reshape(shape)
+    separation = np.array([ cluster_params_clusters[fqn]['separation'] for fqn in clusters_fqn ], dtype = float).reshape(shape)
 
-    ticks = np.array(ticks_list)
-
-    current = offset
-    major_ticks_list = [ ]
-    for i, major_cluster in enumerate(major_clusters):
-        if i == 0:
-            current += major_cluster_params_clusters[major_cluster]['outer']
-            current += major_cluster_widths[major_cluster] / 2.0
-        else:
-            current += major_cluster_widths[major_clusters[i-1]] / 2.0
-            current += major_cluster_params_clusters[major_clusters[i-1]]['separation']
-            current += major_cluster_params_clusters[major_cluster]['separation']
-            current += major_cluster_widths[major_cluster] / 2.0
+    major_outer      = np.array([ major_cluster_params_clusters[c]['outer'] for c in major_clusters ], dtype = float)
+    major_separation = np.array([ major_cluster_params_clusters[c]['separation'] for c in major_clusters ], dtype = float)
 
-        major_ticks_list.append(current)
+    cluster_layout = layout.get_layout(widths, [ major_outer, outer ], [ major_separation, separation ], offset)
 
-    major_ticks = np.array(major_ticks_list)
-
-    ax.set_xticks(ticks, minor = True)
-    ax.set_xticks(major_ticks, minor = False)
-
-    axis_info = ax.figure.get_axis_info(ax)
-    axis_info.set_series_order(key_order)
+    ticks       = cluster_layout.ticks(1)
+    major_ticks = cluster_layout.ticks(0)
 
     if series_names is None:
         series_names = { v: v for v in key_order }
 
     if cluster_names is None:
-        cluster_names = [ None, None ]
-        cluster_names[0] = clusters[0]
-        cluster_names[1] = clusters[1]
+        cluster_names = [ clusters[0], clusters[1] ]
     else:
-        cluster_names[0] = [ cluster_names[0][c] for c in clusters[0] ]
-        cluster_names[1] = [ cluster_names[1][c] for c in clusters[1] ]
+        cluster_names = [ [ cluster_names[0][c] for c in clusters[0] ],
+                          [ cluster_names[1][c] for c in clusters[1] ] ]
 
-    for i, major_cluster in enumerate(major_clusters):
-        for j, cluster in enumerate(minor_clusters):
-            cluster_fqn = '::'.join([major_cluster, cluster])
-            off = 0.0
-            for key in key_order:
-                series_fqn = '::'.join([major_cluster, cluster, key])
-                x_value = ticks[i * len(minor_clusters) + j] - cluster_widths[cluster_fqn] / 2.0 + off
-                y_value = series[major_cluster][cluster][key]
+    params = { 'bar'            : bar_params_series,
+               'overflow'       : overflow_params_series,
+               'tick'           : tick_params_axis,
+               'ticklabel'      : ticklabel_params_axis,
+               'major_tick'     : major_tick_params_axis,
+               'major_ticklabel': major_ticklabel_params_axis }
 
-                off += bar_params_series[series_fqn]['width']
+    tick_setup = [ (FixedLocator(major_ticks), tick_formatter(major_ticks, cluster_names[0]),
+                    major_ticklabel_params_axis['x'], False),
+                   (FixedLocator(ticks), tick_formatter(ticks, cluster_names[1] * len(major_clusters)),
+                    ticklabel_params_axis['x'], True) ]
 
-                if 'ylim' in kwargs.keys() and overflow_params_series[series_fqn]['enable']:
-                    plot_overflow(ax, x_value, y_value, kwargs['ylim'], overflow_params_series[series_fqn])
+    return ClusterSetup(key_order, series_names, clusters_fqn, cluster_layout, params, tick_setup)
 
-                h = plot_bars(ax, [x_value], [y_value], bar_params = bar_params_series[series_fqn])
 
-                # Register information for the series
-                series_info = info.SeriesInfo(key)
-                series_info.set_legend_info(series_names[key], h)
-                series_info.set_points([x_value], [y_value])
-                axis_info.add_series(key, series_info)
+@plotter.plotter_func({'style_series'       : ['bar', 'overflow'],
+                       'style_axis'         : ['tick', 'ticklabel', 'major_tick', 'major_ticklabel'],
+                       'style_cluster'      : ['cluster'],
+                       'style_major_cluster': ['cluster']})
+def cluster_series_2(ax, series, clusters = None,
+                     series_names  = None,
+                     cluster_names = None,
+                     key_order     = None,
+                     offset        = 0,
+                     style_series  = {},
+                     style_axis    = {},
+                     style_cluster = {},
+                     style_major_cluster = {},
+                     **kwargs):
+    series, clusters = cluster_input(series, clusters)
+
+    if key_order is None:
+        key_order = cluster_key_order(series, 2)
+    key_order = list(key_order)
+
+    assert len(clusters) == 2, 'This function only supports two-level clustering'
+    clusters = [ list(level) for level in clusters ]
+
+    setup = plotter.shared_setup(('cluster_series_2', tuple(clusters[0]), tuple(clusters[1]), tuple(key_order), offset),
+                         [ series_names, cluster_names, style_series, style_axis, style_cluster, style_major_cluster ],
+                         lambda: cluster_series_2_setup(clusters, key_order, offset, series_names, cluster_names,
+                                                        style_series, style_axis, style_cluster, style_major_cluster))
+
+    axis_info = ax.figure.get_axis_info(ax)
+    axis_info.set_series_order(key_order)
+
+    y_values = cluster_values(series, clusters, key_order)
+
+    plot_cluster_bars(ax, setup.cluster_layout, y_values, setup.clusters_fqn, key_order,
+                      setup.params['bar'], setup.params['overflow'], setup.series_names, **kwargs)
 
     """
     cluster_info = info.ClusterInfo()
@@ -555,25 +958,148 @@ def cluster_series_2(ax, series, clusters,
     axis_info.set_clusters(cluster_info, 1)
     """
 
-    ax.set_xticks(major_ticks, minor = False)
-    ax.set_xticklabels(cluster_names[0], minor = False,
-                       **major_ticklabel_params_axis['x'])
-
-    ax.set_xticks(ticks, minor = True)
-    ax.set_xticklabels(cluster_names[1] * len(major_clusters), minor = True,
-                       **ticklabel_params_axis['x'])
-
-    ax.tick_params(axis='x', which='minor', **tick_params_axis['x'])
-    ax.tick_params(axis='x', which='major', **major_tick_params_axis['x'])
-    ax.tick_params(axis='y', which='minor', **tick_params_axis['y'])
-    ax.tick_params(axis='y', which='major', **major_tick_params_axis['y'])
-
-    first_major_cluster_width = major_cluster_widths[major_clusters[0]]
-    first_major_cluster_outer = major_cluster_params_clusters[major_clusters[0]]['outer']
-    last_major_cluster_width = major_cluster_widths[major_clusters[-1]]
-    last_major_cluster_outer = major_cluster_params_clusters[major_clusters[-1]]['outer']
-    if offset > 0:
-        ax.set_xlim(right = major_ticks[-1] + last_major_cluster_width/2.0 + last_major_cluster_outer)
+    for locator, formatter, label_params, minor in setup.ticks:
+        set_shared_ticks(ax.xaxis, locator, formatter, label_params, minor)
+
+    ax.tick_params(axis='x', which='minor', **setup.params['tick']['x'])
+    ax.tick_params(axis='x', which='major', **setup.params['major_tick']['x'])
+    ax.tick_params(axis='y', which='minor', **setup.params['tick']['y'])
+    ax.tick_params(axis='y', which='major', **setup.params['major_tick']['y'])
+
+    set_cluster_xlim(ax, setup.cluster_layout)
+
+
+@plotter.plotter_func({'style_series' : ['bar', 'overflow'],
+                       'style_axis'   : ['tick', 'ticklabel', 'major_tick', 'major_ticklabel'],
+                       'style_cluster': ['cluster']})
+def cluster_series_n(ax, series, clusters = None,
+                     series_names   = None,
+                     cluster_names  = None,
+                     key_order      = None,
+                     offset         = 0,
+                     style_series   = {},
+                     style_axis     = {},
+                     style_clusters = None,
+                     cluster_layout = None,
+                     level_spacing  = 0.08,
+                     **kwargs):
+    ''' Plots series of bars grouped in any number of levels of clusters
+
+    The innermost level of clusters uses the minor ticks of the axis and the
+    outermost level uses the major ticks. Levels in between are labeled in
+    secondary x axes placed below the axis.
+
+    @param ax (Axis): axis where to plot
+    @param series (dict, ClusterData or DataFrame): hierarchy of clusters (see
+           utils.clusterize). The levels of the index of a DataFrame are the
+           levels of clusters
+    @param clusters (list): list of clusters for each level. Defaults to the
+           clusters of a ClusterData or DataFrame
+    @param cluster_names (list): dictionary with the name of each cluster, for
+           each level
+    @param style_clusters (list): style of the clusters of each level. Queries
+           of the style of level l select clusters with l + 1 fields
+    @param cluster_layout (ClusterLayout): layout computed by a previous call
+           with the same clusters and widths
+    @param level_spacing (number): distance between the labels of consecutive
+           levels, in axes coordinates
+    '''
+    series, clusters = cluster_input(series, clusters)
+    levels = len(clusters)
+
+    if key_order is None:
+        key_order = cluster_key_order(series, levels)
+    key_order = list(key_order)
+
+    if style_clusters is None:
+        style_clusters = [ {} ] * levels
+
+    assert levels > 0, 'At least one level of clusters is required'
+    assert len(style_clusters) == levels, 'A cluster style is required for each level'
+
+    params_series = style.generate_params(style_series, clusters + [ key_order ], 'style_series', 'cluster_series_n')
+    params_axis   = style.generate_params(style_axis, [ ['x', 'y'] ], 'style_axis', 'cluster_series_n')
+
+    series_fqn   = [ "::".join(e) for e in itertools.product(*(clusters + [key_order])) ]
+    clusters_fqn = [ "::".join(e) for e in itertools.product(*clusters) ]
+
+    # Instantiate params
+    bar_params_series      = instantiate_params(params_series['bar_params'], series_fqn, lazy = True)
+    overflow_params_series = instantiate_params(params_series['overflow_params'], series_fqn, lazy = True)
+
+    tick_params_axis            = instantiate_params(params_axis['tick_params'], ['x', 'y'], lazy = True)
+    ticklabel_params_axis       = instantiate_params(params_axis['ticklabel_params'], ['x', 'y'], lazy = True)
+    major_tick_params_axis      = instantiate_params(params_axis['major_tick_params'], ['x', 'y'], lazy = True)
+    major_ticklabel_params_axis = instantiate_params(params_axis['major_ticklabel_params'], ['x', 'y'], lazy = True)
+
+    shape = tuple(len(level) for level in clusters)
+
+    if cluster_layout is None:
+        # Bar widths for each cluster and series
+        widths = np.array([ bar_params_series[fqn]['width'] for fqn in series_fqn ],
+                          dtype = float).reshape(shape + (len(key_order),))
+
+        outer      = []
+        separation = []
+        for level in range(levels):
+            params_cluster = style.generate_params(style_clusters[level], clusters[:level + 1],
+                                                   'style_cluster', 'cluster_series_n')
+            level_fqn = [ "::".join(e) for e in itertools.product(*clusters[:level + 1]) ]
+            cluster_params_clusters = instantiate_params(params_cluster['cluster_params'], level_fqn, lazy = True)
+
+            outer.append(np.array([ cluster_params_clusters[fqn]['outer'] for fqn in level_fqn ],
+                                  dtype = float).reshape(shape[:level + 1]))
+            separation.append(np.array([ cluster_params_clusters[fqn]['separation'] for fqn in level_fqn ],
+                                       dtype = float).reshape(shape[:level + 1]))
+
+        cluster_layout = layout.get_layout(widths, outer, separation, offset)
+    else:
+        assert cluster_layout.shape == shape and cluster_layout.widths.shape[-1] == len(key_order), \
+               'Cluster layout does not match the clusters'
+
+    if series_names is None:
+        series_names = { v: v for v in key_order }
+
+    if cluster_names is None:
+        cluster_names = clusters
+    else:
+        cluster_names = [ [ names[c] for c in level ] for names, level in zip(cluster_names, clusters) ]
+
+    axis_info = ax.figure.get_axis_info(ax)
+    axis_info.set_series_order(key_order)
+
+    y_values = cluster_values(series, clusters, key_order)
+
+    plot_cluster_bars(ax, cluster_layout, y_values, clusters_fqn, key_order,
+                      bar_params_series, overflow_params_series, series_names, **kwargs)
+
+    def level_labels(level):
+        return list(cluster_names[level]) * int(np.prod(shape[:level]))
+
+    if levels == 1:
+        ax.set_xticks(cluster_layout.ticks(0))
+        ax.set_xticklabels(level_labels(0), **ticklabel_params_axis['x'])
+        ax.tick_params(axis='x', which='both', **tick_params_axis['x'])
+        ax.tick_params(axis='y', which='both', **tick_params_axis['y'])
     else:
-        ax.set_xlim(left = major_ticks[0] - (first_major_cluster_width/2.0 + first_major_cluster_outer),
-                    right = major_ticks[-1] + last_major_cluster_width/2.0 + last_major_cluster_outer)
+        ax.set_xticks(cluster_layout.ticks(0), minor = False)
+        ax.set_xticklabels(level_labels(0), minor = False,
+                           **major_ticklabel_params_axis['x'])
+
+        ax.set_xticks(cluster_layout.ticks(levels - 1), minor = True)
+        ax.set_xticklabels(level_labels(levels - 1), minor = True,
+                           **ticklabel_params_axis['x'])
+
+        ax.tick_params(axis='x', which='minor', **tick_params_axis['x'])
+        ax.tick_params(axis='x', which='major', **major_tick_params_axis['x'])
+        ax.tick_params(axis='y', which='minor', **tick_params_axis['y'])
+        ax.tick_params(axis='y', which='major', **major_tick_params_axis['y'])
+
+        for level in range(1, levels - 1):
+            ax_level = ax.secondary_xaxis(-level_spacing * (levels - 1 - level))
+            ax_level.spines['bottom'].set_visible(False)
+            ax_level.set_xticks(cluster_layout.ticks(level))
+            ax_level.set_xticklabels(level_labels(level), **major_ticklabel_params_axis['x'])
+            ax_level.tick_params(axis='x', **major_tick_params_axis['x'])
+
+    set_cluster_xlim(ax, cluster_layout)
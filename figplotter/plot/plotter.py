@@ -3,13 +3,111 @@ Created on Jan 19, 2015
 
 @author: Javier Cabezas <javier.cabezas@gmail.com>
 '''
+from .. import profile
 from . import defaults
 
 PLOTTER_FUNCS = {}
+PLOTTERS      = {}
+
+CLUSTER_PLOTTERS = [ 'cluster_series', 'cluster_series_2', 'cluster_series_n' ]
+
+AXES_PROPERTIES = [ 'ylabel', 'xlabel', 'yscale', 'xscale', 'ylim', 'xlim', 'ygrid', 'xgrid' ]
+
+
+def axes_properties(kwargs):
+    '''
+    @return dict: axes labels, scales, limits and grids given to a plotter
+            function. Labels and scales set to None are ignored.
+    '''
+    properties = {}
+    for key in AXES_PROPERTIES:
+        if key not in kwargs.keys():
+            continue
+        if kwargs[key] is None and key.endswith(('label', 'scale')):
+            continue
+        properties[key] = kwargs[key]
+
+    return properties
+
+
+def set_axes_properties(ax, kwargs):
+    '''
+    Sets the axes labels, scales, limits and grids given to a plotter function
+    '''
+    if kwargs.get('ylabel', None) is not None:
+        ax.set_ylabel(kwargs['ylabel'])
+    if kwargs.get('xlabel', None) is not None:
+        ax.set_xlabel(kwargs['xlabel'])
+    if kwargs.get('yscale', None) is not None:
+        ax.set_yscale(kwargs['yscale'])
+    if kwargs.get('xscale', None) is not None:
+        ax.set_xscale(kwargs['xscale'])
+
+    if 'ylim' in kwargs.keys():
+        ax.set_ylim(kwargs['ylim'])
+    if 'xlim' in kwargs.keys():
+        ax.set_xlim(kwargs['xlim'])
+
+    if 'ygrid' in kwargs.keys():
+        ax.yaxis.grid(kwargs['ygrid'])
+    if 'xgrid' in kwargs.keys():
+        ax.xaxis.grid(kwargs['xgrid'])
+
+
+SHARED_SETUPS = None
+
+
+class SharedSetups(object):
+    '''
+    Context in which the cluster plotters share the setups they resolve:
+    calls with the same clusters, series and style objects reuse the setup of
+    the first call instead of resolving the styles and the layout again (see
+    info.Figure.facet)
+    '''
+
+    def __enter__(self):
+        global SHARED_SETUPS
+        self.previous = SHARED_SETUPS
+        SHARED_SETUPS = {}
+        return self
+
+    def __exit__(self, *args):
+        global SHARED_SETUPS
+        SHARED_SETUPS = self.previous
+        return False
+
+
+def shared_setup(key, objects, build):
+    '''
+    @param key (tuple): hashable arguments of the setup
+    @param objects (list): other arguments, compared by identity
+    @param build (function): builds the setup
+
+    @return: the setup shared in the current SharedSetups context, or a new
+            one
+    '''
+    if SHARED_SETUPS is None:
+        return build()
+
+    try:
+        key = key + tuple(id(obj) for obj in objects)
+        hash(key)
+    except TypeError:
+        return build()
+
+    if key not in SHARED_SETUPS:
+        # The objects are kept so that their identifiers are not reused
+        SHARED_SETUPS[key] = (build(), objects)
+
+    return SHARED_SETUPS[key][0]
+
 
 '''
 Decorator for plotting functions. It handles the legend, and axes labels, scales and limits
 If no figure exists yet the function creates it, otherwise plots on top of the given one
+The legend and the axes properties are deferred until the figure is drawn or
+saved (see info.Figure.flush), so that plotting several series on an axis
+only builds its legend once
 '''
 def plotter_func(plot_styles):
     def plotter_decorator(func):
@@ -20,34 +118,27 @@ def plotter_func(plot_styles):
         def inner(ax, *args, **kwargs):
             fig = ax.figure
 
-            func(ax, *args, **kwargs)
-
-            if kwargs.get('ylabel', None) is not None:
-                ax.set_ylabel(kwargs['ylabel'])
-            if kwargs.get('xlabel', None) is not None:
-                ax.set_xlabel(kwargs['xlabel'])
-            if kwargs.get('yscale', None) is not None:
-                ax.set_yscale(kwargs['yscale'])
-            if kwargs.get('xscale', None) is not None:
-                ax.set_xscale(kwargs['xscale'])
-
-            if 'ylim' in kwargs.keys():
-                ax.set_ylim(kwargs['ylim'])
-            if 'xlim' in kwargs.keys():
-                ax.set_xlim(kwargs['xlim'])
-
-            if 'ygrid' in kwargs.keys():
-                ax.yaxis.grid(kwargs['ygrid'])
-            if 'xgrid' in kwargs.keys():
-                ax.xaxis.grid(kwargs['xgrid'])
-
-            if kwargs.get('legend', True):
-                legend_params = kwargs.get('legend_params', defaults.legend_params)
+            with profile.function(func.__name__, getattr(fig, 'name', None)):
                 axis_info = fig.get_axis_info(ax)
-                axis_info.legend(**legend_params)
+                # Plotter functions may set the limits of the axis, so the
+                # properties given to previous calls are applied first
+                axis_info.flush_properties()
+
+                func(ax, *args, **kwargs)
+                axis_info.autoscale()
+
+                axis_info.defer_properties(axes_properties(kwargs))
+                if kwargs.get('legend', True):
+                    axis_info.defer_legend(kwargs.get('legend_params', defaults.legend_params))
+
+            if hasattr(fig, 'add_call'):
+                fig.add_call(ax, func.__name__, args, kwargs)
 
             return ax
 
+        inner.plotter_name = func.__name__
+        PLOTTERS[func.__name__] = inner
+
         return inner
 
     return plotter_decorator
@@ -0,0 +1,257 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import hashlib
+import os
+import shutil
+
+from collections import namedtuple
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+import numpy as np
+
+from .. import utils
+from . import defaults
+from . import frames
+from . import layout
+
+
+class Uncacheable(TypeError):
+    '''
+    Raised when a value cannot be digested (e.g. functions or arbitrary
+    objects), so the figure that uses it cannot be cached
+    '''
+    pass
+
+
+def update_digest(h, obj):
+    '''
+    Feeds a deterministic representation of obj to the hash object h. Type
+    names are included so that e.g. 1, 1.0 and '1' produce different digests.
+
+    @raise Uncacheable: if obj contains values that cannot be digested
+    '''
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        h.update('{0}:{1!r};'.format(type(obj).__name__, obj).encode('utf-8'))
+    elif isinstance(obj, np.ndarray):
+        h.update('ndarray:{0}:{1};'.format(obj.dtype.str, obj.shape).encode('utf-8'))
+        if obj.dtype == object:
+            for v in obj.ravel():
+                update_digest(h, v)
+        else:
+            # The buffer is hashed in place (memory-mapped arrays are not
+            # loaded in memory)
+            h.update(np.ascontiguousarray(obj).reshape(-1).view(np.uint8))
+    elif isinstance(obj, np.generic):
+        update_digest(h, obj.item())
+    elif isinstance(obj, Mapping):
+        h.update('dict:{0};'.format(len(obj)).encode('utf-8'))
+        for k, v in obj.items():
+            update_digest(h, k)
+            update_digest(h, v)
+    elif isinstance(obj, (list, tuple)):
+        h.update('{0}:{1};'.format(type(obj).__name__, len(obj)).encode('utf-8'))
+        for v in obj:
+            update_digest(h, v)
+    elif isinstance(obj, (set, frozenset)):
+        h.update('set:{0};'.format(len(obj)).encode('utf-8'))
+        for d in sorted(digest(v) for v in obj):
+            h.update(d.encode('utf-8'))
+    elif isinstance(obj, utils.Parameter):
+        h.update(b'Parameter;')
+        update_digest(h, obj.values)
+    elif isinstance(obj, utils.ClusterData):
+        h.update(b'ClusterData;')
+        update_digest(h, (obj.values, obj.clusters, obj.keys))
+    elif isinstance(obj, layout.ClusterLayout):
+        h.update(b'ClusterLayout;')
+        update_digest(h, obj.key())
+    elif frames.is_dataframe(obj):
+        h.update(b'DataFrame;')
+        update_digest(h, frames.frame_digest_values(obj))
+    else:
+        raise Uncacheable('Cannot digest value of type {0}'.format(type(obj).__name__))
+
+
+def digest(*objs):
+    '''
+    @return str: hex digest of the given values (see update_digest)
+    '''
+    h = hashlib.sha256()
+    for obj in objs:
+        update_digest(h, obj)
+
+    return h.hexdigest()
+
+
+DEFAULTS_DIGEST = (None, None)
+
+
+def defaults_digest():
+    '''
+    @return str: digest of the default style parameters and the parameters
+            registered for each plotter function
+    '''
+    global DEFAULTS_DIGEST
+    version, value = DEFAULTS_DIGEST
+    if version != defaults.FUNCTION_DEFAULTS_VERSION:
+        value = digest(defaults.DEFAULTS, defaults.FUNCTION_DEFAULT_LAYERS, defaults.legend_params)
+        DEFAULTS_DIGEST = (defaults.FUNCTION_DEFAULTS_VERSION, value)
+
+    return value
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'bypasses', 'evictions', 'files', 'size', 'max_size'])
+
+TMP_SUFFIX = '.tmp'
+
+
+class RenderCache(object):
+    '''
+    On-disk cache of rendered figures. Each artifact is stored in a file named
+    after its key, and the least recently used files are evicted when the
+    size of the directory exceeds max_size bytes.
+    '''
+
+    def __init__(self, directory, max_size = 1 << 30):
+        self.directory = directory
+        self.max_size  = max_size
+
+        self.hits      = 0
+        self.misses    = 0
+        self.bypasses  = 0
+        self.evictions = 0
+
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+
+    def path(self, key, ext):
+        return os.path.join(self.directory, key + ext)
+
+    def get(self, key, ext, dest):
+        '''
+        Copies the artifact with the given key to dest
+
+        @return bool: True if the artifact was in the cache
+        '''
+        path = self.path(key, ext)
+        try:
+            shutil.copyfile(path, dest)
+            # The modification time is used to evict the least recently used
+            # artifacts
+            os.utime(path, None)
+        except (IOError, OSError):
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        return True
+
+    def put(self, key, ext, src):
+        '''
+        Stores a copy of the file src as the artifact with the given key. The
+        copy is atomic, so concurrent processes can share the cache.
+        '''
+        path = self.path(key, ext)
+        tmp  = '{0}.{1}{2}'.format(path, os.getpid(), TMP_SUFFIX)
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, path)
+
+        self.evict()
+
+    def bypass(self):
+        self.bypasses += 1
+
+    def entries(self):
+        '''
+        @return list: (mtime, size, path) of the artifacts in the cache
+        '''
+        ret = []
+        for name in os.listdir(self.directory):
+            if name.endswith(TMP_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            ret.append((st.st_mtime, st.st_size, path))
+
+        return ret
+
+    def evict(self):
+        entries = sorted(self.entries())
+        size = sum(e[1] for e in entries)
+        for _, file_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= file_size
+            self.evictions += 1
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        self.hits = self.misses = self.bypasses = self.evictions = 0
+
+    def info(self):
+        entries = self.entries()
+        return CacheInfo(self.hits, self.misses, self.bypasses, self.evictions,
+                         len(entries), sum(e[1] for e in entries), self.max_size)
+
+
+CACHE = None
+
+
+def enable(directory, max_size = 1 << 30):
+    '''
+    Enables the render cache for the figures created afterwards
+
+    @param directory (str): directory where the artifacts are stored
+    @param max_size (int): maximum size of the cache in bytes
+    '''
+    global CACHE
+    CACHE = RenderCache(directory, max_size)
+
+    return CACHE
+
+
+def disable():
+    global CACHE
+    CACHE = None
+
+
+def get_cache():
+    '''
+    @return RenderCache: the enabled render cache, or None
+    '''
+    return CACHE
+
+
+def cache_info():
+    assert CACHE is not None, 'Render cache is not enabled'
+    return CACHE.info()
+
+
+# The cache can be enabled for a whole run with FIGPLOTTER_RENDER_CACHE
+if os.environ.get('FIGPLOTTER_RENDER_CACHE', None):
+    enable(os.environ['FIGPLOTTER_RENDER_CACHE'],
+           int(os.environ.get('FIGPLOTTER_RENDER_CACHE_SIZE', 1 << 30)))
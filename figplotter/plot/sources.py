@@ -0,0 +1,207 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import os
+import struct
+import zipfile
+
+from collections import OrderedDict
+
+import numpy as np
+
+'''
+Out-of-core data sources for simple_series. Series can be given as paths to
+.npy files or to members of .npz files ('traces.npz::key'), which are memory
+mapped, or as np.memmap objects. These series are processed in chunks of
+CHUNK_SIZE elements, so the memory used does not depend on their size.
+'''
+CHUNK_SIZE = 1 << 22
+
+SEPARATOR = '::'
+
+
+class IndexRange(object):
+    '''
+    Lazy x values start, start + 1, ..., start + size - 1 of a series without
+    x values. Contiguous slices are also lazy; other indices return arrays.
+    '''
+    __slots__ = ('start', 'size')
+
+    dtype = np.dtype(float)
+
+    def __init__(self, start, size):
+        self.start = float(start)
+        self.size  = int(size)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            r = range(self.size)[key]
+            if r.step == 1:
+                return IndexRange(self.start + r.start, len(r))
+            return np.arange(r.start, r.stop, r.step, dtype = float) + self.start
+        elif isinstance(key, (int, np.integer)):
+            return self.start + range(self.size)[key]
+
+        key = np.asarray(key)
+        assert np.all((key >= -self.size) & (key < self.size)), 'Index out of range'
+        return np.where(key < 0, key + self.size, key).astype(float) + self.start
+
+    def __array__(self, dtype = None, copy = None):
+        values = np.arange(self.size, dtype = float) + self.start
+        return values if dtype is None else values.astype(dtype)
+
+    def searchsorted(self, value, side = 'left', sorter = None):
+        pos = value - self.start
+        if side == 'left':
+            pos = np.ceil(pos)
+        else:
+            pos = np.floor(pos) + 1
+
+        return int(min(max(pos, 0), self.size))
+
+    def __repr__(self):
+        return 'IndexRange(start = {0}, size = {1})'.format(self.start, self.size)
+
+
+def is_chunked(values):
+    '''
+    @return bool: True if the values are processed in chunks
+    '''
+    return isinstance(values, (np.memmap, IndexRange))
+
+
+def chunks(n, chunk_size = None):
+    '''
+    @return generator: (start, stop) of the chunks of n elements
+    '''
+    if chunk_size is None:
+        chunk_size = CHUNK_SIZE
+
+    for start in range(0, n, chunk_size):
+        yield start, min(start + chunk_size, n)
+
+
+def npz_member(path, key):
+    '''
+    Maps a member of a .npz file. Compressed members cannot be mapped and are
+    loaded in memory.
+
+    @return ndarray: the values of the member
+    '''
+    name = key if key.endswith('.npy') else key + '.npy'
+    with zipfile.ZipFile(path) as zf:
+        try:
+            info = zf.getinfo(name)
+        except KeyError:
+            raise KeyError('"{0}" does not contain "{1}"'.format(path, key))
+
+    if info.compress_type == zipfile.ZIP_STORED:
+        with open(path, 'rb') as f:
+            # Skip the local file header of the member
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+
+        if not dtype.hasobject:
+            return np.memmap(path, dtype = dtype, mode = 'r', offset = offset, shape = shape,
+                             order = 'F' if fortran else 'C')
+
+    with np.load(path) as f:
+        return f[key]
+
+
+def open_source(source):
+    '''
+    @param source (str): path of a .npy file, or path of a .npz file and the
+           name of a member ('traces.npz::key')
+
+    @return ndarray: memory-mapped values
+    '''
+    path, _, key = source.partition(SEPARATOR)
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.npy':
+        assert key == '', 'Member names are only supported in .npz files'
+        return np.load(path, mmap_mode = 'r')
+    elif ext == '.npz':
+        assert key != '', 'A member name is required for .npz files ("{0}::key")'.format(path)
+        return npz_member(path, key)
+
+    raise ValueError('Unsupported data source "{0}". Valid sources are .npy and .npz files'.format(source))
+
+
+def open_series(series):
+    '''
+    Opens the data sources of the series given as paths (also in (y, x)
+    tuples)
+
+    @return (dict, list): the series and the paths of the opened files
+    '''
+    paths = []
+
+    def open_value(value):
+        if isinstance(value, str):
+            paths.append(value.partition(SEPARATOR)[0])
+            return open_source(value)
+        return value
+
+    ret = OrderedDict()
+    for key, values in series.items():
+        if isinstance(values, tuple):
+            ret[key] = tuple(open_value(v) for v in values)
+        else:
+            ret[key] = open_value(values)
+
+    if len(paths) == 0:
+        return series, paths
+
+    return ret, paths
+
+
+def is_sorted(values, chunk_size = None):
+    if isinstance(values, IndexRange):
+        return True
+
+    for start, stop in chunks(len(values), chunk_size):
+        # Chunks overlap in one element to compare consecutive chunks
+        chunk = np.asarray(values[max(start - 1, 0):stop])
+        if not np.all(chunk[1:] >= chunk[:-1]):
+            return False
+
+    return True
+
+
+def accumulate(out, values, chunk_size = None):
+    '''
+    Adds values to out (e.g. the offsets of stacked bars) chunk by chunk
+    '''
+    for start, stop in chunks(len(values), chunk_size):
+        out[start:stop] += np.asarray(values[start:stop])
+
+    return out
+
+
+def flatnonzero(values, predicate, chunk_size = None):
+    '''
+    @return ndarray: positions of the values for which predicate (evaluated
+            on chunks of values) is True
+    '''
+    positions = [ np.flatnonzero(predicate(np.asarray(values[start:stop]))) + start
+                  for start, stop in chunks(len(values), chunk_size) ]
+    if len(positions) == 0:
+        return np.empty(0, dtype = np.intp)
+
+    return np.concatenate(positions)
@@ -4,8 +4,16 @@ Created on Jan 19, 2015
 @author: Javier Cabezas <javier.cabezas@gmail.com>
 '''
 
+import collections as C
 import copy
+import itertools
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from .. import profile
 from .. import utils
 from . import defaults
 
@@ -99,41 +107,315 @@ def sort_queries(style, levels):
     return sorted_queries
 
 
-def generate_params(style, selectors, style_name = None, fun_name = None):
-    lengths = [len(query.split('::')) for query in style.keys()]
-    levels = 0
-    if len(lengths) > 0:
-        levels = max(lengths)
-        # Expand queries that do not specify all the fields 
+def normalize_query(query, levels):
+    '''
+    Expands a query that does not specify all the fields by prepending
+    wildcards (e.g. 'Read' is equivalent to '*::*::Read' in a 3-level style)
+
+    @param query (str): query
+    @param levels (int): number of fields of the style
+
+    @return list: the fields of the normalized query
+    '''
+    fields = query.split('::')
+    assert len(fields) <= levels, \
+           'Query "{}" has more fields than selectors ({})'.format(query, levels)
+
+    return ['*'] * (levels - len(fields)) + fields
+
+
+def compile_params(value):
+    '''
+    Splits the parameter names of a query once, so they can be applied to many
+    series without parsing them again
+
+    @param value (dict): parameters of a query
+
+    @return list: (path, value) pairs, where path is the tuple of names
+    '''
+    params = []
+    for k, v in value.items():
+        names = tuple(k.split('::'))
+        if len(names) > 3:
+            # TODO: fix this
+            raise Exception('Query depth greater than 3 is not supported')
+
+        params.append((names, v))
+
+    return params
+
+
+class StyleSheet(object):
+    '''
+    Compiled representation of a style
+
+    Queries are indexed once in a trie over the "::" levels. Each query is
+    ranked by its specificity (queries with wildcards in the outer levels are
+    applied first), so the parameters of a series can be resolved on demand by
+    following the exact and the wildcard branches of the trie, without
+    expanding the queries to all the combinations of selectors.
+    '''
+
+    def __init__(self, style, levels, base = None):
+        '''
+        @param style (dict): style dictionary ({ query: { param: value } })
+        @param levels (int): number of fields of the series identifiers
+        @param base (list): (query, value) pairs applied before the style
+                            (e.g. function defaults)
+        '''
+        self.levels = levels
+        self.root   = {}
+
+        normalized = C.OrderedDict()
         for query, value in style.items():
-            query_length = len(query.split('::'))
-            if query_length < levels:
-                del style[query]
-                query = '::'.join(['*'] * (levels - query_length)) + '::' + query
-                style[query] = value
+            query = '::'.join(normalize_query(query, levels))
+            if query not in normalized.keys():
+                normalized[query] = {}
+            normalized[query].update(value)
+
+        queries = []
+        if base is not None:
+            queries += [ (query, value) for query, value in base ]
+        queries += sort_queries(normalized, levels)
+
+        self.queries = []
+        for rank, (query, value) in enumerate(queries):
+            fields = normalize_query(query, levels)
+            self.queries.append(fields)
+
+            node = self.root
+            for term in fields:
+                node = node.setdefault(term, {})
+            node.setdefault(None, []).append((rank, compile_params(value)))
+
+    def check(self, selectors):
+        '''
+        Checks that the terms used in the queries are valid selectors
+
+        @param selectors (list): valid terms for each level
+        '''
+        for fields in self.queries:
+            for term, selectors_level in zip(fields, selectors):
+                assert term == '*' or term in selectors_level, \
+                       'Term "{}" used in query "{}" not valid. Valid terms are "{}"'.format(term, '::'.join(fields), selectors_level)
+
+    def matches(self, fqn):
+        '''
+        @param fqn (str or tuple): series identifier
+
+        @return list: compiled parameters of the queries that match the series,
+                      in the order they must be applied
+        '''
+        if isinstance(fqn, str):
+            fqn = fqn.split('::')
+
+        assert len(fqn) == self.levels, 'Wrong series identifier "{}"'.format(fqn)
+
+        nodes = [ self.root ]
+        for term in fqn:
+            nodes_level = []
+            for node in nodes:
+                if term in node:
+                    nodes_level.append(node[term])
+                if term != '*' and '*' in node:
+                    nodes_level.append(node['*'])
+            nodes = nodes_level
+
+        entries = []
+        for node in nodes:
+            entries += node.get(None, [])
+
+        return [ params for _, params in sorted(entries, key = lambda e: e[0]) ]
+
+    def resolve(self, fqn):
+        '''
+        @param fqn (str or tuple): series identifier
+
+        @return dict: parameters of the series ({ param: value })
+        '''
+        ret = C.OrderedDict()
+        for params in self.matches(fqn):
+            for names, v in params:
+                ret['::'.join(names)] = v
+
+        return ret
+
+    def generate_params(self, selectors):
+        '''
+        Builds the parameter dictionaries for all the combinations of selectors
+
+        @param selectors (list): valid terms for each level
+
+        @return dict: parameter hierarchy whose leaves are utils.Parameter
+                      objects with the value of each series
+        '''
+        ret = {}
+
+        for combination in itertools.product(*selectors):
+            fqn = '::'.join(combination)
+            for params in self.matches(combination):
+                for names, v in params:
+                    d = ret
+                    # First name selects the parameter group
+                    key = names[0] + '_params'
+                    for name in names[1:]:
+                        d = d.setdefault(key, {})
+                        key = name
+
+                    if not isinstance(d.get(key, None), utils.Parameter):
+                        d[key] = utils.Parameter({})
+
+                    d[key].values[fqn] = v
+
+        return ret
+
+
+def freeze(obj):
+    '''
+    Builds a hashable representation of a (possibly nested) style or list of
+    selectors. Insertion order is kept, since it breaks ties between queries
+    with the same specificity.
+
+    @raise TypeError: if obj contains unhashable values
+    '''
+    if isinstance(obj, Mapping):
+        return (dict, tuple((k, freeze(v)) for k, v in obj.items()))
+    elif isinstance(obj, (set, frozenset)):
+        return (frozenset, frozenset(freeze(v) for v in obj))
+    elif isinstance(obj, str):
+        return obj
+    elif hasattr(obj, '__iter__') and not hasattr(obj, 'shape'):
+        return (tuple, tuple(freeze(v) for v in obj))
+
+    hash(obj)
+    return obj
+
+
+IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), tuple, frozenset)
+
+
+def copy_params(params):
+    '''
+    Copies a parameter hierarchy. Only dictionaries, utils.Parameter objects
+    and mutable leaves are copied.
+    '''
+    if isinstance(params, utils.Parameter):
+        ret = copy.copy(params)
+        ret.values = copy_params(params.values)
+        return ret
+    elif isinstance(params, Mapping):
+        return { k: copy_params(v) for k, v in params.items() }
+    elif isinstance(params, IMMUTABLE_TYPES):
+        return params
+    else:
+        return copy.deepcopy(params)
 
 
-    assert levels == 0 or levels == len(selectors), \
-           'Selectors do not match queries depth "{} vs {}"'.format(levels, len(selectors))
+CacheInfo = C.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
 
-    sorted_queries = sort_queries(style, levels)
 
-    # Expand queries
-    query_list = []
-    for query, val in sorted_queries:
-        expanded = expand_query(query, val, levels, selectors)
+class ParamsCache(object):
+    '''
+    Bounded LRU cache for the parameters generated from a style. Entries are
+    keyed by the frozen style, the selectors and the function/style names.
+    Callers always get a copy of the cached parameters.
+    '''
 
-        query_list += expanded
+    def __init__(self, maxsize = 128):
+        self.maxsize = maxsize
+        self.entries = C.OrderedDict()
+        self.hits    = 0
+        self.misses  = 0
 
-    ret = {}
-    if fun_name is not None:
-        default_queries = defaults.get_function_defaults(fun_name, selectors, style_name)
-        for query in default_queries:
-            series_params = build_dict(query)
-            utils.update(ret, series_params)
+    def get(self, key):
+        if key is None or key not in self.entries:
+            self.misses += 1
+            return None
 
-    for query in query_list:
-        series_params = build_dict(query)
-        utils.update(ret, series_params)
+        self.hits += 1
+        params = self.entries.pop(key)
+        self.entries[key] = params
 
-    return ret
+        return copy_params(params)
+
+    def put(self, key, params):
+        if key is None or self.maxsize <= 0:
+            return
+
+        self.entries[key] = params
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last = False)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self.entries) > max(maxsize, 0):
+            self.entries.popitem(last = False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits   = 0
+        self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+
+CACHE = ParamsCache()
+
+
+def cache_info():
+    '''
+    @return CacheInfo: hits, misses, maximum and current size of the cache of
+            generate_params
+    '''
+    return CACHE.info()
+
+
+def cache_clear():
+    '''
+    Empties the cache of generate_params. It must be called if the default
+    values in defaults.DEFAULTS are modified.
+    '''
+    CACHE.clear()
+
+
+def set_cache_size(maxsize):
+    '''
+    Sets the maximum number of entries of the cache of generate_params. A size
+    of 0 disables the cache.
+    '''
+    CACHE.resize(maxsize)
+
+
+def generate_params(style, selectors, style_name = None, fun_name = None):
+    with profile.phase('style'):
+        try:
+            key = (style_name, fun_name, defaults.FUNCTION_DEFAULTS_VERSION,
+                   freeze(style), freeze(selectors))
+        except TypeError:
+            # Styles with unhashable values are not cached
+            key = None
+
+        params = CACHE.get(key)
+        if params is not None:
+            return params
+
+        lengths = [len(query.split('::')) for query in style.keys()]
+        levels = 0
+        if len(lengths) > 0:
+            levels = max(lengths)
+
+        assert levels <= len(selectors), \
+               'Selectors do not match queries depth "{} vs {}"'.format(levels, len(selectors))
+
+        base = None
+        if fun_name is not None:
+            base = defaults.get_function_defaults(fun_name, selectors, style_name)
+
+        sheet = StyleSheet(style, len(selectors), base)
+        sheet.check(selectors)
+
+        params = sheet.generate_params(selectors)
+        CACHE.put(key, params)
+
+        return copy_params(params)
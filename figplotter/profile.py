@@ -0,0 +1,235 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import atexit
+import json
+import os
+import sys
+import time
+
+from collections import OrderedDict
+
+'''
+Phases timed for each call to a plotter function. 'artists' is the time of
+the plotter function not spent in the other phases.
+'''
+PHASES = [ 'style', 'params', 'artists', 'legend', 'axes', 'savefig' ]
+
+ENABLED = False
+
+# {function: {'calls': n, 'total': seconds, phase: seconds}}
+STATS   = OrderedDict()
+# {figure name: seconds}
+FIGURES = OrderedDict()
+
+# Frames of the calls and phases being timed
+STACK = []
+
+
+class NullContext(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+NULL_CONTEXT = NullContext()
+
+
+def function_stats(name):
+    if name not in STATS.keys():
+        STATS[name] = OrderedDict([ ('calls', 0), ('total', 0.0) ] + [ (phase, 0.0) for phase in PHASES ])
+
+    return STATS[name]
+
+
+class Timer(object):
+    '''
+    Times a plotter function call (phase is None) or a phase. Phases are
+    accounted to the innermost enclosing call or, if there is none, to a
+    pseudo-function named after the phase.
+    '''
+
+    def __init__(self, name, phase, figure = None):
+        self.name   = name
+        self.phase  = phase
+        self.figure = figure
+
+    def __enter__(self):
+        parent = STACK[-1] if len(STACK) > 0 else None
+        if self.name is None and parent is not None:
+            self.name = parent['name']
+        if self.figure is None and parent is not None:
+            self.figure = parent['figure']
+
+        STACK.append({ 'name': self.name, 'figure': self.figure, 'start': time.time(), 'nested': 0.0 })
+        return self
+
+    def __exit__(self, *args):
+        frame   = STACK.pop()
+        elapsed = time.time() - frame['start']
+
+        outermost = len(STACK) == 0
+        if not outermost:
+            STACK[-1]['nested'] += elapsed
+
+        if self.phase is None:
+            stats = function_stats(self.name)
+            stats['calls']   += 1
+            stats['total']   += elapsed
+            stats['artists'] += elapsed - frame['nested']
+        elif self.name is not None:
+            function_stats(self.name)[self.phase] += elapsed
+        else:
+            stats = function_stats(self.phase)
+            stats['calls']     += 1
+            stats['total']     += elapsed
+            stats[self.phase] += elapsed
+
+        if outermost and self.figure is not None:
+            FIGURES[self.figure] = FIGURES.get(self.figure, 0.0) + elapsed
+
+        return False
+
+
+def function(name, figure = None):
+    '''
+    Times a call to the plotter function name
+
+    @param figure (str): name of the figure the call plots on
+    '''
+    if not ENABLED:
+        return NULL_CONTEXT
+
+    return Timer(name, None, figure)
+
+
+def phase(phase, figure = None):
+    '''
+    Times a phase. Its time is accounted to the enclosing plotter function
+    call or, if there is none, to a pseudo-function named after the phase
+    (e.g. savefig)
+    '''
+    if not ENABLED:
+        return NULL_CONTEXT
+
+    return Timer(None, phase, figure)
+
+
+def reset():
+    STATS.clear()
+    FIGURES.clear()
+
+
+def take():
+    '''
+    Returns the collected counters and resets them (see merge)
+
+    @return dict: counters, or None if the instrumentation is disabled
+    '''
+    if not ENABLED:
+        return None
+
+    ret = { 'functions': OrderedDict((k, OrderedDict(v)) for k, v in STATS.items()),
+            'figures'  : OrderedDict(FIGURES) }
+    reset()
+
+    return ret
+
+
+def merge(counters):
+    '''
+    Adds counters returned by take (e.g. in a batch worker process)
+    '''
+    if counters is None:
+        return
+
+    for name, stats in counters['functions'].items():
+        own = function_stats(name)
+        for k, v in stats.items():
+            own[k] += v
+
+    for name, elapsed in counters['figures'].items():
+        FIGURES[name] = FIGURES.get(name, 0.0) + elapsed
+
+
+def summary(top = 10):
+    '''
+    @return dict: per-function counters and the slowest figures
+    '''
+    figures = sorted(FIGURES.items(), key = lambda item: item[1], reverse = True)
+    return OrderedDict([ ('functions', OrderedDict((k, OrderedDict(v)) for k, v in STATS.items())),
+                         ('figures'  , OrderedDict(figures[:top])) ])
+
+
+def report(stream = None, top = 10):
+    '''
+    Writes a table with the per-function counters and the slowest figures
+    '''
+    if stream is None:
+        stream = sys.stderr
+
+    header = '%-20s %7s %9s' % ('function', 'calls', 'total') + ''.join(' %9s' % p for p in PHASES)
+    stream.write(header + '\n')
+    for name, stats in STATS.items():
+        stream.write('%-20s %7d %9.3f' % (name, stats['calls'], stats['total']) +
+                     ''.join(' %9.3f' % stats[p] for p in PHASES) + '\n')
+
+    figures = summary(top)['figures']
+    if len(figures) > 0:
+        stream.write('\n%-40s %9s\n' % ('figure', 'time'))
+        for name, elapsed in figures.items():
+            stream.write('%-40s %9.3f\n' % (name, elapsed))
+
+
+def dump(path, top = 10):
+    '''
+    Writes the summary in JSON format. '{pid}' in path is replaced by the id
+    of the process, so that each batch worker writes its own file.
+    '''
+    with open(path.replace('{pid}', str(os.getpid())), 'w') as f:
+        json.dump(summary(top), f, indent = 2)
+
+
+OUTPUT     = None
+REGISTERED = []
+
+
+def at_exit():
+    if OUTPUT is None or len(STATS) == 0:
+        return
+
+    if OUTPUT.lower() in ('1', 'true', 'yes', 'stderr'):
+        report()
+    else:
+        dump(OUTPUT)
+
+
+def set_enabled(enabled):
+    '''
+    Enables or disables the instrumentation without reporting the counters
+    on exit (e.g. in batch workers, whose counters are merged by the parent
+    process, see batch.render_batch)
+    '''
+    global ENABLED, OUTPUT
+    ENABLED = bool(enabled)
+    OUTPUT  = None
+
+
+def set_profile(value):
+    '''
+    Enables the instrumentation. Values (e.g. of FIGPLOTTER_PROFILE):
+    - None, '', '0': disabled
+    - '1', 'stderr': print a summary table on exit
+    - any other value: path of a JSON file written on exit
+    '''
+    global ENABLED, OUTPUT
+    ENABLED = value is not None and value.lower() not in ('', '0', 'false', 'no')
+    OUTPUT  = value if ENABLED else None
+
+    if ENABLED and at_exit not in REGISTERED:
+        atexit.register(at_exit)
+        REGISTERED.append(at_exit)
@@ -0,0 +1,240 @@
+'''
+Created on Oct 18, 2026
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+
+Declarative figure specs. A spec is a dictionary (usually loaded from a JSON
+or YAML file) that describes a figure:
+
+    name: throughput                  # name of the figure (optional)
+    output: throughput.pdf            # output path (optional)
+    figure: { figsize: [8, 4] }       # keyword args for figure() (optional)
+    savefig: { bbox_inches: tight }   # keyword args for savefig (optional)
+    axes:
+      - subplot: 111                  # args for add_subplot (optional)
+        plotter: cluster_series_2     # plotter function
+        series: { file: data.json }   # inline series or data source
+        clusters: [[PCIe 2.0, PCIe 3.0], [local, remote]]
+        clusterize: true              # series are flat lists (see utils.clusterize)
+        style_series: { Read: { bar::color: b } }
+        ylim: [0, 4.5]                # other keyword args for the plotter
+
+Data sources are dictionaries with a 'file' (relative to the spec file) and
+an optional 'key' to select an entry of the loaded dictionary. A series
+given as { x: [...], y: [...] } is passed to the plotter as a (y, x) tuple.
+Series of plot_series/bar_series can also be paths to .npy files or .npz
+members ('traces.npz::key'), which are memory mapped.
+'''
+
+import json
+import os
+
+from collections import OrderedDict
+
+from . import batch
+from . import utils
+
+SPEC_KEYS = [ 'name', 'output', 'figure', 'savefig', 'axes', 'base_dir' ]
+
+
+def ordered(obj):
+    '''
+    Converts the dictionaries of a loaded document to OrderedDict, so that
+    series and clusters are plotted in the order of the file
+    '''
+    if isinstance(obj, dict):
+        return OrderedDict((k, ordered(v)) for k, v in obj.items())
+    elif isinstance(obj, list):
+        return [ ordered(v) for v in obj ]
+    return obj
+
+
+def load_document(path):
+    '''
+    Loads a JSON or YAML file. YAML requires PyYAML.
+    '''
+    ext = os.path.splitext(path)[1].lower()
+    with open(path) as f:
+        if ext in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError('PyYAML is required to load "{0}"'.format(path))
+            return ordered(yaml.safe_load(f))
+        else:
+            return json.load(f, object_pairs_hook = OrderedDict)
+
+
+def load(path):
+    '''
+    Loads the specs in a file. A file can contain one spec, a list of specs or
+    a dictionary with a list of specs in 'figures'. Specs without a name are
+    named after the file.
+
+    @param path (str): JSON or YAML file
+
+    @return list: specs in the file
+    '''
+    doc = load_document(path)
+    if isinstance(doc, dict) and 'figures' in doc.keys():
+        doc = doc['figures']
+    if isinstance(doc, dict):
+        doc = [ doc ]
+
+    assert isinstance(doc, list), 'Wrong spec file "{0}"'.format(path)
+
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    base_dir  = os.path.dirname(os.path.abspath(path))
+
+    specs = []
+    for i, spec in enumerate(doc):
+        spec = OrderedDict(spec)
+        if spec.get('name', None) is None:
+            spec['name'] = base_name if len(doc) == 1 else '{0}_{1}'.format(base_name, i)
+        spec.setdefault('base_dir', base_dir)
+        specs.append(spec)
+
+    return specs
+
+
+def load_data(source, base_dir = None):
+    '''
+    @param source: inline series or data source ({ 'file': path, 'key': key })
+    @param base_dir (str): directory for relative paths
+
+    @return: the series
+    '''
+    if isinstance(source, dict) and 'file' in source.keys():
+        path = source['file']
+        if base_dir is not None and not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+
+        data = load_document(path)
+        if source.get('key', None) is not None:
+            data = data[source['key']]
+        return data
+
+    return source
+
+
+def source_path(value, base_dir = None):
+    '''
+    Makes the path of a .npy/.npz data source (see plot.sources) relative to
+    base_dir
+    '''
+    if isinstance(value, str) and base_dir is not None and not os.path.isabs(value):
+        return os.path.join(base_dir, value)
+    return value
+
+
+def series_values(series, base_dir = None):
+    '''
+    Converts { x: [...], y: [...] } series to (y, x) tuples, the format used
+    by simple_series. Series can also be paths to .npy files or .npz members
+    ('traces.npz::key'), relative to base_dir.
+    '''
+    ret = OrderedDict()
+    for key, values in series.items():
+        if isinstance(values, dict) and sorted(values.keys()) == [ 'x', 'y' ]:
+            values = (source_path(values['y'], base_dir), source_path(values['x'], base_dir))
+        else:
+            values = source_path(values, base_dir)
+        ret[key] = values
+
+    return ret
+
+
+def subplot_args(subplot):
+    if isinstance(subplot, (list, tuple)):
+        return tuple(subplot)
+    return (subplot, )
+
+
+def plot_axis(ax, ax_spec, base_dir = None):
+    '''
+    Plots the series of an axis spec in the given axis
+    '''
+    # The plotter functions are registered when plot is imported
+    from .plot import plotter
+
+    kwargs = OrderedDict(ax_spec)
+    kwargs.pop('subplot', None)
+
+    name = kwargs.pop('plotter', None)
+    assert name in plotter.PLOTTERS, \
+           'Invalid plotter "{0}". Valid values are: {1}'.format(name, list(plotter.PLOTTERS.keys()))
+    assert 'series' in kwargs.keys(), 'Axis spec does not have series'
+
+    series     = load_data(kwargs.pop('series'), base_dir)
+    clusters   = kwargs.pop('clusters', None)
+    do_cluster = kwargs.pop('clusterize', False)
+
+    args = [ series ]
+    if name in plotter.CLUSTER_PLOTTERS:
+        assert clusters is not None, 'Plotter "{0}" requires clusters'.format(name)
+        if do_cluster:
+            args = [ utils.clusterize(series, clusters, as_array = True) ]
+        args.append(clusters)
+    else:
+        args = [ series_values(series, base_dir) ]
+
+    return plotter.PLOTTERS[name](ax, *args, **kwargs)
+
+
+def build_figure(spec):
+    '''
+    Builds the figure described by a spec
+
+    @param spec (dict): figure spec
+
+    @return Figure: the figure
+    '''
+    from . import plot
+
+    for key in spec.keys():
+        assert key in SPEC_KEYS, 'Invalid spec key "{0}". Valid values are: {1}'.format(key, SPEC_KEYS)
+
+    fig_kwargs = dict(spec.get('figure', {}))
+    if spec.get('name', None) is not None:
+        fig_kwargs['name'] = spec['name']
+
+    fig = plot.figure(**fig_kwargs)
+    for ax_spec in spec.get('axes', []):
+        ax = fig.add_subplot(*subplot_args(ax_spec.get('subplot', 111)))
+        plot_axis(ax, ax_spec, spec.get('base_dir', None))
+
+    return fig
+
+
+def batch_entry(spec, output_dir = '.', format = 'png'):
+    '''
+    @return dict: entry for batch.render_batch that renders the spec. Output
+            paths are relative to output_dir and default to <name>.<format>
+            (with the name sanitized as in batch.sanitize_name, so that it
+            cannot point outside of output_dir)
+    '''
+    savefig = dict(spec.get('savefig', {}))
+    output = spec.get('output', None)
+    if output is None:
+        output = '{0}.{1}'.format(batch.sanitize_name(spec.get('name', 'figure')), savefig.get('format', format))
+    if not os.path.isabs(output):
+        output = os.path.join(output_dir, output)
+
+    return { 'func'   : build_figure,
+             'args'   : (spec, ),
+             'name'   : spec.get('name', None),
+             'output' : output,
+             'savefig': savefig }
+
+
+def render(specs, output_dir = '.', format = 'png', workers = 0):
+    '''
+    Renders a list of specs (see batch.render_batch)
+
+    @param workers (int): number of worker processes. If 0, all the figures
+           are rendered in the calling process
+
+    @return list: one RenderResult per spec
+    '''
+    entries = [ batch_entry(spec, output_dir, format) for spec in specs ]
+    return batch.render_batch(entries, workers = workers, output_dir = output_dir, format = format)
@@ -6,13 +6,64 @@ Created on Jan 19, 2015
 
 import collections as C
 import copy
+import itertools
 import sys
 
+import numpy as np
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+def merge_value(orig, v):
+    '''
+    @param orig: original value (None if it does not exist)
+    @param v: value to be merged
+
+    @return: the merged value (see merge)
+    '''
+    if isinstance(v, Mapping):
+        if isinstance(orig, Mapping):
+            return merge(orig, v)
+        return v
+    elif isinstance(v, Parameter):
+        if isinstance(orig, Parameter):
+            ret = copy.copy(orig)
+            ret.update(v)
+            return ret
+        # Parameter objects are mutable, but their values are not modified in
+        # place
+        return copy.copy(v)
+    else:
+        return v
+
+
+def merge(d, u):
+    '''
+    Merges two dict hierarchies without modifying them. Only the dictionaries
+    and Parameter objects in the paths modified by u are copied, the rest of
+    the subtrees are shared with d and u, so the returned hierarchy must be
+    treated as read-only (use update to modify it).
+
+    @param d (dict): dictionary with the original values
+    @param u (dict): dictionary with the values to be merged
+
+    @return: the merged dictionary hierarchy
+    '''
+    ret = dict(d)
+    for k, v in u.items():
+        ret[k] = merge_value(d.get(k, None), v)
+
+    return ret
+
 
 def update(d, u):
     '''
     Recursively update a dict hierarchy. It also merges leafs that are Parameter objects,
-    used in the plot styles
+    used in the plot styles. Nested dictionaries and Parameter objects are
+    replaced by copies that share the subtrees not modified by u (see merge)
 
     @param d (dict): dictionary to be updated
     @param u (dict): dictionary withe th values to be merged
@@ -20,16 +71,7 @@ def update(d, u):
     @return: the merged dictionary hierarchy
     '''
     for k, v in u.items():
-        if isinstance(v, C.Mapping):
-            orig = copy.deepcopy(d.get(k, {}))
-            r = update(orig, v)
-            d[k] = r
-        elif isinstance(v, Parameter):
-            orig = copy.deepcopy(d.get(k, Parameter({})))
-            orig.update(v)
-            d[k] = orig
-        else:
-            d[k] = copy.deepcopy(u[k])
+        d[k] = merge_value(d.get(k, None), v)
 
     return d
 
@@ -48,7 +90,7 @@ class Parameter(object):
                 raise Exception('Invalid name "{0}"'.format(name))
 
     def __init__(self, values):
-        if isinstance(values, C.Mapping):
+        if isinstance(values, Mapping):
             Parameter.__check_valid_names(values.keys())
 
         self.values = values
@@ -61,12 +103,14 @@ class Parameter(object):
             else:
                 return True
 
+        # Values are never modified in place, since they can be shared with
+        # other Parameter objects
         if isinstance(param, Parameter):
             check_default_value(self.values, param.values)
-            self.values = update(self.values, param.values)
-        elif isinstance(param, C.Mapping):
+            self.values = merge(self.values, param.values)
+        elif isinstance(param, Mapping):
             check_default_value(self.values, param)
-            self.values = update(self.values, param)
+            self.values = merge(self.values, param)
         else:
             raise Exception('Updating parameter with no series')
 
@@ -96,10 +140,107 @@ def string_generator(pattern, values):
     return lambda x: (pattern % value for value in values(x))
 
 
-def clusterize(series, clusters):
+class ClusterData(object):
+    '''
+    Array-backed hierarchy of clusters. values[i_0, ..., i_n, k] is the value
+    of the series keys[k] in the cluster (clusters[0][i_0], ...,
+    clusters[n][i_n]). It can be passed to the cluster plotters in place of
+    the dictionary hierarchy returned by clusterize.
+    '''
+
+    def __init__(self, values, clusters, keys):
+        '''
+        @param values (ndarray): array of shape (len(clusters[0]), ...,
+               len(clusters[-1]), len(keys))
+        @param clusters (list): list of clusters for each level
+        @param keys (list): series' identifiers
+        '''
+        self.values   = np.asarray(values)
+        self.clusters = [ list(level) for level in clusters ]
+        self.keys     = list(keys)
+
+        assert self.values.shape == tuple(len(level) for level in self.clusters) + (len(self.keys), ), \
+               'Values must have shape {0}'.format(tuple(len(level) for level in self.clusters) + (len(self.keys), ))
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def values_for(self, clusters, key_order):
+        '''
+        @param clusters (list): list of clusters for each level (a subset or
+               reordering of the clusters of the data)
+        @param key_order (list): series' identifiers
+
+        @return ndarray: array of shape (len(clusters[0]), ..., len(key_order)).
+                The values are not copied if clusters and key_order match the
+                ones of the data
+        '''
+        assert len(clusters) == len(self.clusters), 'Data has {0} levels of clusters'.format(len(self.clusters))
+
+        clusters  = [ list(level) for level in clusters ]
+        key_order = list(key_order)
+        if clusters == self.clusters and key_order == self.keys:
+            return self.values
+
+        def positions(selected, available, what):
+            index = dict((v, i) for i, v in enumerate(available))
+            for v in selected:
+                assert v in index, 'Invalid {0} "{1}". Valid values are: {2}'.format(what, v, available)
+            return [ index[v] for v in selected ]
+
+        indices = [ positions(level, all_level, 'cluster') for level, all_level in zip(clusters, self.clusters) ]
+        indices.append(positions(key_order, self.keys, 'series'))
+
+        return self.values[np.ix_(*indices)]
+
+    def split(self, level = 0):
+        '''
+        @param level (int): level of clusters used to split the data
+
+        @return OrderedDict: ClusterData object of each cluster of the level,
+                without that level. Their values are views of the values of
+                the data
+        '''
+        assert 0 <= level < len(self.clusters), 'Data has {0} levels of clusters'.format(len(self.clusters))
+
+        clusters = self.clusters[:level] + self.clusters[level + 1:]
+
+        ret = C.OrderedDict()
+        for i, cluster in enumerate(self.clusters[level]):
+            ret[cluster] = ClusterData(self.values[(slice(None), ) * level + (i, )], clusters, self.keys)
+
+        return ret
+
+    def to_dict(self):
+        '''
+        @return OrderedDict: hierarchy of dictionaries (see clusterize)
+        '''
+        ret = C.OrderedDict()
+        for index in itertools.product(*[ range(len(level)) for level in self.clusters ]):
+            d = ret
+            for level, i in enumerate(index):
+                d = d.setdefault(self.clusters[level][i], C.OrderedDict())
+            for k, key in enumerate(self.keys):
+                d[key] = self.values[index + (k, )].item()
+
+        return ret
+
+    def __repr__(self):
+        return 'ClusterData(shape = {0}, keys = {1})'.format(self.shape, self.keys)
+
+
+def clusterize(series, clusters, as_array = False):
     '''
     Creates a tree of dictionaries that represents a hierarchy of clusters. Leaves
     represents the values in the series for each cluster
+
+    @param series (dict): values of each series, one per combination of clusters
+    @param clusters (list): list of clusters for each level
+    @param as_array (bool): return a ClusterData object, whose values are stored
+           in a single array, instead of the tree of dictionaries
+
+    @return: the hierarchy of clusters
     '''
     # Check all series contain the same number of values
     len_series = -1
@@ -116,49 +257,28 @@ def clusterize(series, clusters):
 
     assert nclusters == len_series, 'Series must contain as many values as clusters'
 
-    def walk(d, fun):
-        '''
-        Apply fun to each node in the tree
-
-        @arg d (dict): root node of the tree
-        @arg fun (function): function to be applied
-        '''
-        if len(d.items()) == 0:
-            fun(d)
-        else:
-            for k, v in d.items():
-                walk(v, fun)
-
-    def leafs(d):
-        '''
-        Get the clusters in the leaves of the tree
-
-        @arg d (dict): root node of the tree
-
-        @return: list containing the clusters in the leaves of the tree
-        '''
-        if len(d.items()) == 0:
-            return [ d ]
-        else:
-            ret = []
-            for k, v in d.items():
-                ret += leafs(v)
+    if as_array:
+        keys = list(series.keys())
+        shape = [ len(level) for level in clusters ] + [ len(keys) ]
+        values = np.empty(shape, dtype = float)
+        flat = values.reshape((-1, len(keys)))
+        for k, key in enumerate(keys):
+            flat[:, k] = series[key]
 
-        return ret
+        return ClusterData(values, clusters, keys)
 
-    # Create the hierarchy of clusters
+    # Leaves are created in the order of the combinations of clusters, so the
+    # i-th value of each series goes to the i-th leaf
     ret = C.OrderedDict()
-    for cluster_level in clusters:
-        def insert_cluster(d):
-            for cluster in cluster_level:
+    for i, path in enumerate(itertools.product(*clusters)):
+        d = ret
+        for cluster in path:
+            if cluster not in d:
                 d[cluster] = C.OrderedDict()
+            d = d[cluster]
 
-        walk(ret, insert_cluster)
-
-    # Add the series values to each cluster leaf
-    for i, leaf in enumerate(leafs(ret)):
         for k, series_vals in series.items():
-            leaf[k] = series_vals[i]
+            d[k] = series_vals[i]
 
     return ret
 
@@ -67,6 +67,7 @@ setup(
     # You can install these using the following syntax, for example:
     # $ pip install -e .[dev,test]
     extras_require = {
+        'yaml': ['PyYAML'],
         #'dev': ['check-manifest'],
         #'test': ['coverage'],
     },
@@ -90,7 +91,7 @@ setup(
     # pip to create the appropriate form of executable for the target platform.
     entry_points={
         'console_scripts': [
-        #   'sample=sample:main',
+            'figplotter=figplotter.cli:main',
         ],
     },
 )
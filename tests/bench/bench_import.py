@@ -0,0 +1,62 @@
+'''
+Created on Oct 18, 2026
+
+Import-time benchmark. Each statement is run in a fresh interpreter several
+times, and the median wall time is reported together with the heavy modules
+that ended up imported.
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    ('matplotlib',             'import matplotlib'),
+    ('matplotlib.pyplot',      'import matplotlib.pyplot'),
+    ('figplotter.plot',        'import figplotter.plot'),
+    ('figplotter.plot+figure', 'import figplotter.plot as p; p.figure()'),
+    ('headless+figure',        'import figplotter.plot as p; p.set_headless(); p.figure()'),
+]
+
+HEAVY_MODULES = [ 'matplotlib.pyplot', 'mpl_toolkits.axes_grid1' ]
+
+SCRIPT = '''
+import sys, time
+start = time.time()
+{0}
+elapsed = time.time() - start
+sys.stdout.write('%f %s\\n' % (elapsed, ','.join(m for m in {1!r} if m in sys.modules)))
+'''
+
+
+def measure(statement, runs):
+    '''
+    @return (float, str): median import time in seconds and heavy modules
+            imported by the statement
+    '''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ os.getcwd(), env.get('PYTHONPATH', '') ])
+    env['FIGPLOTTER_LOG_LEVEL'] = 'error'
+
+    times = []
+    modules = ''
+    for _ in range(runs):
+        out = subprocess.check_output([ sys.executable, '-c', SCRIPT.format(statement, HEAVY_MODULES) ], env = env)
+        elapsed, _, modules = out.decode('utf-8').strip().partition(' ')
+        times.append(float(elapsed))
+
+    times.sort()
+    return times[len(times) // 2], modules
+
+
+def main(runs):
+    sys.stdout.write('%-24s %10s  %s\n' % ('statement', 'time (s)', 'heavy modules'))
+    for name, statement in STATEMENTS:
+        elapsed, modules = measure(statement, runs)
+        sys.stdout.write('%-24s %10.3f  %s\n' % (name, elapsed, modules or '-'))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
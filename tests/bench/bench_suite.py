@@ -0,0 +1,248 @@
+'''
+Created on Oct 18, 2026
+
+Micro-benchmarks of the hot paths of the style engine and the layout code:
+style.generate_params, style.expand_query, style.sort_queries, utils.update,
+utils.clusterize and layout.ClusterLayout. Each benchmark is run for several
+sizes (number of series, clusters per level, nesting levels and density of
+wildcards in the queries), and the best time of several repetitions and the
+peak memory allocated (tracemalloc) are reported.
+
+Results can be stored as a baseline and later runs compared against it:
+
+    python tests/bench/bench_suite.py --save baseline.json
+    python tests/bench/bench_suite.py --compare baseline.json
+
+The comparison exits with status 1 if any benchmark is slower (or allocates
+more memory) than the baseline by more than the given threshold.
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from collections import OrderedDict
+
+import numpy as np
+
+import figplotter.utils as utils
+import figplotter.plot.layout as layout
+import figplotter.plot.style as style
+
+'''
+Sizes of the benchmarks: (levels, clusters per level, series, queries,
+wildcard density)
+'''
+SIZES = OrderedDict([
+    ('small' , [ (1, 4, 2, 8, 0.5), (2, 4, 2, 8, 0.5) ]),
+    ('medium', [ (2, 8, 4, 32, 0.25), (2, 8, 4, 32, 0.75), (3, 6, 4, 32, 0.5) ]),
+    ('large' , [ (2, 32, 8, 128, 0.5), (3, 12, 8, 128, 0.5), (4, 6, 8, 128, 0.5) ]),
+])
+
+PARAMS = [ 'bar::color', 'bar::hatch', 'bar::linewidth', 'overflow::label::fontsize' ]
+
+
+def make_selectors(levels, nclusters, nseries):
+    '''
+    @return list: selectors of each cluster level, and the series keys
+    '''
+    selectors = [ [ 'l%dc%d' % (level, i) for i in range(nclusters) ] for level in range(levels) ]
+    return selectors + [ [ 'series%d' % i for i in range(nseries) ] ]
+
+
+def make_style(selectors, nqueries, density, seed = 0):
+    '''
+    @return dict: style with nqueries queries over all the selector levels.
+            Each field is a wildcard with probability density
+    '''
+    rng = random.Random(seed)
+    ret = OrderedDict()
+    for i in range(nqueries):
+        fields = [ '*' if rng.random() < density else rng.choice(level) for level in selectors ]
+        ret['::'.join(fields)] = { PARAMS[i % len(PARAMS)]: i }
+
+    return ret
+
+
+def bench_generate_params(levels, nclusters, nseries, nqueries, density):
+    selectors = make_selectors(levels, nclusters, nseries)
+    style_series = make_style(selectors, nqueries, density)
+
+    def run():
+        style.cache_clear()
+        style.generate_params(style_series, selectors)
+
+    return run
+
+
+def bench_generate_params_cached(levels, nclusters, nseries, nqueries, density):
+    selectors = make_selectors(levels, nclusters, nseries)
+    style_series = make_style(selectors, nqueries, density)
+    style.generate_params(style_series, selectors)
+
+    return lambda: style.generate_params(style_series, selectors)
+
+
+def bench_expand_query(levels, nclusters, nseries, nqueries, density):
+    selectors = make_selectors(levels, nclusters, nseries)
+    style_series = make_style(selectors, nqueries, density)
+
+    def run():
+        for query, val in style_series.items():
+            style.expand_query(query, val, len(selectors), selectors)
+
+    return run
+
+
+def bench_sort_queries(levels, nclusters, nseries, nqueries, density):
+    selectors = make_selectors(levels, nclusters, nseries)
+    style_series = make_style(selectors, nqueries * 8, density)
+
+    return lambda: style.sort_queries(style_series, len(selectors))
+
+
+def bench_update(levels, nclusters, nseries, nqueries, density):
+    selectors = make_selectors(levels, nclusters, nseries)
+    style_series = make_style(selectors, nqueries, density)
+
+    queries = []
+    for query, val in style.sort_queries(style_series, len(selectors)):
+        queries += style.expand_query(query, val, len(selectors), selectors)
+    dicts = [ style.build_dict(query) for query in queries ]
+
+    def run():
+        ret = {}
+        for d in dicts:
+            utils.update(ret, d)
+
+    return run
+
+
+def bench_clusterize(levels, nclusters, nseries, nqueries, density):
+    selectors = make_selectors(levels, nclusters, nseries)
+    clusters = selectors[:-1]
+    nvalues = int(np.prod([ len(c) for c in clusters ]))
+    series = OrderedDict((key, list(np.arange(nvalues, dtype = float))) for key in selectors[-1])
+
+    return lambda: utils.clusterize(series, clusters)
+
+
+def bench_layout(levels, nclusters, nseries, nqueries, density):
+    shape = (nclusters, ) * levels
+    widths = np.ones(shape + (nseries, ))
+    outer = [ np.ones(shape[:level + 1]) for level in range(levels) ]
+    separation = [ np.full(shape[:level + 1], 0.5) for level in range(levels) ]
+
+    return lambda: layout.ClusterLayout(widths, outer, separation)
+
+
+BENCHMARKS = OrderedDict([
+    ('generate_params'       , bench_generate_params),
+    ('generate_params_cached', bench_generate_params_cached),
+    ('expand_query'          , bench_expand_query),
+    ('sort_queries'          , bench_sort_queries),
+    ('update'                , bench_update),
+    ('clusterize'            , bench_clusterize),
+    ('layout'                , bench_layout),
+])
+
+
+def size_name(size):
+    return 'L%d-C%d-S%d-Q%d-W%.2f' % size
+
+
+def measure(run, repeat):
+    '''
+    @return (float, int): best time of repeat runs, and peak memory allocated
+            by one run
+    '''
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(times), peak
+
+
+def run_benchmarks(sizes, names, repeat, stream):
+    results = OrderedDict()
+    stream.write('%-24s %-28s %12s %12s\n' % ('benchmark', 'size', 'time (s)', 'peak (B)'))
+    for size_set in sizes:
+        for size in SIZES[size_set]:
+            for name in names:
+                elapsed, peak = measure(BENCHMARKS[name](*size), repeat)
+                key = '{0}[{1}]'.format(name, size_name(size))
+                results[key] = OrderedDict([ ('time', elapsed), ('peak', peak) ])
+                stream.write('%-24s %-28s %12.6f %12d\n' % (name, size_name(size), elapsed, peak))
+
+    return results
+
+
+def compare(results, baseline, threshold, stream):
+    '''
+    @return list: benchmarks slower or with larger peak memory than the
+            baseline by more than threshold
+    '''
+    regressions = []
+    stream.write('\n%-54s %9s %9s\n' % ('benchmark', 'time', 'peak'))
+    for key, result in results.items():
+        if key not in baseline.keys():
+            continue
+
+        base = baseline[key]
+        time_ratio = result['time'] / base['time'] if base['time'] > 0 else 1.0
+        peak_ratio = float(result['peak']) / base['peak'] if base['peak'] > 0 else 1.0
+
+        flag = ''
+        if time_ratio > threshold or peak_ratio > threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        stream.write('%-54s %8.2fx %8.2fx%s\n' % (key, time_ratio, peak_ratio, flag))
+
+    return regressions
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Micro-benchmarks of the style engine and layout code')
+    parser.add_argument('--sizes', nargs = '+', default = [ 'small', 'medium' ], choices = list(SIZES.keys()))
+    parser.add_argument('--benchmarks', nargs = '+', default = list(BENCHMARKS.keys()), choices = list(BENCHMARKS.keys()))
+    parser.add_argument('--repeat', type = int, default = 5)
+    parser.add_argument('--save', help = 'store the results as a baseline in the given JSON file')
+    parser.add_argument('--compare', help = 'compare the results with the baseline in the given JSON file')
+    parser.add_argument('--threshold', type = float, default = 1.25,
+                        help = 'maximum ratio with respect to the baseline (default: 1.25)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.benchmarks, args.repeat, sys.stdout)
+
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump({ 'python': sys.version.split()[0], 'numpy': np.__version__, 'results': results }, f, indent = 2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, sys.stdout)
+        if len(regressions) > 0:
+            sys.stdout.write('\n{0} regressions\n'.format(len(regressions)))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
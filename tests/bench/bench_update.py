@@ -0,0 +1,101 @@
+'''
+Created on Oct 18, 2026
+
+Allocation benchmark for utils.update. It replays the merges done to build
+the parameters of a 3-level cluster_series_2 style (one merge per expanded
+query) with the previous deepcopy-based update and with the current
+copy-on-write one, and reports the time and the peak memory allocated during
+the merges.
+
+@author: Javier Cabezas <javier.cabezas@gmail.com>
+'''
+
+import copy
+import sys
+import time
+import tracemalloc
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+import figplotter.utils as utils
+import figplotter.plot.defaults as defaults
+import figplotter.plot.style as style
+
+
+def update_deepcopy(d, u):
+    '''
+    Previous implementation of utils.update, which deep-copied the existing
+    subtree on every nested mapping and Parameter leaf
+    '''
+    for k, v in u.items():
+        if isinstance(v, Mapping):
+            orig = copy.deepcopy(d.get(k, {}))
+            d[k] = update_deepcopy(orig, v)
+        elif isinstance(v, utils.Parameter):
+            orig = copy.deepcopy(d.get(k, utils.Parameter({})))
+            orig.values = update_deepcopy(orig.values, v.values)
+            d[k] = orig
+        else:
+            d[k] = copy.deepcopy(u[k])
+
+    return d
+
+
+def cluster_series_2_queries(nmajor, nminor, nkeys):
+    '''
+    @return list: dictionaries built for every expanded query of a 3-level
+            style, in the order they are merged
+    '''
+    major = [ 'major%d' % i for i in range(nmajor) ]
+    minor = [ 'minor%d' % i for i in range(nminor) ]
+    keys  = [ 'key%d' % i for i in range(nkeys) ]
+    selectors = [ major, minor, keys ]
+
+    style_series = {
+        '*::*::*'       : { 'bar::color' : 'r' },
+        '*::*::key0'    : { 'bar::color' : 'b', 'bar::hatch': '//' },
+        major[0] + '::*::*' : { 'bar::linewidth': 5 },
+        major[-1] + '::' + minor[-1] + '::*' : { 'overflow::label::fontsize': 12 },
+    }
+
+    queries = []
+    for query, val in defaults.get_function_defaults('cluster_series_2', selectors, 'style_series') + \
+                      style.sort_queries(style_series, len(selectors)):
+        queries += style.expand_query(query, val, len(selectors), selectors)
+
+    return [ style.build_dict(query) for query in queries ]
+
+
+def measure(fun, dicts):
+    tracemalloc.start()
+    start = time.time()
+    ret = {}
+    for d in dicts:
+        fun(ret, d)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ret, elapsed, peak
+
+
+def main(sizes):
+    import figplotter.plot
+
+    sys.stdout.write('%-12s %-10s %10s %12s\n' % ('size', 'update', 'time (s)', 'peak (B)'))
+    for size in sizes:
+        dicts = cluster_series_2_queries(*size)
+        results = []
+        for name, fun in [ ('deepcopy', update_deepcopy), ('cow', utils.update) ]:
+            ret, elapsed, peak = measure(fun, dicts)
+            results.append(ret)
+            sys.stdout.write('%-12s %-10s %10.3f %12d\n' % ('x'.join(str(s) for s in size), name, elapsed, peak))
+
+        assert results[0] == results[1], 'Merged parameters differ'
+
+
+if __name__ == '__main__':
+    main([ (2, 2, 2), (4, 4, 4), (8, 8, 4) ])
@@ -6,10 +6,22 @@ Created on Jan 19, 2015
 
 import unittest
 
+import test_backend
+import test_batch
+import test_decimation
+import test_facet
+import test_frames
+import test_info
+import test_layout
+import test_plot
+import test_profile
+import test_render_cache
+import test_sources
+import test_spec
 import test_style
 import test_utils
 
 if __name__ == '__main__':
-    for module in [ test_style, test_utils ]:
+    for module in [ test_backend, test_batch, test_decimation, test_facet, test_frames, test_info, test_layout, test_plot, test_profile, test_render_cache, test_sources, test_spec, test_style, test_utils ]:
         suite = unittest.TestLoader().loadTestsFromModule(module)
         unittest.TextTestRunner(verbosity=2).run(suite)
\ No newline at end of file
@@ -0,0 +1,58 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import figplotter.plot.backend as orig
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run(statement):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ ROOT, env.get('PYTHONPATH', '') ])
+    env['FIGPLOTTER_LOG_LEVEL'] = 'error'
+    script = statement + '\nimport sys\nprint(",".join(sorted(m for m in sys.modules if m.startswith(("matplotlib.pyplot", "mpl_toolkits.axes_grid1", "matplotlib.backends.backend_")))))'
+    return subprocess.check_output([ sys.executable, '-c', script ], env = env).decode('utf-8').strip()
+
+class Test(unittest.TestCase):
+    def test_lazy_import(self):
+        self.assertEqual(run('import figplotter.plot'), '', 'failed at lazy imports')
+
+    def test_headless(self):
+        modules = run('import figplotter.plot as p\np.set_headless()\nfig = p.figure()\nfig.add_subplot(111)\n'
+                      'import io\nfig.savefig(io.BytesIO(), format = "png")\nfig.close()')
+        self.assertEqual(modules, 'matplotlib.backends.backend_agg', 'failed at headless figure')
+
+    def test_headless_env(self):
+        os.environ['FIGPLOTTER_HEADLESS'] = '1'
+        try:
+            modules = run('import figplotter.plot as p\np.figure()')
+        finally:
+            del os.environ['FIGPLOTTER_HEADLESS']
+        self.assertEqual(modules, 'matplotlib.backends.backend_agg', 'failed at FIGPLOTTER_HEADLESS')
+
+    def test_headless_figure(self):
+        headless = orig.is_headless()
+        d = tempfile.mkdtemp()
+        try:
+            orig.set_headless()
+            from figplotter.plot import figure, plot_series
+            fig = figure(name = 'headless')
+            plot_series(fig.add_subplot(111), { 'A': [1, 2, 3] })
+            fig.savefig(os.path.join(d, 'a.png'))
+            fig.close()
+            self.assertTrue(os.path.isfile(os.path.join(d, 'a.png')), 'failed at savefig')
+        finally:
+            orig.HEADLESS = headless
+            shutil.rmtree(d)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
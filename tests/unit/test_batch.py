@@ -0,0 +1,64 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import figplotter.batch as orig
+
+
+def build_line(values):
+    from figplotter.plot import figure, plot_series
+
+    fig = figure()
+    ax = fig.add_subplot(111)
+    plot_series(ax, { 'A': values })
+    return fig
+
+
+def build_error():
+    raise ValueError('wrong data')
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def check_results(self, workers):
+        specs = [ { 'func': build_line, 'args': ([1, 2, 3], ), 'name': 'line a' },
+                  build_error,
+                  { 'func': build_line, 'args': ([3, 2, 1], ), 'output': os.path.join(self.dir, 'sub', 'b.pdf') } ]
+
+        results = orig.render_batch(specs, workers = workers, output_dir = self.dir)
+
+        self.assertEqual([ r.index for r in results ], [0, 1, 2], 'failed at result order')
+        self.assertEqual(results[0].path, os.path.join(self.dir, '00000_line_a.png'), 'failed at default path')
+        self.assertEqual(results[1].path, os.path.join(self.dir, '00001_build_error.png'), 'failed at default name')
+        self.assertTrue(results[0].error is None and results[2].error is None, 'failed at rendering')
+        self.assertTrue('wrong data' in results[1].error, 'failed at error reporting')
+        self.assertTrue(os.path.isfile(results[0].path), 'failed at png output')
+        self.assertTrue(os.path.isfile(results[2].path), 'failed at explicit output')
+        self.assertFalse(os.path.exists(results[1].path), 'failed at failed output')
+
+    def test_duplicate_paths(self):
+        specs = [ { 'func': build_line, 'args': ([1, 2, 3], ), 'output': os.path.join(self.dir, 'a.png') },
+                  { 'func': build_line, 'args': ([3, 2, 1], ), 'output': os.path.join(self.dir, 'x', '..', 'a.png') } ]
+        self.assertRaises(ValueError, orig.render_batch, specs, workers = 0)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, 'a.png')), 'failed at rejected batch')
+
+    def test_in_process(self):
+        self.check_results(0)
+
+    def test_workers(self):
+        self.check_results(2)
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,88 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import unittest
+
+import numpy as np
+
+import figplotter.plot.decimation as orig
+from figplotter.plot.info import Figure
+from figplotter.plot.plot import plot_series
+
+class Test(unittest.TestCase):
+    def test_minmax(self):
+        x = np.arange(1000)
+        y = np.sin(x / 10.0)
+        y[503] = 5
+        y[250] = -5
+
+        xd, yd = orig.minmax(x, y, 10)
+        self.assertTrue(len(xd) <= 2 * 10 + 2, 'failed at size')
+        self.assertTrue(np.all(np.diff(xd) > 0), 'failed at order')
+        self.assertEqual(yd.max(), 5, 'failed at maximum')
+        self.assertEqual(yd.min(), -5, 'failed at minimum')
+        self.assertEqual((xd[0], xd[-1]), (0, 999), 'failed at end points')
+        self.assertEqual(y[xd].tolist(), yd.tolist(), 'failed at selected points')
+
+        # Small series are not modified
+        xd, yd = orig.minmax(x[:10], y[:10], 10)
+        self.assertEqual(len(xd), 10, 'failed at small series')
+
+    def test_minmax_chunks(self):
+        rng = np.random.RandomState(0)
+        x = np.sort(rng.rand(5000)) * 100
+        y = rng.randn(5000)
+        y[rng.randint(0, 5000, 20)] = 3
+
+        expected = orig.minmax(x, y, 30)
+        for chunk_size in [ 1, 700, 5000 ]:
+            xd, yd = orig.minmax_chunks(x, y, 30, chunk_size)
+            self.assertEqual((xd.tolist(), yd.tolist()), (expected[0].tolist(), expected[1].tolist()),
+                             'failed at chunk size {0}'.format(chunk_size))
+
+    def test_minmax_nan(self):
+        x = np.arange(1000.0)
+        y = np.sin(x / 10.0)
+        y[[ 5, 120, 503 ]] = np.nan
+        y[300:400] = np.nan
+
+        xd, yd = orig.minmax(x, y, 10)
+        self.assertFalse(np.any(np.isnan(yd)), 'failed at NaN values')
+        self.assertTrue(np.all((xd < 300) | (xd >= 400)), 'failed at NaN columns')
+        self.assertEqual(np.nanmax(y[:100]), yd[xd < 100].max(), 'failed at columns with NaN values')
+
+        for chunk_size in [ 1, 64, 1000 ]:
+            xc, yc = orig.minmax_chunks(x, y, 10, chunk_size)
+            self.assertEqual((xc.tolist(), yc.tolist()), (xd.tolist(), yd.tolist()),
+                             'failed at NaN chunks of size {0}'.format(chunk_size))
+
+    def test_lttb(self):
+        x = np.arange(1000)
+        y = np.zeros(1000)
+        y[500] = 10
+
+        xd, yd = orig.lttb(x, y, 20)
+        self.assertEqual(len(xd), 20, 'failed at size')
+        self.assertEqual((xd[0], xd[-1]), (0, 999), 'failed at end points')
+        self.assertTrue(500 in xd.tolist(), 'failed at peak')
+
+    def test_crop(self):
+        x = np.arange(100)
+        xd, yd = orig.crop(x, x * 2, (10.5, 20))
+        self.assertEqual((xd[0], xd[-1]), (10, 21), 'failed at crop borders')
+
+    def test_plot_series_decimate(self):
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        y = np.random.RandomState(0).rand(100000)
+
+        plot_series(ax, { 'A': y }, decimate = 'minmax', decimate_columns = 50, legend = False)
+        line = ax.get_lines()[0]
+        self.assertTrue(len(line.get_xdata()) <= 102, 'failed at decimated line')
+        self.assertEqual(len(fig.get_axis_info(ax).series['A'].y_values), 100000, 'failed at full resolution info')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,112 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import unittest
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+import figplotter.plot.plot as plot
+import figplotter.plot.plotter as plotter
+from figplotter.plot.info import Figure
+from figplotter.utils import clusterize
+
+CLUSTERS = [ [ 'a', 'b', 'c' ], [ 'x', 'y' ] ]
+SERIES   = { 'R': list(range(6)), 'W': list(range(6, 12)) }
+
+class Test(unittest.TestCase):
+    def test_facet_panels(self):
+        fig = Figure()
+        axes = fig.facet(clusterize(SERIES, CLUSTERS, as_array = True), plot.cluster_series, by = 0)
+        self.assertEqual([ ax.get_title() for ax in axes ], [ 'a', 'b', 'c' ], 'failed at titles')
+        self.assertEqual(len(fig.axes), 3, 'failed at unused panels')
+        self.assertEqual(len(fig.axes_), 3, 'failed at unused axis info')
+        self.assertEqual([ len(ax.patches) for ax in axes ], [ 4, 4, 4 ], 'failed at bars')
+
+        fig.flush()
+        self.assertTrue(axes[0].get_legend() is not None, 'failed at legend panel')
+        self.assertTrue(axes[1].get_legend() is None, 'failed at panels without legend')
+        self.assertEqual([ t.get_text() for t in axes[1].get_xticklabels() ], [ 'x', 'y' ],
+                         'failed at labels over unused panels')
+
+        # Dictionaries of panels (e.g. a tree returned by clusterize)
+        fig = Figure()
+        axes = fig.facet(clusterize(SERIES, CLUSTERS), 'cluster_series', clusters = CLUSTERS[1:], ncols = 3)
+        self.assertEqual([ ax.get_title() for ax in axes ], [ 'a', 'b', 'c' ], 'failed at dictionary panels')
+        self.assertEqual(axes[2].get_subplotspec().colspan.start, 2, 'failed at grid shape')
+
+        self.assertRaises(AssertionError, Figure().facet, clusterize(SERIES, CLUSTERS), 'cluster_series',
+                          clusters = CLUSTERS[1:], legend_panel = 3)
+
+    def test_facet_shared_setup(self):
+        calls = []
+        setup = plot.cluster_series_setup
+
+        def counted_setup(*args):
+            calls.append(args)
+            return setup(*args)
+
+        plot.cluster_series_setup = counted_setup
+        try:
+            fig = Figure()
+            axes = fig.facet(clusterize(SERIES, CLUSTERS, as_array = True), plot.cluster_series, by = 0)
+        finally:
+            plot.cluster_series_setup = setup
+
+        self.assertEqual(len(calls), 1, 'failed at shared setup')
+        self.assertTrue(plotter.SHARED_SETUPS is None, 'failed at setups scope')
+
+        locators = [ ax.xaxis.get_major_locator() for ax in axes ]
+        formatters = [ ax.xaxis.get_major_formatter() for ax in axes ]
+        self.assertTrue(all(l is locators[0] for l in locators), 'failed at shared locators')
+        self.assertTrue(all(f is formatters[0] for f in formatters), 'failed at shared formatters')
+
+    def test_facet_matches_plotter(self):
+        data = clusterize(SERIES, CLUSTERS, as_array = True)
+        cluster_names = [ { 'a': 'A', 'b': 'B', 'c': 'C' }, { 'x': 'X', 'y': 'Y' } ]
+
+        fig = Figure()
+        axes = fig.facet({ 'first': data, 'second': data }, plot.cluster_series_2, cluster_names = cluster_names,
+                         sharex = False)
+
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        plot.cluster_series_2(ax, data, cluster_names = cluster_names)
+
+        bars = [ (p.get_x(), p.get_height()) for p in ax.patches ]
+        labels = [ t.get_text() for t in ax.get_xticklabels(minor = True) ]
+        for facet_ax in axes:
+            self.assertEqual([ (p.get_x(), p.get_height()) for p in facet_ax.patches ], bars, 'failed at bars')
+            self.assertEqual([ t.get_text() for t in facet_ax.get_xticklabels(minor = True) ], labels, 'failed at labels')
+        self.assertEqual([ t.get_text() for t in ax.get_xticklabels() ], [ 'A', 'B', 'C' ], 'failed at major labels')
+        self.assertEqual(labels, [ 'X', 'Y' ] * 3, 'failed at minor labels')
+        self.assertEqual(cluster_names[0], { 'a': 'A', 'b': 'B', 'c': 'C' }, 'failed at unchanged cluster names')
+
+    @unittest.skipIf(pandas is None, 'pandas is not installed')
+    def test_facet_frame(self):
+        index = pandas.MultiIndex.from_product(CLUSTERS, names = [ 'size', 'kind' ])
+        frame = pandas.DataFrame(SERIES, index = index)
+
+        fig = Figure()
+        axes = fig.facet(frame, plot.cluster_series, by = 'kind')
+        self.assertEqual([ ax.get_title() for ax in axes ], [ 'x', 'y' ], 'failed at cluster facets')
+        self.assertEqual([ p.get_height() for p in axes[1].patches ], [ 1, 3, 5, 7, 9, 11 ], 'failed at cluster values')
+
+        # The clusters of the named level are removed from the given clusters
+        fig = Figure()
+        axes = fig.facet(frame, plot.cluster_series, by = 'size', clusters = CLUSTERS)
+        self.assertEqual([ ax.get_title() for ax in axes ], [ 'a', 'b', 'c' ], 'failed at named level')
+        self.assertEqual([ t.get_text() for t in axes[2].get_xticklabels() ], [ 'x', 'y' ], 'failed at named level clusters')
+
+        fig = Figure()
+        axes = fig.facet(frame, plot.bar_series, by = 'size')
+        self.assertEqual([ ax.get_title() for ax in axes ], [ 'a', 'b', 'c' ], 'failed at series facets')
+        self.assertEqual([ t.get_text() for t in axes[2].get_xticklabels() ], [ 'x', 'y' ], 'failed at series ticklabels')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,96 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import unittest
+
+import numpy as np
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+import figplotter.plot.frames as orig
+import figplotter.plot.plot as plot
+from figplotter.plot.info import Figure
+from figplotter.utils import clusterize
+
+@unittest.skipIf(pandas is None, 'pandas is not installed')
+class Test(unittest.TestCase):
+    def test_series_from_frame(self):
+        frame = pandas.DataFrame({ 'R': [ 1.0, 2.0, 3.0 ], 'W': [ 2.0, 3.0, 4.0 ] })
+
+        series, key_order, ticks, ticklabels = orig.series_from_frame(frame)
+        self.assertEqual(key_order, [ 'R', 'W' ], 'failed at key order')
+        self.assertEqual(list(series['W']), [ 2.0, 3.0, 4.0 ], 'failed at values')
+        self.assertTrue(np.shares_memory(series['R'], frame['R'].to_numpy()), 'failed at zero-copy columns')
+        self.assertEqual((ticks, ticklabels), (None, None), 'failed at default index')
+
+        frame.index = [ 10, 20, 30 ]
+        _, key_order, ticks, ticklabels = orig.series_from_frame(frame, key_order = [ 'W' ])
+        self.assertEqual(key_order, [ 'W' ], 'failed at selected columns')
+        self.assertEqual(list(ticks), [ 10, 20, 30 ], 'failed at numeric index')
+        self.assertEqual(ticklabels, None, 'failed at numeric index labels')
+
+        frame.index = [ 'a', 'b', 'c' ]
+        _, _, ticks, ticklabels = orig.series_from_frame(frame)
+        self.assertEqual((list(ticks), ticklabels), ([ 0, 1, 2 ], [ 'a', 'b', 'c' ]), 'failed at label index')
+
+    def test_cluster_data_from_frame(self):
+        index = pandas.MultiIndex.from_product([ [ 'a', 'b' ], [ 2015, 2016, 2017 ] ])
+        frame = pandas.DataFrame({ 'R': np.arange(6.0), 'W': np.arange(6.0) * 2 }, index = index)
+
+        data = orig.cluster_data_from_frame(frame)
+        self.assertEqual(data.clusters, [ [ 'a', 'b' ], [ '2015', '2016', '2017' ] ], 'failed at clusters')
+        self.assertEqual(data.keys, [ 'R', 'W' ], 'failed at keys')
+        self.assertEqual(data.shape, (2, 3, 2), 'failed at shape')
+        self.assertEqual(data.values[1, 2, 1], 10.0, 'failed at values')
+
+        # Missing combinations are NaN
+        data = orig.cluster_data_from_frame(frame.iloc[[ 5, 0 ]], key_order = [ 'W' ])
+        self.assertEqual(data.clusters, [ [ 'b', 'a' ], [ '2017', '2015' ] ], 'failed at order of appearance')
+        self.assertEqual(data.values[0, 0, 0], 10.0, 'failed at scattered values')
+        self.assertTrue(np.isnan(data.values[0, 1, 0]), 'failed at missing values')
+
+        # Repeated entries and missing cluster names are rejected
+        index = pandas.MultiIndex.from_tuples([ ('a', 'x'), ('a', 'x'), ('b', 'y') ])
+        frame = pandas.DataFrame({ 'R': [ 1.0, 2.0, 3.0 ] }, index = index)
+        self.assertRaises(AssertionError, orig.cluster_data_from_frame, frame)
+
+        index = pandas.MultiIndex.from_tuples([ ('a', 'x'), (np.nan, 'y') ])
+        frame = pandas.DataFrame({ 'R': [ 1.0, 2.0 ] }, index = index)
+        self.assertRaises(AssertionError, orig.cluster_data_from_frame, frame)
+
+    def test_cluster_series_frame(self):
+        clusters = [ [ 'a', 'b' ], [ 'x', 'y' ] ]
+        series = { 'R': [ 1, 2, 3, 4 ], 'W': [ 2, 3, 4, 5 ] }
+        frame = pandas.DataFrame(series, index = pandas.MultiIndex.from_product(clusters))
+
+        heights = []
+        for data, data_clusters in [ (clusterize(series, clusters), clusters), (frame, None) ]:
+            fig = Figure()
+            ax = fig.add_subplot(111)
+            plot.cluster_series_2(ax, data, data_clusters, key_order = [ 'R', 'W' ])
+            heights.append([ (p.get_x(), p.get_height()) for p in ax.patches ])
+
+        self.assertEqual(heights[0], heights[1], 'failed at DataFrame bars')
+
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        plot.cluster_series(ax, frame.xs('a'))
+        self.assertEqual(list(fig.get_axis_info(ax).series.keys()), [ 'R', 'W' ], 'failed at one level')
+
+    def test_bar_series_frame(self):
+        frame = pandas.DataFrame({ 'R': [ 1.0, 2.0 ], 'W': [ 2.0, 3.0 ] }, index = [ 'small', 'large' ])
+
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        plot.bar_series(ax, frame)
+        self.assertEqual([ t.get_text() for t in ax.get_xticklabels() ], [ 'small', 'large' ], 'failed at ticklabels')
+        self.assertEqual([ p.get_y() for p in ax.patches ], [ 0.0, 0.0, 1.0, 2.0 ], 'failed at stacked bars')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
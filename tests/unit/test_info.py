@@ -0,0 +1,154 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import unittest
+
+import numpy as np
+
+import figplotter.plot.info as orig
+from figplotter.plot.plot import bar_series, plot_series
+
+class Test(unittest.TestCase):
+    def test_series_extend(self):
+        series_info = orig.SeriesInfo('A')
+        x = np.arange(4)
+        series_info.set_points(x, x * 2)
+
+        series_info.extend(np.arange(4, 6), np.arange(4, 6) * 2)
+        self.assertEqual(series_info.x_values.tolist(), list(range(6)), 'failed at x values')
+        self.assertEqual(series_info.y_values.tolist(), [ 2 * v for v in range(6) ], 'failed at y values')
+        self.assertEqual(x.tolist(), list(range(4)), 'failed at original points')
+
+        buf = series_info._x.data
+        series_info.extend(np.array([6]), np.array([12]))
+        self.assertTrue(series_info._x.data is buf, 'failed at buffer reuse')
+
+        series_info.extend(np.arange(7, 100), np.arange(7, 100) * 2.5)
+        self.assertEqual(len(series_info.x_values), 100, 'failed at buffer growth')
+        self.assertEqual(series_info.y_values[-1], 99 * 2.5, 'failed at dtype promotion')
+
+    def test_series_read_only(self):
+        x = np.arange(4.0)
+        series_info = orig.SeriesInfo('A')
+        series_info.set_points(x, x * 2)
+        self.assertTrue(np.shares_memory(series_info.x_values, x), 'failed at adopted points')
+
+        def write():
+            series_info.x_values[0] = 10
+        self.assertRaises(ValueError, write)
+        self.assertEqual(x[0], 0, 'failed at caller points')
+        self.assertTrue(x.flags.writeable, 'failed at writeable caller points')
+
+        # Extended buffers are also exposed read-only, and can still grow
+        series_info.extend([ 4.0 ], [ 8.0 ])
+        self.assertRaises(ValueError, write)
+        series_info.extend([ 5.0 ], [ 10.0 ])
+        self.assertEqual(series_info.x_values.tolist(), [ 0, 1, 2, 3, 4, 5 ], 'failed at extension')
+
+    def test_series_merge(self):
+        x = np.arange(3.0)
+        series_info = orig.SeriesInfo('A')
+        series_info.set_legend_info('A', None)
+        series_info.set_points(x, x)
+        self.assertTrue(series_info.x_values.base is x or series_info.x_values is x, 'failed at adopting points')
+
+        for i in range(1000):
+            other = orig.SeriesInfo('A')
+            other.set_legend_info('A', None)
+            other.set_points([ 3.0 + i ], [ 1.0 ])
+            series_info.merge(other)
+
+        self.assertEqual(len(series_info.x_values), 1003, 'failed at merged size')
+        self.assertEqual(series_info.x_values[-1], 1002, 'failed at merged values')
+        self.assertTrue(len(series_info._x.data) < 4 * 1003, 'failed at buffer capacity')
+        self.assertFalse(hasattr(series_info, '__dict__'), 'failed at slots')
+
+    def test_cluster_merge(self):
+        cluster_info = orig.ClusterInfo()
+        cluster_info.set_clusters([ 'a', 'b' ], [ 1.0, 2.0 ])
+
+        other = orig.ClusterInfo()
+        other.set_clusters([ 'a', ('c', 1) ], [ 3.0, 4.0 ])
+        cluster_info.merge(other)
+
+        self.assertEqual(list(cluster_info.cluster_names), [ 'a', 'b', 'a', ('c', 1) ], 'failed at names')
+        self.assertEqual(cluster_info.clusters['a'], [ 1.0, 3.0 ], 'failed at clusters')
+        self.assertEqual(str(cluster_info), "a: 1.00, 3.00, b: 2.00, ('c', 1): 4.00", 'failed at str')
+
+    def test_axis_extend(self):
+        fig = orig.Figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': np.array([1.0, 2.0, 3.0]) }, ylim = (0, 10), legend = False)
+
+        axis_info = fig.get_axis_info(ax)
+        line = ax.get_lines()[0]
+
+        labels = axis_info.extend('A', [3, 4, 5], [4.0, 20.0, 5.0])
+        self.assertTrue(ax.get_lines()[0] is line, 'failed at line reuse')
+        self.assertEqual(list(line.get_xdata()), [0, 1, 2, 3, 4, 5], 'failed at line data')
+        self.assertEqual(len(labels), 1, 'failed at overflow labels')
+        self.assertEqual(labels[0].get_text(), '20.00', 'failed at overflow label text')
+        self.assertTrue(ax.dataLim.x1 >= 5, 'failed at data limits')
+
+        self.assertEqual(axis_info.extend('A', [], []), [], 'failed at empty extension')
+
+    def test_axis_extend_decimated(self):
+        x = np.arange(2000.0)
+        y = np.where(x >= 1000, 20.0, 1.0)
+
+        fig = orig.Figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': (y[:1000], x[:1000]) }, ylim = (0, 10), decimate = 'minmax', decimate_columns = 10,
+                    legend = False)
+        labels = fig.get_axis_info(ax).extend('A', x[1000:], y[1000:])
+
+        # Labels are placed at the plotted points, as if the series was plotted at once
+        fig2 = orig.Figure()
+        ax2 = fig2.add_subplot(111)
+        plot_series(ax2, { 'A': (y, x) }, ylim = (0, 10), decimate = 'minmax', decimate_columns = 10)
+        expected = fig2.get_axis_info(ax2).series['A'].overflow_labels
+        self.assertEqual([ l.get_position() for l in labels ], [ l.get_position() for l in expected ],
+                         'failed at decimated overflow labels')
+        self.assertTrue(len(labels) < 1000, 'failed at decimated labels')
+
+    def test_deferred_legend(self):
+        fig = orig.Figure()
+        ax = fig.add_subplot(111)
+        bar_series(ax, { 'A': [1.0, 2.0] }, ylim = (0, 5), ylabel = 'y')
+        plot_series(ax, { 'B': [1.0, 2.0] })
+        self.assertTrue(ax.get_legend() is None, 'failed at deferred legend')
+
+        fig.flush()
+        self.assertEqual([ t.get_text() for t in ax.get_legend().get_texts() ], [ 'A', 'B' ], 'failed at legend')
+        self.assertEqual((ax.get_ylim(), ax.get_ylabel()), ((0, 5), 'y'), 'failed at axes properties')
+
+        # The legend of the last request only contains the series plotted so far
+        ax = fig.add_subplot(212)
+        plot_series(ax, { 'A': [1.0, 2.0] })
+        plot_series(ax, { 'B': [1.0, 2.0] }, legend = False)
+        fig.flush(ax)
+        self.assertEqual([ t.get_text() for t in ax.get_legend().get_texts() ], [ 'A' ], 'failed at legend request')
+
+    def test_deferred_properties(self):
+        fig = orig.Figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': [1.0, 2.0] }, ylim = (0, 5), xlabel = 'x', ylabel = 'y')
+
+        # Properties changed directly in the axis are kept
+        ax.set_ylim(0, 10)
+        ax.set_ylabel('z')
+        fig.flush()
+        self.assertEqual((ax.get_ylim(), ax.get_xlabel(), ax.get_ylabel()), ((0, 10), 'x', 'z'), 'failed at direct changes')
+
+        ax = fig.add_subplot(212)
+        plot_series(ax, { 'A': [1.0, 2.0] }, ygrid = False, xgrid = True)
+        ax.yaxis.grid(True)
+        fig.flush()
+        self.assertTrue(all(l.get_visible() for l in ax.yaxis.get_gridlines()), 'failed at direct grid changes')
+        self.assertTrue(all(l.get_visible() for l in ax.xaxis.get_gridlines()), 'failed at deferred grid')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
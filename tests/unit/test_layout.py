@@ -0,0 +1,134 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import unittest
+
+import numpy as np
+
+import figplotter.plot.layout as orig
+from figplotter.plot.info import Figure
+from figplotter.plot.plot import cluster_series_n
+from figplotter.utils import clusterize
+
+
+def nested_layout(widths, outer, separation, offset = 0):
+    '''
+    Reference layout computed cluster by cluster, like the nested loops of
+    cluster_series_2 before ClusterLayout
+
+    @return (list, list): ticks of each level and x position of each bar
+    '''
+    levels = widths.ndim - 1
+    ticks  = [ [] for _ in range(levels) ]
+    bars   = []
+
+    def width(path):
+        level = len(path)
+        if level == levels:
+            return widths[path].sum()
+
+        n = widths.shape[level]
+        w = sum(width(path + (i, )) for i in range(n))
+        w += outer[level][path + (0, )] + outer[level][path + (n - 1, )]
+        for i in range(n - 1):
+            w += separation[level][path + (i, )] + separation[level][path + (i + 1, )]
+        return w
+
+    def place(path, current):
+        level = len(path)
+        current += outer[level][path + (0, )]
+        for i in range(widths.shape[level]):
+            child = path + (i, )
+            if i > 0:
+                current += separation[level][path + (i - 1, )] + separation[level][child]
+
+            w = width(child)
+            ticks[level].append(current + w / 2.0)
+            if level == levels - 1:
+                bars.extend(current + np.cumsum(widths[child]) - widths[child])
+            else:
+                place(child, current)
+            current += w
+
+    place((), offset)
+
+    return ticks, bars
+
+
+class Test(unittest.TestCase):
+    def test_one_level(self):
+        widths = np.array([[1.0, 1.0], [1.0, 2.0]])
+        l = orig.ClusterLayout(widths, [ np.array([1.0, 2.0]) ], [ np.array([0.5, 1.0]) ])
+
+        # 1 (outer) + 2 / 2
+        # 1 (outer) + 2 (first cluster) + 0.5 + 1.0 (separations) + 3 / 2
+        self.assertEqual(list(l.ticks(0)), [2.0, 6.0], 'failed at ticks')
+        self.assertEqual(l.bar_x.tolist(), [[1.0, 2.0], [4.5, 5.5]], 'failed at bar positions')
+        self.assertEqual(l.xlim(), (0.0, 9.5), 'failed at limits')
+
+    def test_two_levels(self):
+        widths = np.ones((2, 2, 1))
+        outer      = [ np.array([1.0, 1.0]), np.full((2, 2), 0.5) ]
+        separation = [ np.array([1.0, 1.0]), np.full((2, 2), 0.25) ]
+        l = orig.ClusterLayout(widths, outer, separation, offset = 1)
+
+        # Major clusters: 0.5 + 1 + 0.5 (separations) + 1 + 0.5 = 3.5 wide
+        self.assertEqual(l.cluster_widths[0].tolist(), [3.5, 3.5], 'failed at major widths')
+        self.assertEqual(list(l.ticks(0)), [3.75, 9.25], 'failed at major ticks')
+        self.assertEqual(list(l.ticks(1)), [3.0, 4.5, 8.5, 10.0], 'failed at minor ticks')
+        self.assertEqual(l.xlim(), (1.0, 12.0), 'failed at limits')
+
+    def test_cluster_series_n(self):
+        clusters = [ [ 'a', 'b' ], [ 'x', 'y', 'z' ], [ '1', '2' ] ]
+        series = { 'R': list(range(12)), 'W': list(range(12, 24)) }
+
+        style_series   = { 'W': { 'bar::width': 0.5 }, 'b::*::2::R': { 'bar::width': 2 } }
+        style_clusters = [ { 'b': { 'cluster::outer': 2 } },
+                           { 'a::y': { 'cluster::separation': 1.5 } },
+                           { '*::z::1': { 'cluster::outer': 0.25 } } ]
+
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        cluster_series_n(ax, clusterize(series, clusters), clusters, key_order = [ 'R', 'W' ], offset = 1,
+                         style_series = style_series, style_clusters = style_clusters)
+
+        # Same parameters as the styles above
+        widths = np.ones((2, 3, 2, 2))
+        widths[..., 1] = 0.5
+        widths[1, :, 1, 0] = 2
+        outer      = [ np.array([ 1, 2 ]), np.ones((2, 3)), np.ones((2, 3, 2)) ]
+        separation = [ np.full(2, 0.5), np.full((2, 3), 0.5), np.full((2, 3, 2), 0.5) ]
+        outer[2][:, 2, 0] = 0.25
+        separation[1][0, 1] = 1.5
+        ticks, bars = nested_layout(widths, outer, separation, offset = 1)
+
+        # Bars are centered at their positions
+        self.assertEqual(sorted(p.get_x() + p.get_width() / 2.0 for p in ax.patches), sorted(bars),
+                         'failed at bar positions')
+        self.assertEqual(list(ax.get_xticks()), ticks[0], 'failed at major ticks')
+        self.assertEqual(list(ax.get_xticks(minor = True)), ticks[2], 'failed at minor ticks')
+        self.assertEqual([ t.get_text() for t in ax.get_xticklabels() ], clusters[0], 'failed at major labels')
+        self.assertEqual([ t.get_text() for t in ax.get_xticklabels(minor = True) ], clusters[2] * 6,
+                         'failed at minor labels')
+
+        # The middle level is labeled in a secondary axis
+        secondary = [ child for child in ax.get_children() if hasattr(child, 'set_location') ]
+        self.assertEqual(len(secondary), 1, 'failed at secondary axes')
+        self.assertEqual(list(secondary[0].get_xticks()), ticks[1], 'failed at middle ticks')
+        self.assertEqual([ t.get_text() for t in secondary[0].get_xticklabels() ], clusters[1] * 2,
+                         'failed at middle labels')
+
+    def test_get_layout(self):
+        widths = np.ones((3, 2))
+        params = [ np.ones(3) ]
+        l1 = orig.get_layout(widths, params, params)
+        l2 = orig.get_layout(widths.copy(), [ np.ones(3) ], [ np.ones(3) ])
+        l3 = orig.get_layout(widths, params, params, offset = 1)
+        self.assertTrue(l1 is l2, 'failed at cached layout')
+        self.assertTrue(l1 is not l3, 'failed at different offset')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,172 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import unittest
+
+import numpy as np
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+
+import figplotter.plot.overflow as overflow
+import figplotter.plot.plot as orig
+from figplotter.utils import Parameter
+
+class Test(unittest.TestCase):
+    def test_instantiate_params_lazy(self):
+        params = {'width' : Parameter({ 'A': 1, 'B': 2 }),
+                  'color' : Parameter({ 'A': 'r' }),
+                  'enable': True,
+                  'label' : { 'ha': Parameter({ 'B': 'left' }) }}
+
+        eager = orig.instantiate_params(params, ['A', 'B'])
+        lazy  = orig.instantiate_params(params, ['A', 'B'], lazy = True)
+
+        expected = {'width': 1, 'color': 'r', 'enable': True, 'label': {}}
+        self.assertEqual(dict(lazy['A']), expected, 'failed at series with all values')
+        self.assertEqual(lazy['B'], eager['B'], 'failed at series with missing values')
+        self.assertEqual(sorted(lazy.keys()), ['A', 'B'], 'failed at series list')
+        self.assertTrue(lazy['A'] is lazy['A'], 'failed at view caching')
+
+        # Views can be used as keyword arguments
+        kwargs = dict(**lazy['B']['label'])
+        self.assertEqual(kwargs, { 'ha': 'left' }, 'failed at keyword arguments')
+
+        # Views are read-only and do not modify the parameters
+        def set_width():
+            lazy['A']['width'] = 3
+        self.assertRaises(TypeError, set_width)
+        self.assertRaises(KeyError, lambda: lazy['C'])
+        self.assertEqual(params['width'], Parameter({ 'A': 1, 'B': 2 }), 'failed at original params')
+
+    def test_cull_positions(self):
+        x = np.array([3.0, 0.0, 0.5, 1.0, 2.9])
+        self.assertEqual(list(overflow.cull_positions(x, 0)), [1, 2, 3, 4, 0], 'failed at no culling')
+        self.assertEqual(list(overflow.cull_positions(x, 1.0)), [1, 3, 4], 'failed at culling')
+
+    def test_plot_overflow(self):
+        ax = Figure().add_subplot(111)
+        params = {'label': {'ha': 'left'}, 'min_distance': 0}
+
+        labels = overflow.plot_overflow(ax, [0, 1, 2, 3], [1, 5, 2, 6], (0, 4), params)
+        self.assertEqual([ l.get_text() for l in labels ], ['5.00', '6.00'], 'failed at overflow values')
+        self.assertEqual(overflow.plot_overflow(ax, 0, 1, (0, 4), params), [], 'failed at scalar value')
+
+        # The labels of a call are added as a single artist
+        self.assertEqual(len(ax.texts), 0, 'failed at no Text artists')
+        self.assertEqual([ a.get_children() for a in ax.artists ], [ labels ], 'failed at single artist')
+        ax.set_ylim(0, 4)
+        bbox = ax.artists[0].get_window_extent()
+        self.assertTrue(bbox.y0 >= ax.get_window_extent().y1, 'failed at label extents')
+
+        params['min_distance'] = 5
+        labels = overflow.plot_overflow(ax, [0, 1, 2, 3], [1, 5, 2, 6], (0, 4), params)
+        self.assertEqual(len(labels), 1, 'failed at culled labels')
+
+    def test_plot_bars_collection(self):
+        ax = Figure().add_subplot(111)
+        params = {'width': 0.5, 'color': 'b', 'edgecolor': 'k', 'hatch': '//', 'backend': 'collection'}
+
+        h = orig.plot_bars(ax, [0, 1, 2], [1, 2, 3], y_offsets = [1, 1, 1], bar_params = params)
+        self.assertEqual(len(h.get_paths()), 3, 'failed at number of bars')
+        self.assertEqual(len(ax.patches), 0, 'failed at no patches')
+        self.assertEqual(h.get_hatch(), '//', 'failed at hatch')
+        self.assertEqual(h.get_paths()[2].vertices[:4].tolist(), [[1.75, 1], [1.75, 4], [2.25, 4], [2.25, 1]],
+                         'failed at bar vertices')
+        self.assertTrue(ax.get_ylim()[1] >= 4, 'failed at data limits')
+
+        legend = ax.legend([ h ], [ 'A' ])
+        self.assertEqual(len(legend.get_patches()), 1, 'failed at legend handle')
+
+        params = {'yerr': 0.1, 'backend': 'collection'}
+        self.assertRaises(AssertionError, orig.plot_bars, ax, [0, 1, 2], [1, 2, 3], bar_params = params)
+
+    def test_plot_bars_collection_defaults(self):
+        import matplotlib
+        from figplotter.plot.info import Figure as InfoFigure
+
+        colors = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+
+        fig = InfoFigure()
+        ax = fig.add_subplot(111)
+        orig.bar_series(ax, { 'A': [ 1, 2 ], 'B': [ 3, 4 ] }, key_order = [ 'A', 'B' ],
+                        style_series = { '*': { 'bar::backend': 'collection' } })
+        self.assertEqual([ tuple(c.get_facecolor()[0]) for c in ax.collections ], [ to_rgba(c) for c in colors[:2] ],
+                         'failed at property cycle colors')
+        self.assertFalse(fig.get_axis_info(ax).autoscale_, 'failed at autoscale per call')
+        self.assertTrue(ax.get_ylim()[1] >= 6, 'failed at view limits')
+
+    def test_plot_bars_hatchcolor(self):
+        for backend in ('patches', 'collection'):
+            ax = Figure().add_subplot(111)
+            params = {'color': 'w', 'edgecolor': 'b', 'hatch': '//', 'hatchcolor': 'r', 'backend': backend}
+
+            orig.plot_bars(ax, [0, 1], [1, 2], y_offsets = [1, 1], bar_params = params)
+            artists = ax.patches if backend == 'patches' else ax.collections
+            if not orig.HATCHCOLOR_API:
+                # Older versions outline the bars in a second pass
+                artists = artists[:len(artists) // 2]
+            self.assertEqual(len(artists), 2 if backend == 'patches' else 1,
+                             'failed at single pass for {0}'.format(backend))
+            for artist in artists:
+                if orig.HATCHCOLOR_API:
+                    self.assertEqual(to_rgba(artist.get_hatchcolor()), to_rgba('r'),
+                                     'failed at hatch color for {0}'.format(backend))
+                    edge = artist.get_edgecolor()
+                    edge = edge if backend == 'patches' else edge[0]
+                    self.assertEqual(tuple(edge), to_rgba('b'), 'failed at edge color for {0}'.format(backend))
+            if backend == 'patches':
+                self.assertEqual(ax.patches[0].get_y(), 1, 'failed at y offsets')
+
+    def test_plot_bars_hatchcolor_rc(self):
+        for backend in ('patches', 'collection'):
+            ax = Figure().add_subplot(111)
+            params = {'color': 'w', 'edgecolor': 'b', 'hatch': '//'}
+
+            bars = orig.BAR_BACKENDS[backend]
+            h = orig.bars_hatchcolor_rc(bars, ax, [0, 1], [1, 2], [1, 1], params, 'r')
+            artists = ax.patches if backend == 'patches' else ax.collections
+            self.assertEqual(len(artists), 4 if backend == 'patches' else 2,
+                             'failed at outline pass for {0}'.format(backend))
+
+            hatched = h.patches[0] if backend == 'patches' else h
+            outline = artists[-1]
+            edge = hatched.get_edgecolor() if backend == 'patches' else hatched.get_edgecolor()[0]
+            self.assertEqual(tuple(edge), to_rgba('r'), 'failed at hatch pass for {0}'.format(backend))
+            edge = outline.get_edgecolor() if backend == 'patches' else outline.get_edgecolor()[0]
+            self.assertEqual(tuple(edge), to_rgba('b'), 'failed at outline color for {0}'.format(backend))
+            self.assertFalse(outline.get_hatch(), 'failed at outline without hatches for {0}'.format(backend))
+            self.assertEqual(params['edgecolor'], 'b', 'failed at unchanged params for {0}'.format(backend))
+
+            # Without an edge color hatches use rcParams['hatch.color']
+            ax = Figure().add_subplot(111)
+            h = orig.bars_hatchcolor_rc(bars, ax, [0, 1], [1, 2], [1, 1], {'hatch': '//'}, 'r')
+            artists = ax.patches if backend == 'patches' else ax.collections
+            self.assertEqual(len(artists), 2 if backend == 'patches' else 1,
+                             'failed at single pass without edge color for {0}'.format(backend))
+            if orig.HATCHCOLOR_API:
+                hatched = h.patches[0] if backend == 'patches' else h
+                self.assertEqual(to_rgba(np.ravel(hatched.get_hatchcolor())), to_rgba('r'),
+                                 'failed at rc hatch color for {0}'.format(backend))
+
+    def test_cluster_data(self):
+        from figplotter.plot.info import Figure as InfoFigure
+        from figplotter.utils import clusterize
+
+        clusters = [ [ 'a', 'b' ], [ 'x', 'y' ] ]
+        series = { 'R': [ 1, 2, 3, 4 ], 'W': [ 2, 3, 4, 5 ] }
+
+        heights = []
+        for data in [ clusterize(series, clusters), clusterize(series, clusters, as_array = True) ]:
+            fig = InfoFigure()
+            ax = fig.add_subplot(111)
+            orig.cluster_series_2(ax, data, clusters, key_order = [ 'R', 'W' ])
+            heights.append([ (p.get_x(), p.get_height()) for p in ax.patches ])
+            self.assertEqual(list(fig.get_axis_info(ax).series.keys()), [ 'R', 'W' ], 'failed at series')
+
+        self.assertEqual(heights[0], heights[1], 'failed at ClusterData bars')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,101 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import figplotter
+import figplotter.profile as orig
+from figplotter.plot import figure, plot_series
+
+
+def build_figure():
+    fig = figure(name = 'batch')
+    plot_series(fig.add_subplot(111), { 'A': [1, 2, 3] })
+    return fig
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        orig.set_profile('1')
+        orig.reset()
+
+    def tearDown(self):
+        orig.set_profile(None)
+        orig.reset()
+
+    def test_phases(self):
+        with orig.function('f', 'fig'):
+            with orig.phase('style'):
+                time.sleep(0.01)
+            time.sleep(0.01)
+        with orig.phase('savefig', 'fig'):
+            pass
+
+        stats = orig.summary()['functions']
+        self.assertEqual(stats['f']['calls'], 1, 'failed at calls')
+        self.assertTrue(stats['f']['style'] >= 0.01, 'failed at style phase')
+        self.assertTrue(0.01 <= stats['f']['artists'] < stats['f']['total'], 'failed at artists phase')
+        self.assertEqual(stats['savefig']['calls'], 1, 'failed at standalone phase')
+        self.assertTrue(orig.summary()['figures']['fig'] >= 0.02, 'failed at figure time')
+
+    def test_disabled(self):
+        orig.set_profile(None)
+        with orig.function('f'):
+            pass
+        self.assertEqual(len(orig.STATS), 0, 'failed at disabled instrumentation')
+
+    def test_plotter(self):
+        fig = figure(name = 'profiled')
+        plot_series(fig.add_subplot(111), { 'A': [1, 2, 3] }, ylabel = 'y')
+        fig.flush()
+        fig.close()
+
+        stats = orig.summary()['functions']['plot_series']
+        self.assertEqual(stats['calls'], 1, 'failed at plotter calls')
+        self.assertTrue(stats['style'] > 0, 'failed at plotter phases')
+        # The legend is built when the figure is flushed
+        self.assertTrue(orig.summary()['functions']['legend']['legend'] > 0, 'failed at deferred legend')
+
+        out = io.StringIO()
+        orig.report(out)
+        self.assertTrue('plot_series' in out.getvalue() and 'profiled' in out.getvalue(), 'failed at report')
+
+        d = tempfile.mkdtemp()
+        try:
+            path = os.path.join(d, 'profile.json')
+            orig.dump(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)['functions']['plot_series']['calls'], 1, 'failed at json')
+        finally:
+            shutil.rmtree(d)
+
+    def test_batch_workers(self):
+        import multiprocessing
+
+        # Workers started with spawn do not inherit the instrumentation state
+        contexts = [ c for c in ('fork', 'spawn') if c in multiprocessing.get_all_start_methods() ]
+        for context in contexts:
+            orig.reset()
+            d = tempfile.mkdtemp()
+            try:
+                results = figplotter.render_batch([ build_figure, build_figure ], workers = 2, output_dir = d,
+                                                  mp_context = context)
+            finally:
+                shutil.rmtree(d)
+
+            self.assertEqual([ r.error for r in results ], [ None, None ], 'failed at rendering with {0}'.format(context))
+            stats = orig.summary()['functions']
+            self.assertEqual(stats['plot_series']['calls'], 2, 'failed at worker counters with {0}'.format(context))
+            self.assertEqual(stats['savefig']['calls'], 2, 'failed at worker savefig with {0}'.format(context))
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
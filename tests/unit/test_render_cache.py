@@ -0,0 +1,129 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import figplotter.plot.render_cache as orig
+from figplotter.plot import figure, plot_series
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = orig.enable(os.path.join(self.dir, 'cache'))
+
+    def tearDown(self):
+        orig.disable()
+        shutil.rmtree(self.dir)
+
+    def render(self, name, values, **kwargs):
+        fig = figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': values }, **kwargs)
+        path = os.path.join(self.dir, name)
+        fig.savefig(path)
+        fig.close()
+        return path
+
+    def test_digest(self):
+        self.assertEqual(orig.digest({ 'a': [1, 2] }), orig.digest({ 'a': [1, 2] }), 'failed at equal values')
+        self.assertNotEqual(orig.digest(1), orig.digest(1.0), 'failed at types')
+        self.assertNotEqual(orig.digest(np.arange(3)), orig.digest(np.arange(3.0)), 'failed at dtypes')
+        self.assertRaises(orig.Uncacheable, orig.digest, lambda x: x)
+
+    def test_hit_miss(self):
+        a = self.render('a.png', [1, 2, 3])
+        info = orig.cache_info()
+        self.assertEqual((info.hits, info.misses, info.files), (0, 1, 1), 'failed at first render')
+
+        b = self.render('b.png', [1, 2, 3])
+        info = orig.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1), 'failed at cache hit')
+        with open(a, 'rb') as fa, open(b, 'rb') as fb:
+            self.assertEqual(fa.read(), fb.read(), 'failed at cached artifact')
+
+        self.render('c.png', [1, 2, 4])
+        self.render('d.png', [1, 2, 3], ylim = (0, 2))
+        info = orig.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 3), 'failed at changed inputs')
+
+    def test_bypass(self):
+        fig = figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': [1, 2, 3] })
+        ax.axhline(1)
+        fig.savefig(os.path.join(self.dir, 'a.png'))
+        fig.close()
+
+        info = orig.cache_info()
+        self.assertEqual((info.bypasses, info.files), (1, 0), 'failed at modified figure')
+
+    def render_modified(self, name, modify):
+        fig = figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': [1.0, 2.0, 3.0] }, ylim = (0, 100))
+        modify(fig, ax)
+        path = os.path.join(self.dir, name)
+        fig.savefig(path)
+        fig.close()
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_modified_artists(self):
+        extend = lambda y: lambda fig, ax: fig.get_axis_info(ax).extend('A', [3.0], [y])
+        a = self.render_modified('a.png', extend(10.0))
+        b = self.render_modified('b.png', extend(90.0))
+        info = orig.cache_info()
+        self.assertEqual((info.hits, info.misses), (0, 2), 'failed at extended figures')
+        self.assertNotEqual(a, b, 'failed at extended artifacts')
+
+        self.assertEqual(self.render_modified('c.png', extend(90.0)), b, 'failed at cached extension')
+        self.assertEqual(orig.cache_info().hits, 1, 'failed at extension hit')
+
+        # Figures modified directly after the plotter calls are not cached
+        def move_legend(fig, ax):
+            fig.flush()
+            ax.get_legend().set_loc('upper left')
+
+        modifications = [ lambda fig, ax: ax.get_lines()[0].set_color('r'),
+                          lambda fig, ax: ax.get_lines()[0].set_ydata([3.0, 2.0, 1.0]),
+                          lambda fig, ax: ax.set_xticks([0, 1, 2], [ 'a', 'b', 'c' ]),
+                          lambda fig, ax: ax.spines['top'].set_visible(False),
+                          lambda fig, ax: ax.tick_params(direction = 'in'),
+                          lambda fig, ax: ax.set_facecolor('y'),
+                          lambda fig, ax: fig.set_facecolor('y'),
+                          lambda fig, ax: ax.grid(True),
+                          move_legend ]
+        for i, modify in enumerate(modifications):
+            self.render_modified('m{0}.png'.format(i), modify)
+        info = orig.cache_info()
+        self.assertEqual((info.hits, info.misses, info.bypasses), (1, 2, len(modifications)), 'failed at modified figures')
+
+        # Flushing and rendering are not modifications
+        d = self.render_modified('d.png', lambda fig, ax: fig.flush())
+        self.assertEqual(self.render_modified('e.png', lambda fig, ax: fig.canvas.draw()), d, 'failed at drawn figure')
+        info = orig.cache_info()
+        self.assertEqual((info.hits, info.misses, info.bypasses), (2, 3, len(modifications)), 'failed at unmodified figures')
+
+    def test_eviction(self):
+        a = self.render('a.png', [1, 2, 3])
+        b = self.render('b.png', [3, 2, 1])
+        self.cache.max_size = os.path.getsize(a) + os.path.getsize(b) - 1
+        self.cache.evict()
+
+        info = orig.cache_info()
+        self.assertEqual((info.files, info.evictions), (1, 1), 'failed at eviction')
+
+        # The least recently used artifact is evicted
+        self.render('c.png', [3, 2, 1])
+        self.assertEqual(orig.cache_info().hits, 1, 'failed at eviction order')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
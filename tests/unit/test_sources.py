@@ -0,0 +1,112 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import figplotter.plot.sources as orig
+from figplotter.plot.info import Figure
+from figplotter.plot.plot import bar_series, plot_series
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.chunk_size = orig.CHUNK_SIZE
+        # Small chunks so that the test series span several chunks
+        orig.CHUNK_SIZE = 1000
+
+    def tearDown(self):
+        orig.CHUNK_SIZE = self.chunk_size
+        shutil.rmtree(self.dir)
+
+    def test_index_range(self):
+        r = orig.IndexRange(5, 100)
+        self.assertEqual(len(r), 100, 'failed at length')
+        self.assertEqual((r[0], r[-1]), (5.0, 104.0), 'failed at items')
+        self.assertTrue(isinstance(r[10:20], orig.IndexRange), 'failed at lazy slices')
+        self.assertEqual(np.asarray(r[10:20]).tolist(), list(range(15, 25)), 'failed at slice values')
+        self.assertEqual(r[[0, 2, -1]].tolist(), [5.0, 7.0, 104.0], 'failed at fancy indices')
+        self.assertEqual(np.searchsorted(r, 10.5), 6, 'failed at searchsorted')
+        self.assertEqual(np.searchsorted(r, 10, side = 'right'), 6, 'failed at searchsorted right')
+        self.assertEqual(np.searchsorted(r, 1000), 100, 'failed at searchsorted bounds')
+
+    def test_open_source(self):
+        values = np.arange(10.0)
+        np.save(os.path.join(self.dir, 'a.npy'), values)
+        np.savez(os.path.join(self.dir, 'b.npz'), y = values * 2)
+        np.savez_compressed(os.path.join(self.dir, 'c.npz'), y = values * 3)
+
+        a = orig.open_source(os.path.join(self.dir, 'a.npy'))
+        b = orig.open_source(os.path.join(self.dir, 'b.npz') + '::y')
+        c = orig.open_source(os.path.join(self.dir, 'c.npz') + '::y')
+        self.assertTrue(isinstance(a, np.memmap) and isinstance(b, np.memmap), 'failed at memory mapping')
+        self.assertEqual((a.tolist(), b.tolist(), c.tolist()), (values.tolist(), (values * 2).tolist(), (values * 3).tolist()),
+                         'failed at values')
+        self.assertRaises(KeyError, orig.open_source, os.path.join(self.dir, 'b.npz') + '::z')
+        self.assertRaises(ValueError, orig.open_source, os.path.join(self.dir, 'a.txt'))
+
+    def test_chunks(self):
+        values = np.arange(2500.0)
+        self.assertEqual(list(orig.chunks(2500)), [ (0, 1000), (1000, 2000), (2000, 2500) ], 'failed at chunks')
+        self.assertTrue(orig.is_sorted(values), 'failed at sorted values')
+        values[1000] = 0
+        self.assertFalse(orig.is_sorted(values), 'failed at chunk boundary')
+
+        out = np.ones(2500)
+        orig.accumulate(out, values)
+        self.assertEqual(out[1500], 1501, 'failed at accumulate')
+        self.assertEqual(orig.flatnonzero(values, lambda v: v % 1000 == 999).tolist(), [ 999, 1999 ], 'failed at flatnonzero')
+
+    def test_plot_series_source(self):
+        path = os.path.join(self.dir, 'trace.npy')
+        np.save(path, np.sin(np.arange(20000) / 100.0))
+
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': path }, decimate_columns = 50, ylim = (-2, 0.5), legend = False)
+
+        line = ax.get_lines()[0]
+        self.assertTrue(len(line.get_xdata()) <= 102, 'failed at default decimation')
+        self.assertEqual(line.get_xdata()[-1], 19999, 'failed at lazy x values')
+
+        series_info = fig.get_axis_info(ax).series['A']
+        self.assertTrue(isinstance(series_info.y_values, np.memmap), 'failed at memory-mapped info')
+        self.assertEqual(len(series_info.x_values), 20000, 'failed at full resolution info')
+        self.assertTrue(len(series_info.overflow_labels) > 0, 'failed at overflow labels')
+
+    def test_plot_series_mixed_source(self):
+        path = os.path.join(self.dir, 'trace.npy')
+        np.save(path, np.sin(np.arange(5000) / 100.0))
+
+        # Memory-mapped y values with plain x values (e.g. from a spec)
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        plot_series(ax, { 'A': (path, list(range(5000))) }, decimate_columns = 50, legend = False)
+
+        line = ax.get_lines()[0]
+        self.assertTrue(len(line.get_xdata()) <= 102, 'failed at mixed decimation')
+        self.assertEqual((line.get_xdata()[0], line.get_xdata()[-1]), (0, 4999), 'failed at mixed x values')
+
+    def test_bar_series_source(self):
+        y = np.arange(2500.0)
+        np.save(os.path.join(self.dir, 'a.npy'), y)
+        np.savez(os.path.join(self.dir, 'b.npz'), y = y)
+
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        bar_series(ax, { 'A': os.path.join(self.dir, 'a.npy'), 'B': os.path.join(self.dir, 'b.npz') + '::y' },
+                   key_order = [ 'A', 'B' ], ylim = (0, 2496), legend = False)
+
+        tops = [ p.get_y() + p.get_height() for p in ax.patches ]
+        self.assertEqual(tops[-1], 2 * 2499, 'failed at stacked bars')
+        self.assertEqual(len(fig.get_axis_info(ax).series['B'].overflow_labels), 4, 'failed at overflow labels')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,110 @@
+'''
+Created on Oct 18, 2026
+
+@author: jcabezas
+'''
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import figplotter.spec as orig
+from figplotter import cli
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SPEC = {
+    'name': 'clusters',
+    'axes': [ { 'plotter'     : 'cluster_series_2',
+                'series'      : { 'file': 'data.json', 'key': 'bandwidth' },
+                'clusters'    : [ [ 'PCIe 2.0', 'PCIe 3.0' ], [ 'local', 'remote' ] ],
+                'clusterize'  : True,
+                'style_series': { 'Read': { 'bar::color': 'b' } },
+                'ylim'        : [ 0, 4.5 ] } ]
+}
+
+DATA = { 'bandwidth': { 'Read': [ 1, 2, 4, 5 ], 'Write': [ 2, 3, 3.5, 3.75 ] } }
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        with open(os.path.join(self.dir, 'data.json'), 'w') as f:
+            json.dump(DATA, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_spec(self, name, spec):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as f:
+            json.dump(spec, f)
+        return path
+
+    def test_build_figure(self):
+        spec = orig.load(self.write_spec('fig.json', SPEC))[0]
+        fig = orig.build_figure(spec)
+
+        ax = fig.axes[0]
+        fig.flush()
+        self.assertEqual(fig.name, 'clusters', 'failed at figure name')
+        self.assertEqual(len(ax.patches), 8, 'failed at number of bars')
+        self.assertEqual(ax.get_ylim(), (0, 4.5), 'failed at plotter kwargs')
+        self.assertEqual(list(fig.get_axis_info(ax).series_order), [ 'Read', 'Write' ], 'failed at series order')
+        fig.close()
+
+    def test_line_series(self):
+        spec = { 'axes': [ { 'plotter': 'plot_series', 'series': { 'A': { 'x': [ 1, 2 ], 'y': [ 3, 4 ] } } } ] }
+        fig = orig.build_figure(spec)
+
+        self.assertEqual(list(fig.axes[0].get_lines()[0].get_xdata()), [ 1, 2 ], 'failed at x values')
+        fig.close()
+
+    def test_invalid_plotter(self):
+        spec = { 'axes': [ { 'plotter': 'pie', 'series': {} } ] }
+        self.assertRaises(AssertionError, orig.build_figure, spec)
+
+    @unittest.skipIf(yaml is None, 'PyYAML is not installed')
+    def test_yaml(self):
+        path = os.path.join(self.dir, 'figs.yaml')
+        with open(path, 'w') as f:
+            yaml.safe_dump({ 'figures': [ SPEC, dict(SPEC, name = None) ] }, f)
+
+        specs = orig.load(path)
+        self.assertEqual([ s['name'] for s in specs ], [ 'clusters', 'figs_1' ], 'failed at spec names')
+
+    def test_cli_render(self):
+        path = self.write_spec('fig.json', [ SPEC, dict(SPEC, name = 'broken', axes = [ { 'plotter': 'pie' } ]) ])
+        out = os.path.join(self.dir, 'out')
+
+        ret = cli.main([ 'render', path, '-o', out, '-f', 'pdf' ])
+        self.assertEqual(ret, 1, 'failed at exit code')
+        self.assertTrue(os.path.isfile(os.path.join(out, 'clusters.pdf')), 'failed at output')
+        self.assertFalse(os.path.exists(os.path.join(out, 'broken.pdf')), 'failed at broken spec')
+
+    def test_output_paths(self):
+        out = os.path.join(self.dir, 'out')
+
+        entry = orig.batch_entry(dict(SPEC, name = '../../etc/clusters'), out)
+        self.assertEqual(os.path.dirname(entry['output']), out, 'failed at sanitized name')
+        self.assertEqual(os.path.basename(entry['output']), 'etc_clusters.png', 'failed at sanitized file name')
+        entry = orig.batch_entry(dict(SPEC, name = '../evil'), out)
+        self.assertEqual(os.path.basename(entry['output']), 'evil.png', 'failed at hidden file name')
+        entry = orig.batch_entry(dict(SPEC, name = '..'), out)
+        self.assertEqual(os.path.basename(entry['output']), 'figure.png', 'failed at empty file name')
+        entry = orig.batch_entry(dict(SPEC, output = 'sub/fig.pdf'), out)
+        self.assertEqual(entry['output'], os.path.join(out, 'sub', 'fig.pdf'), 'failed at explicit output')
+
+        # Specs with the same output path are rejected before rendering
+        self.assertRaises(ValueError, orig.render, [ SPEC, SPEC ], out)
+        self.assertFalse(os.path.exists(os.path.join(out, 'clusters.png')), 'failed at rejected batch')
+
+        path = self.write_spec('dup.json', [ SPEC, dict(SPEC, output = 'clusters.png') ])
+        self.assertEqual(cli.main([ 'render', path, '-o', out ]), 2, 'failed at duplicate exit code')
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
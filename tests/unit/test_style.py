@@ -6,6 +6,7 @@ Created on Jan 19, 2015
 import unittest
 
 import figplotter.plot.style as orig
+import figplotter.plot.defaults as orig_defaults
 from figplotter.utils import Parameter
 
 class TestBase(unittest.TestCase):
@@ -85,6 +86,67 @@ class TestBase(unittest.TestCase):
         d = orig.generate_params(style_dict, [['A', 'B'], ['1', '2']])
         self.assertEqual(d, expected, 'failed at valid arguments')
 
+    def test_generate_params_short_queries(self):
+        style_dict = {'*'   : { 'first::second': 0 },
+                      'B::1': { 'first::second': 1 }}
+
+        expected = {'first_params': { 'second' : Parameter({ 'A::1': 0, 'A::2': 0,
+                                                             'B::1': 1, 'B::2': 0 }) }}
+        d = orig.generate_params(style_dict, [['A', 'B'], ['1', '2']])
+        self.assertEqual(d, expected, 'failed at short queries')
+        self.assertEqual(list(style_dict.keys()), ['*', 'B::1'], 'failed at style not modified')
+
+
+    def test_style_sheet_resolve(self):
+        style_dict = {'*::*'  : { 'first::second': 0, 'first::third': 0 },
+                      '*::1'  : { 'first::second': 1 },
+                      'A::*'  : { 'first::second': 2 },
+                      'A::1'  : { 'first::third' : 3 }}
+
+        sheet = orig.StyleSheet(style_dict, 2)
+        self.assertEqual(dict(sheet.resolve('A::1')), { 'first::second': 2, 'first::third': 3 },
+                         'failed at most specific query')
+        self.assertEqual(dict(sheet.resolve(('A', '2'))), { 'first::second': 2, 'first::third': 0 },
+                         'failed at wildcard query')
+        self.assertEqual(dict(sheet.resolve('B::2')), { 'first::second': 0, 'first::third': 0 },
+                         'failed at default query')
+
+    def test_generate_params_cache(self):
+        style_dict = {'*': { 'first::second': 0 },
+                      'A': { 'first::second': 1 }}
+
+        orig.cache_clear()
+        d1 = orig.generate_params(style_dict, [['A', 'B']])
+        d2 = orig.generate_params(dict(style_dict), [['A', 'B']])
+        info = orig.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1), 'failed at cache stats')
+        self.assertEqual(d1, d2, 'failed at cached params')
+
+        # Cached parameters must not be shared with the callers
+        d2['first_params']['second'].values['A'] = 2
+        d3 = orig.generate_params(style_dict, [['A', 'B']])
+        self.assertEqual(d3, d1, 'failed at cache isolation')
+
+        # Different selectors use different entries
+        d4 = orig.generate_params(style_dict, [['A']])
+        expected = {'first_params': { 'second' : Parameter({ 'A': 1 }) }}
+        self.assertEqual(d4, expected, 'failed at different selectors')
+
+        orig.set_cache_size(1)
+        self.assertEqual(orig.cache_info().currsize, 1, 'failed at cache resize')
+        orig.set_cache_size(128)
+
+    def test_generate_params_function_defaults(self):
+        selectors = [['A', 'B'], ['1', '2', '3'], ['x', 'y']]
+        queries = orig_defaults.get_function_defaults('cluster_series_2', selectors, 'style_series')
+        self.assertEqual([ q for q, _ in queries ], ['*::*::*'], 'failed at single defaults layer')
+
+        d = orig.generate_params({'A::*::x': { 'bar::width': 2 }}, selectors, 'style_series', 'cluster_series_2')
+        widths = d['bar_params']['width'].values
+        self.assertEqual(len(widths), 12, 'failed at defaults for all series')
+        self.assertEqual(widths['A::1::x'], 2, 'failed at style over defaults')
+        self.assertEqual(widths['B::3::y'], 1.0, 'failed at default value')
+
 Tests = [ TestBase ]
 
 if __name__ == "__main__":
@@ -58,6 +58,27 @@ class Test(unittest.TestCase):
         except:
             self.assertTrue(True)
 
+    def test_merge(self):
+        shared = {'C': orig.Parameter({'A': 1})}
+        d = {'first': {'second': orig.Parameter({'A': 1})}, 'other': shared}
+        u = {'first': {'second': orig.Parameter({'B': 2}), 'third': 3}}
+        m = orig.merge(d, u)
+
+        expected = {'first': {'second': orig.Parameter({'A': 1, 'B': 2}), 'third': 3},
+                    'other': {'C': orig.Parameter({'A': 1})}}
+        self.assertEqual(m, expected, 'failed at merge')
+        self.assertEqual(d['first'], {'second': orig.Parameter({'A': 1})}, 'failed at original not modified')
+        self.assertTrue(m['other'] is shared, 'failed at sharing unmodified subtrees')
+
+        # Updating a merged Parameter does not modify the original ones
+        m['first']['second'].update({'C': 3})
+        self.assertEqual(d['first']['second'], orig.Parameter({'A': 1}), 'failed at parameter copy on write')
+        self.assertEqual(u['first']['second'], orig.Parameter({'B': 2}), 'failed at parameter copy on write')
+
+        # In-place update
+        orig.update(d, u)
+        self.assertEqual(d, expected, 'failed at update')
+
     def test_parameter_set_series(self):
         # Single value broadcasting
         p = orig.Parameter(2)
@@ -102,6 +123,43 @@ class Test(unittest.TestCase):
                                     'E': 0 })
         self.assertEqual(p, expected, 'failed at add new series with default value')
 
+    def test_clusterize_array(self):
+        import numpy as np
+
+        clusters = [ [ 'a', 'b' ], [ 'x', 'y', 'z' ] ]
+        series = { 'R': list(range(6)), 'W': np.arange(6) * 2.5 }
+
+        tree = orig.clusterize(series, clusters)
+        self.assertEqual(list(tree.keys()), [ 'a', 'b' ], 'failed at first level')
+        self.assertEqual(tree['b']['y'], { 'R': 4, 'W': 10.0 }, 'failed at leaves')
+
+        data = orig.clusterize(series, clusters, as_array = True)
+        self.assertEqual(data.shape, (2, 3, 2), 'failed at array shape')
+        self.assertEqual(data.values[1, 1].tolist(), [ 4, 10.0 ], 'failed at array values')
+        self.assertEqual(data.to_dict(), tree, 'failed at dictionary form')
+
+        self.assertTrue(data.values_for(clusters, [ 'R', 'W' ]) is data.values, 'failed at no copy')
+        self.assertEqual(data.values_for([ [ 'b' ], [ 'z', 'x' ] ], [ 'W' ]).tolist(), [ [ [ 12.5 ], [ 7.5 ] ] ],
+                         'failed at subset of clusters')
+        self.assertRaises(AssertionError, data.values_for, [ [ 'c' ], [ 'x' ] ], [ 'R' ])
+
+    def test_cluster_data_split(self):
+        import numpy as np
+
+        clusters = [ [ 'a', 'b' ], [ 'x', 'y', 'z' ] ]
+        data = orig.clusterize({ 'R': list(range(6)), 'W': np.arange(6) * 2.5 }, clusters, as_array = True)
+
+        split = data.split(0)
+        self.assertEqual(list(split.keys()), [ 'a', 'b' ], 'failed at facets')
+        self.assertEqual(split['b'].clusters, [ [ 'x', 'y', 'z' ] ], 'failed at remaining levels')
+        self.assertEqual(split['b'].values.tolist(), data.values[1].tolist(), 'failed at values')
+        self.assertTrue(np.shares_memory(split['b'].values, data.values), 'failed at views')
+
+        split = data.split(1)
+        self.assertEqual(list(split.keys()), [ 'x', 'y', 'z' ], 'failed at inner level')
+        self.assertEqual(split['y'].values.tolist(), [ [ 1, 2.5 ], [ 4, 10.0 ] ], 'failed at inner level values')
+        self.assertRaises(AssertionError, data.split, 2)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file